@@ -0,0 +1,512 @@
+"""
+Batch (roster) mode for competitive programming statistics.
+Collects statistics for many users in one process and writes per-user outputs
+plus a combined JSON result.
+
+The roster is a JSON list of users, each with an id and a handle for any
+subset of the supported platforms:
+
+    [
+        {"id": "alice", "codeforces": "alice_cf", "leetcode": "alice"},
+        {"id": "bob", "atcoder": "bob", "cses": "12345"}
+    ]
+
+An entry may also name a README file ("readme", relative to the roster file)
+whose marked stats section is updated with the user's Markdown.
+
+With --queue, the roster is collected through a resumable work queue
+(work_queue.WorkQueue) by --workers processes, which checkpoint every batch
+of users. Running the same command again (on the same day, or with the same
+--run-id) resumes an interrupted run, and other machines sharing the queue
+file (on a filesystem with working locks) can join it with the same command.
+The outputs are written once every user is done or has been given up on.
+"""
+
+import os
+import re
+import json
+import socket
+import logging
+import argparse
+import multiprocessing
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from dark_theme_updater import (
+    collect_platform_stats, configure_http_client, get_codeforces_store, get_error_stats,
+    record_history,
+)
+from extractors import REGISTRY, get_extractor, html_parser, metrics, parse_pool
+from extractors.deadline import Deadline, exit_process, run_with_deadline, use_deadline
+from snapshot_store import SnapshotStore
+from renderer import render_many
+from readme_splice import update_readmes, write_files
+from rating_analytics import add_rating_metrics
+from work_queue import WorkQueue, DONE, FAILED
+
+# Import config
+from config import (
+    PROFILE_URLS, BATCH_MAX_WORKERS, HTTP_POOL_MAXSIZE, HTML_PARSER_BACKEND, LEETCODE_BATCH_SIZE,
+    SNAPSHOT_STORE_PATH, MARKDOWN_THEME, BATCH_PARSE_PROCESSES,
+    QUEUE_DB_PATH, QUEUE_BATCH_SIZE, QUEUE_LEASE_SECONDS, QUEUE_MAX_ATTEMPTS, QUEUE_SHARDS,
+    METRICS_PROM_PATH, METRICS_SUMMARY_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+def load_roster(roster_path):
+    """
+    Load a roster file and convert each entry into a profiles dict.
+
+    Args:
+        roster_path (str): Path to the roster JSON file
+
+    Returns:
+        dict: Mapping of user id to a profiles dict shaped like config.PROFILES
+    """
+    with open(roster_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    roster = {}
+    for entry in entries:
+        user_id = str(entry["id"])
+        if user_id in roster:
+            logger.warning(f"Duplicate roster entry for {user_id}, keeping the last one")
+        roster[user_id] = build_profiles(entry)
+
+    logger.info(f"Loaded {len(roster)} users from {roster_path}")
+    return roster
+
+def load_readme_paths(roster_path):
+    """
+    Load the README files named by roster entries.
+
+    Args:
+        roster_path (str): Path to the roster JSON file
+
+    Returns:
+        dict: Mapping of user id to README path, for entries that have one
+    """
+    with open(roster_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    roster_dir = os.path.dirname(os.path.abspath(roster_path))
+    return {
+        str(entry["id"]): os.path.join(roster_dir, entry["readme"])
+        for entry in entries if entry.get("readme")
+    }
+
+def build_profiles(entry):
+    """
+    Build a profiles dict from a roster entry.
+
+    Args:
+        entry (dict): Roster entry mapping platform keys to handles
+
+    Returns:
+        dict: Profiles dict for the platforms the user has a handle on
+    """
+    profiles = {}
+    for platform in REGISTRY:
+        username = entry.get(platform)
+        if username:
+            profiles[platform] = {
+                "username": str(username),
+                "url": PROFILE_URLS[platform].format(username=username),
+            }
+    return profiles
+
+def collect_roster_stats(roster, max_workers=BATCH_MAX_WORKERS, deadline=None):
+    """
+    Collect statistics for every user in the roster.
+
+    All (user, platform) pairs share one bounded thread pool, so the number of
+    requests in flight never exceeds max_workers however large the roster is.
+    Scraped pages are parsed in the parse_pool worker processes when it is
+    configured, so fetch threads don't wait on each other's parsing.
+    Codeforces ratings are resolved up front with batched user.info calls (and
+    the shared problemset index is refreshed once), and
+    LeetCode users are fetched LEETCODE_BATCH_SIZE at a time with aliased queries.
+
+    Args:
+        roster (dict): Mapping of user id to profiles dict
+        max_workers (int): Maximum number of concurrent platform requests
+        deadline (Deadline): Time budget for the whole collection, if bounded
+
+    Returns:
+        dict: Mapping of user id to a per-platform statistics dict
+    """
+    results = {user_id: {} for user_id in roster}
+
+    cf_handles = [profiles["codeforces"]["username"] for profiles in roster.values() if "codeforces" in profiles]
+    cf_user_infos = {}
+    if cf_handles:
+        with use_deadline(deadline), metrics.tags(platform="codeforces"), metrics.span("collect_batch"):
+            cf_user_infos = get_extractor("codeforces").fetch_user_info_batch(cf_handles)
+            # Download the shared problemset index once, before the per-user workers need it
+            get_extractor("codeforces").refresh_problemset(get_codeforces_store())
+
+    lc_usernames = list(dict.fromkeys(
+        profiles["leetcode"]["username"] for profiles in roster.values() if "leetcode" in profiles
+    ))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    lc_futures = [
+        executor.submit(run_with_deadline, deadline, _collect_leetcode_batch,
+                        lc_usernames[start:start + LEETCODE_BATCH_SIZE])
+        for start in range(0, len(lc_usernames), LEETCODE_BATCH_SIZE)
+    ]
+
+    futures = []
+    for user_id, profiles in roster.items():
+        for platform in REGISTRY:
+            if platform not in profiles or platform == "leetcode":
+                continue
+
+            username = profiles[platform]["username"]
+            extractor_kwargs = {}
+            if platform == "codeforces":
+                user_info = cf_user_infos.get(username.lower())
+                if user_info is None:
+                    results[user_id][platform] = get_error_stats(platform, username)
+                    continue
+                extractor_kwargs["user_info"] = user_info
+
+            future = executor.submit(run_with_deadline, deadline, collect_platform_stats,
+                                     platform, username, **extractor_kwargs)
+            futures.append((user_id, platform, future))
+
+    wait(lc_futures + [future for _, _, future in futures], timeout=deadline.remaining() if deadline else None)
+    # Don't block on stragglers; their requests time out on their own
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    unfinished = 0
+    for user_id, platform, future in futures:
+        if future.done() and not future.cancelled():
+            results[user_id][platform] = future.result()
+        else:
+            unfinished += 1
+            results[user_id][platform] = get_error_stats(platform, roster[user_id][platform]["username"])
+
+    lc_stats = {}
+    for future in lc_futures:
+        if future.done() and not future.cancelled():
+            lc_stats.update(future.result())
+
+    for user_id, profiles in roster.items():
+        if "leetcode" in profiles:
+            username = profiles["leetcode"]["username"]
+            if username not in lc_stats:
+                unfinished += 1
+                results[user_id]["leetcode"] = get_error_stats("leetcode", username)
+            else:
+                results[user_id]["leetcode"] = lc_stats[username]
+        # Keep the platform order stable regardless of completion order
+        results[user_id] = {platform: results[user_id][platform] for platform in REGISTRY
+                            if platform in results[user_id]}
+
+    if unfinished:
+        logger.warning(f"{unfinished} platform profiles not collected within the time budget")
+    return results
+
+def _collect_leetcode_batch(usernames):
+    """
+    Collect the stats of several LeetCode users with one aliased query.
+
+    Args:
+        usernames (list): LeetCode usernames
+
+    Returns:
+        dict: Username -> statistics
+    """
+    with metrics.tags(platform="leetcode"), metrics.span("collect_batch"):
+        return get_extractor("leetcode").get_stats_batch(usernames, batch_size=LEETCODE_BATCH_SIZE)
+
+def _safe_filename(user_id):
+    """
+    Turn a user id into a safe file name.
+
+    Args:
+        user_id (str): Roster user id
+
+    Returns:
+        str: File name without directory separators or special characters
+    """
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", user_id)
+
+def write_outputs(roster, results, output_dir, theme=MARKDOWN_THEME, readme_paths=None):
+    """
+    Write per-user Markdown and JSON files plus one combined JSON result.
+
+    All users are rendered with one compiled template, so blocks shared by
+    many users (identical stats, static parts) are formatted only once.
+    Files are written in parallel and only when their content changed.
+
+    Args:
+        roster (dict): Mapping of user id to profiles dict
+        results (dict): Mapping of user id to per-platform statistics
+        output_dir (str): Directory to write the outputs to
+        theme (str): Theme name in renderer.THEMES
+        readme_paths (dict): Mapping of user id to a README file to update, if any
+
+    Returns:
+        str: Path of the combined JSON result
+    """
+    users_dir = os.path.join(output_dir, "users")
+    os.makedirs(users_dir, exist_ok=True)
+
+    with metrics.span("render"):
+        markdowns = render_many({user_id: (stats, roster[user_id]) for user_id, stats in results.items()}, theme)
+    contents = {}
+    for user_id, stats in results.items():
+        base_path = os.path.join(users_dir, _safe_filename(user_id))
+        contents[f"{base_path}.md"] = markdowns[user_id]
+        contents[f"{base_path}.json"] = json.dumps(stats, indent=2)
+    with metrics.span("output_write"):
+        written = write_files(contents)
+    logger.info(f"Wrote {written} of {len(contents)} per-user files, the rest were unchanged")
+
+    if readme_paths:
+        update_readmes({path: markdowns[user_id] for user_id, path in readme_paths.items() if user_id in markdowns})
+
+    combined_path = os.path.join(output_dir, "roster_stats.json")
+    with open(combined_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "users": results,
+        }, f, indent=2)
+
+    logger.info(f"Wrote outputs for {len(results)} users to {output_dir}")
+    return combined_path
+
+def finish_run(roster_path, roster, results, output_dir, theme=MARKDOWN_THEME):
+    """
+    Post-process a run's results and write the outputs.
+
+    Args:
+        roster_path (str): Path to the roster JSON file
+        roster (dict): Mapping of user id to profiles dict
+        results (dict): Mapping of user id to per-platform statistics
+        output_dir (str): Directory for the outputs
+        theme (str): Theme of the per-user Markdown
+
+    Returns:
+        str: Path of the combined JSON result
+    """
+    # Derive contest metrics over the whole roster from the synced rating histories
+    add_rating_metrics(results, get_codeforces_store())
+
+    # Remember what succeeded and fall back to the last good stats for the rest
+    record_history(results)
+    snapshots = SnapshotStore(SNAPSHOT_STORE_PATH)
+    for user_id, stats in results.items():
+        snapshots.update(user_id, stats)
+        results[user_id] = snapshots.fill_failed(user_id, stats)
+    snapshots.save()
+
+    combined_path = write_outputs(roster, results, output_dir, theme, load_readme_paths(roster_path))
+    metrics.export(METRICS_PROM_PATH, METRICS_SUMMARY_PATH)
+    return combined_path
+
+def _default_output_dir():
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+def _worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def _has_errors(stats):
+    return any(platform_stats.get("status") == "Error" for platform_stats in stats.values())
+
+def run_worker(queue_path, shard=None, max_workers=BATCH_MAX_WORKERS, deadline=None,
+               batch_size=QUEUE_BATCH_SIZE, lease_seconds=QUEUE_LEASE_SECONDS):
+    """
+    Lease and collect users from a work queue until none are left.
+
+    Each batch's results are checkpointed into the queue as soon as it is
+    collected. When the time budget runs out, users that failed in the last
+    batch are handed back instead, so a resumed run retries them.
+
+    Args:
+        queue_path (str): Path to the work queue database
+        shard (int): Shard whose users are leased first, if any
+        max_workers (int): Maximum number of concurrent platform requests
+        deadline (Deadline): Time budget of the worker, if bounded
+        batch_size (int): Number of users leased at a time
+        lease_seconds (float): Seconds until a lease expires
+
+    Returns:
+        int: Number of users this worker completed
+    """
+    worker = _worker_id()
+    queue = WorkQueue(queue_path)
+    completed = 0
+    try:
+        while deadline is None or not deadline.expired():
+            batch = queue.lease(worker, batch_size, lease_seconds, shard, QUEUE_MAX_ATTEMPTS)
+            if not batch:
+                break
+            results = collect_roster_stats(batch, max_workers=max_workers, deadline=deadline)
+            if deadline is not None and deadline.expired():
+                unfinished = [user_id for user_id, stats in results.items() if _has_errors(stats)]
+                queue.release(worker, unfinished)
+                results = {user_id: stats for user_id, stats in results.items() if user_id not in unfinished}
+            completed += queue.complete(worker, results)
+            logger.info(f"Worker {worker} checkpointed {len(results)} users ({queue.progress()})")
+    finally:
+        queue.close()
+    return completed
+
+def _worker_path(path, name):
+    root, extension = os.path.splitext(path)
+    return f"{root}.{name}{extension}"
+
+def _worker_process(queue_path, shard, max_workers, time_budget, rate_limit_share, parse_processes):
+    """
+    Entry point of a local worker process.
+    """
+    configure_http_client(pool_maxsize=max(HTTP_POOL_MAXSIZE, max_workers), rate_limit_share=rate_limit_share)
+    html_parser.set_backend(HTML_PARSER_BACKEND)
+    metrics.reset()
+    parse_pool.configure(parse_processes)
+    try:
+        run_worker(queue_path, shard, max_workers, Deadline(time_budget) if time_budget else None)
+    finally:
+        parse_pool.shutdown()
+
+    # Each local worker slot exports its own files next to the run's, labeled with its name
+    name = f"{socket.gethostname()}-{shard}"
+    metrics.export(_worker_path(METRICS_PROM_PATH, name), _worker_path(METRICS_SUMMARY_PATH, name),
+                   constant_labels={"worker": name})
+    exit_process()
+
+def main_queue(roster_path, queue_path=QUEUE_DB_PATH, workers=1, run_id=None, output_dir=None,
+               max_workers=BATCH_MAX_WORKERS, time_budget=None, theme=MARKDOWN_THEME, shards=QUEUE_SHARDS,
+               parse_processes=BATCH_PARSE_PROCESSES):
+    """
+    Main function for work-queue batch mode.
+
+    Args:
+        roster_path (str): Path to the roster JSON file
+        queue_path (str): Path to the work queue database
+        workers (int): Number of worker processes on this machine
+        run_id (str): Id of the run to start or resume (defaults to the UTC date)
+        output_dir (str): Directory for the outputs (defaults to data/)
+        max_workers (int): Maximum number of concurrent platform requests on this machine
+        time_budget (float): Time budget in seconds for collecting stats, if bounded
+        theme (str): Theme of the per-user Markdown
+        shards (int): Number of shards the users are spread over
+        parse_processes (int): Number of processes parsing scraped pages on this machine
+                               (0 parses them in the fetch threads)
+
+    Returns:
+        str: Path of the combined JSON result, or None if the run is not finished
+             (or another worker writes the outputs)
+    """
+    output_dir = output_dir or _default_output_dir()
+    run_id = run_id or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    roster = load_roster(roster_path)
+
+    queue = WorkQueue(queue_path)
+    try:
+        queue.start_run(run_id, roster, shards)
+    finally:
+        queue.close()
+
+    # Every process gets an equal share of the request concurrency, rate limits and parse processes
+    worker_max_workers = max(1, max_workers // workers)
+    worker_parse_processes = max(1, parse_processes // workers) if parse_processes else 0
+    processes = [
+        multiprocessing.Process(target=_worker_process,
+                                args=(queue_path, shard, worker_max_workers, time_budget, workers,
+                                      worker_parse_processes))
+        for shard in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    queue = WorkQueue(queue_path)
+    try:
+        if not queue.claim_finalize(_worker_id()):
+            progress = queue.progress()
+            if progress[DONE] + progress[FAILED] < progress["total"]:
+                logger.info(f"Run {run_id} is not finished yet ({progress}); run again to resume it")
+            else:
+                logger.info(f"Outputs of run {run_id} were already written")
+            return None
+        results = queue.results()
+    finally:
+        queue.close()
+
+    # Users given up after QUEUE_MAX_ATTEMPTS leases
+    missing = [user_id for user_id in roster if user_id not in results]
+    if missing:
+        logger.warning(f"{len(missing)} users not collected in run {run_id}, using error stats")
+    for user_id in missing:
+        results[user_id] = {platform: get_error_stats(platform, profile["username"])
+                            for platform, profile in roster[user_id].items()}
+
+    results = {user_id: results[user_id] for user_id in roster}
+    return finish_run(roster_path, roster, results, output_dir, theme)
+
+def main(roster_path, output_dir=None, max_workers=BATCH_MAX_WORKERS, time_budget=None, theme=MARKDOWN_THEME,
+         parse_processes=BATCH_PARSE_PROCESSES):
+    """
+    Main function for batch mode.
+
+    Args:
+        roster_path (str): Path to the roster JSON file
+        output_dir (str): Directory for the outputs (defaults to data/)
+        max_workers (int): Maximum number of concurrent platform requests
+        time_budget (float): Time budget in seconds for collecting stats, if bounded
+        theme (str): Theme of the per-user Markdown
+        parse_processes (int): Number of processes parsing scraped pages (0 parses them in the fetch threads)
+
+    Returns:
+        str: Path of the combined JSON result
+    """
+    output_dir = output_dir or _default_output_dir()
+
+    # Keep at least one pooled connection per worker so requests to a host are never starved
+    configure_http_client(pool_maxsize=max(HTTP_POOL_MAXSIZE, max_workers))
+    html_parser.set_backend(HTML_PARSER_BACKEND)
+
+    roster = load_roster(roster_path)
+    deadline = Deadline(time_budget) if time_budget else None
+    parse_pool.configure(parse_processes)
+    try:
+        results = collect_roster_stats(roster, max_workers=max_workers, deadline=deadline)
+    finally:
+        parse_pool.shutdown()
+    from extractors import http_client
+    logger.info(f"Rate limit queue waits: {http_client.queue_wait_stats()}")
+
+    return finish_run(roster_path, roster, results, output_dir, theme)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect competitive programming stats for a roster of users.")
+    parser.add_argument("roster", help="Path to the roster JSON file")
+    parser.add_argument("--output-dir", help="Directory for per-user and combined outputs")
+    parser.add_argument("--max-workers", type=int, default=BATCH_MAX_WORKERS,
+                        help="Maximum number of concurrent platform requests")
+    parser.add_argument("--time-budget", type=float,
+                        help="Time budget in seconds; unfinished profiles fall back to error stats")
+    parser.add_argument("--theme", default=MARKDOWN_THEME, help="Theme of the per-user Markdown (dark or light)")
+    parser.add_argument("--parse-processes", type=int, default=BATCH_PARSE_PROCESSES,
+                        help="Number of processes parsing scraped pages (0 parses them in the fetch threads)")
+    parser.add_argument("--queue", nargs="?", const=QUEUE_DB_PATH,
+                        help="Collect through a resumable work queue (optionally the path of its database)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of queue worker processes on this machine")
+    parser.add_argument("--run-id", help="Queue run to start or resume (defaults to the UTC date)")
+    args = parser.parse_args()
+
+    if args.queue:
+        main_queue(args.roster, queue_path=args.queue, workers=args.workers, run_id=args.run_id,
+                   output_dir=args.output_dir, max_workers=args.max_workers, time_budget=args.time_budget,
+                   theme=args.theme, parse_processes=args.parse_processes)
+    else:
+        main(args.roster, output_dir=args.output_dir, max_workers=args.max_workers, time_budget=args.time_budget,
+             theme=args.theme, parse_processes=args.parse_processes)
+    # Don't let requests still running past the time budget hold up the exit
+    exit_process()
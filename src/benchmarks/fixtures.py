@@ -0,0 +1,261 @@
+"""
+Record/replay of platform responses for offline runs.
+
+Recording captures one real response per platform endpoint while collecting
+the configured profiles (run from src/):
+
+    python -m benchmarks.fixtures --fixtures-dir ../data/fixtures
+
+Replaying answers requests from those fixtures for any handle: Codeforces
+user.info and aliased LeetCode queries are expanded to every requested user,
+and user.status is paged like the real API.
+"""
+
+import os
+import re
+import json
+import logging
+import argparse
+import tempfile
+from urllib.parse import urlparse, parse_qs
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Import config
+from config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIXTURES_DIR = os.path.join(DATA_DIR, "fixtures")
+
+# (fixture name, host, path pattern) for every endpoint the extractors use
+ROUTES = [
+    ("codeforces_user_info", "codeforces.com", re.compile(r"^/api/user\.info")),
+    ("codeforces_user_status", "codeforces.com", re.compile(r"^/api/user\.status")),
+    ("codeforces_user_rating", "codeforces.com", re.compile(r"^/api/user\.rating")),
+    ("codeforces_problemset", "codeforces.com", re.compile(r"^/api/problemset\.problems")),
+    ("leetcode_graphql", "leetcode.com", re.compile(r"^/graphql")),
+    ("codechef_profile", "www.codechef.com", re.compile(r"^/users/")),
+    ("atcoder_profile", "atcoder.jp", re.compile(r"^/users/")),
+    ("cses_profile", "cses.fi", re.compile(r"^/user/")),
+]
+
+# Response headers kept in fixtures
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+def match_route(url):
+    """
+    Find the fixture name for a request URL.
+
+    Args:
+        url (str): Request URL
+
+    Returns:
+        str: Fixture name, or None if no route matches
+    """
+    parsed = urlparse(url)
+    for name, host, pattern in ROUTES:
+        if parsed.hostname == host and pattern.match(parsed.path):
+            return name
+    return None
+
+def save_fixture(fixtures_dir, name, response):
+    """
+    Save a response as a fixture.
+
+    Args:
+        fixtures_dir (str): Fixtures directory
+        name (str): Fixture name
+        response (requests.Response): Response to save
+    """
+    os.makedirs(fixtures_dir, exist_ok=True)
+    fixture = {
+        "status": response.status_code,
+        "headers": {key: response.headers[key] for key in KEPT_HEADERS if key in response.headers},
+        "body": response.text,
+    }
+    with open(os.path.join(fixtures_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+        json.dump(fixture, f)
+
+def load_fixtures(fixtures_dir):
+    """
+    Load all fixtures of a directory.
+
+    Args:
+        fixtures_dir (str): Fixtures directory
+
+    Returns:
+        dict: Fixture name -> {"status", "headers", "body"}
+    """
+    fixtures = {}
+    for name, _, _ in ROUTES:
+        path = os.path.join(fixtures_dir, f"{name}.json")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                fixtures[name] = json.load(f)
+    return fixtures
+
+def _user_info_body(template, query):
+    """
+    Expand a user.info fixture to every requested handle.
+    """
+    data = json.loads(template)
+    if data.get("status") != "OK":
+        return template
+    user = data["result"][0]
+    handles = query.get("handles", [""])[0].split(";")
+    data["result"] = [dict(user, handle=handle) for handle in handles]
+    return json.dumps(data)
+
+def _user_status_body(template, query):
+    """
+    Page a user.status fixture like the real API.
+    """
+    data = json.loads(template)
+    if data.get("status") != "OK":
+        return template
+    start = int(query.get("from", ["1"])[0]) - 1
+    count = int(query.get("count", [str(len(data["result"]))])[0])
+    data["result"] = data["result"][start:start + count]
+    return json.dumps(data)
+
+def _graphql_body(template, request_body):
+    """
+    Answer a (possibly aliased) LeetCode query with the fixture user.
+    """
+    data = json.loads(template)
+    users = [user for user in (data.get("data") or {}).values() if user]
+    if not users:
+        return template
+    user = users[0]
+
+    payload = json.loads(request_body or "{}")
+    variables = payload.get("variables") or {}
+    if "username" in variables:
+        return json.dumps({"data": {"matchedUser": dict(user, username=variables["username"])}})
+    return json.dumps({"data": {alias: dict(user, username=username) for alias, username in variables.items()}})
+
+def respond(fixtures, method, url, body=None):
+    """
+    Build the replayed response for a request.
+
+    Args:
+        fixtures (dict): Fixtures from load_fixtures()
+        method (str): HTTP method
+        url (str): Request URL
+        body (bytes or str): Request body
+
+    Returns:
+        tuple: (status code, headers dict, body str)
+    """
+    name = match_route(url)
+    if name is None or name not in fixtures:
+        return 404, {"Content-Type": "text/plain"}, f"No fixture for {method} {url}"
+
+    fixture = fixtures[name]
+    query = parse_qs(urlparse(url).query)
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+
+    response_body = fixture["body"]
+    if name == "codeforces_user_info":
+        response_body = _user_info_body(response_body, query)
+    elif name == "codeforces_user_status":
+        response_body = _user_status_body(response_body, query)
+    elif name == "leetcode_graphql":
+        response_body = _graphql_body(response_body, body)
+    return fixture["status"], dict(fixture["headers"]), response_body
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Transport adapter saving the first real response of every route as a fixture.
+    """
+
+    def __init__(self, fixtures_dir, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures_dir = fixtures_dir
+        self.recorded = set()
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        name = match_route(request.url)
+        if name and name not in self.recorded and response.status_code == 200:
+            save_fixture(self.fixtures_dir, name, response)
+            self.recorded.add(name)
+            logger.info(f"Recorded fixture {name} from {request.url}")
+        return response
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Transport adapter answering requests from fixtures without any network access.
+    """
+
+    def __init__(self, fixtures, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+
+    def send(self, request, **kwargs):
+        status, headers, body = respond(self.fixtures, request.method, request.url, request.body)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body.encode("utf-8")
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+def install_adapter(client, adapter):
+    """
+    Route all of a client's requests through a transport adapter.
+
+    Args:
+        client (HttpClient): Client to modify
+        adapter (HTTPAdapter): Adapter to mount
+    """
+    client.session.mount("https://", adapter)
+    client.session.mount("http://", adapter)
+
+def record(fixtures_dir):
+    """
+    Record fixtures by collecting the configured profiles from the live sites.
+
+    Args:
+        fixtures_dir (str): Directory to save the fixtures to
+
+    Returns:
+        set: Names of the recorded fixtures
+    """
+    import dark_theme_updater
+    from extractors import http_client
+    from extractors.codeforces_store import CodeforcesSubmissionStore
+
+    # No page cache and no rate limiter: fixtures need full 200 responses
+    client = http_client.configure()
+    adapter = RecordingAdapter(fixtures_dir)
+    install_adapter(client, adapter)
+
+    # An empty Codeforces store, so user.status is paged from the start instead
+    # of stopping at the persistent store's sync position
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = CodeforcesSubmissionStore(os.path.join(store_dir, "codeforces.sqlite"))
+        saved_store, dark_theme_updater._codeforces_store = dark_theme_updater._codeforces_store, store
+        try:
+            dark_theme_updater.collect_stats()
+        finally:
+            dark_theme_updater._codeforces_store = saved_store
+            store.close()
+    missing = [name for name, _, _ in ROUTES if name not in adapter.recorded]
+    if missing:
+        logger.warning(f"No fixtures recorded for: {', '.join(missing)}")
+    return adapter.recorded
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record platform responses as replay fixtures.")
+    parser.add_argument("--fixtures-dir", default=DEFAULT_FIXTURES_DIR, help="Directory to save the fixtures to")
+    args = parser.parse_args()
+
+    print(f"Recorded: {', '.join(sorted(record(args.fixtures_dir)))}")
@@ -0,0 +1,162 @@
+"""
+Benchmark of the HTML parser backends against saved profile pages.
+
+Save pages as <platform>.html (or <platform>_<anything>.html) in a directory,
+e.g. with --download, then run from src/:
+
+    python -m benchmarks.html_parsers --pages-dir ../data/pages
+
+With --processes, also measure the parse throughput of the process pool
+(pages parsed per second from many fetch threads) for each pool size.
+"""
+
+import os
+import time
+import argparse
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+from extractors import html_parser
+from extractors import http_client
+from extractors import parse_pool
+from extractors.atcoder import AtCoderExtractor
+from extractors.codechef import CodeChefExtractor
+from extractors.cses import CSESExtractor
+
+# Import config
+from config import PROFILES, DATA_DIR
+
+# Platform key -> extractor class for the HTML scraping extractors
+HTML_EXTRACTORS = {
+    "atcoder": AtCoderExtractor,
+    "codechef": CodeChefExtractor,
+    "cses": CSESExtractor,
+}
+
+def download_pages(pages_dir):
+    """
+    Save the profile pages of the configured users.
+
+    Args:
+        pages_dir (str): Directory to save the pages to
+    """
+    os.makedirs(pages_dir, exist_ok=True)
+    for platform, extractor_class in HTML_EXTRACTORS.items():
+        extractor = extractor_class(PROFILES[platform]["username"])
+        response = http_client.get(extractor.profile_url, headers={"User-Agent": "Mozilla/5.0"})
+        response.raise_for_status()
+        with open(os.path.join(pages_dir, f"{platform}.html"), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"Saved {extractor.profile_url}")
+
+def load_pages(pages_dir):
+    """
+    Load saved pages grouped by platform.
+
+    Args:
+        pages_dir (str): Directory with saved pages
+
+    Returns:
+        list: (platform, file name, HTML) tuples
+    """
+    pages = []
+    for name in sorted(os.listdir(pages_dir)):
+        platform = name.split(".")[0].split("_")[0]
+        if name.endswith(".html") and platform in HTML_EXTRACTORS:
+            with open(os.path.join(pages_dir, name), 'r', encoding='utf-8') as f:
+                pages.append((platform, name, f.read()))
+    return pages
+
+def time_parse(extractor, html, iterations):
+    """
+    Time an extractor's parse of one page.
+
+    Args:
+        extractor (object): Extractor with a parse_stats() method
+        html (str): Page HTML
+        iterations (int): Number of parses
+
+    Returns:
+        float: Mean parse time in milliseconds
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        extractor.parse_stats(html)
+    return (time.perf_counter() - start) * 1000 / iterations
+
+def run(pages_dir, iterations):
+    """
+    Run the benchmark and print one line per page and backend.
+
+    Args:
+        pages_dir (str): Directory with saved pages
+        iterations (int): Number of parses per measurement
+    """
+    pages = load_pages(pages_dir)
+    if not pages:
+        print(f"No saved pages found in {pages_dir}")
+        return
+
+    extractor_modules = {platform: importlib.import_module(extractor_class.__module__)
+                         for platform, extractor_class in HTML_EXTRACTORS.items()}
+
+    print(f"{'page':<24} {'backend':<12} {'targeted':<9} {'ms/parse':>10}")
+    for platform, name, html in pages:
+        extractor = HTML_EXTRACTORS[platform]("benchmark")
+        module = extractor_modules[platform]
+        parse_only = module.PARSE_ONLY
+        for backend in html_parser.available_backends():
+            html_parser.set_backend(backend)
+            for targeted in (False, True):
+                # Selectolax always parses the whole page
+                if targeted and backend == "selectolax":
+                    continue
+                module.PARSE_ONLY = parse_only if targeted else None
+                ms = time_parse(extractor, html, iterations)
+                print(f"{name:<24} {backend:<12} {str(targeted):<9} {ms:>10.3f}")
+        module.PARSE_ONLY = parse_only
+
+def run_pool(pages_dir, processes_list, repeat, threads):
+    """
+    Measure the parse throughput of the process pool for each pool size.
+
+    Args:
+        pages_dir (str): Directory with saved pages
+        processes_list (list): Pool sizes to measure (0 parses in the calling threads)
+        repeat (int): Number of times each page is parsed
+        threads (int): Number of threads submitting pages, like batch fetch workers
+    """
+    pages = load_pages(pages_dir)
+    if not pages:
+        return
+    jobs = [(HTML_EXTRACTORS[platform]("benchmark"), html) for platform, _, html in pages] * repeat
+
+    print(f"{'processes':<10} {'pages':>7} {'pages/s':>10}")
+    for processes in processes_list:
+        parse_pool.configure(processes)
+        try:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                # Warm up the worker processes before timing
+                list(executor.map(lambda job: parse_pool.parse_stats(*job), jobs[:max(processes, 1)]))
+                start = time.perf_counter()
+                list(executor.map(lambda job: parse_pool.parse_stats(*job), jobs))
+                elapsed = time.perf_counter() - start
+        finally:
+            parse_pool.shutdown()
+        print(f"{processes:<10} {len(jobs):>7} {len(jobs) / elapsed:>10.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends against saved profile pages.")
+    parser.add_argument("--pages-dir", default=os.path.join(DATA_DIR, "pages"), help="Directory with saved pages")
+    parser.add_argument("--iterations", type=int, default=50, help="Number of parses per measurement")
+    parser.add_argument("--download", action="store_true", help="Save the configured users' pages first")
+    parser.add_argument("--processes", type=int, nargs="+",
+                        help="Also measure process pool throughput for these pool sizes, e.g. 0 2 4")
+    parser.add_argument("--threads", type=int, default=16, help="Threads submitting pages to the pool")
+    args = parser.parse_args()
+
+    if args.download:
+        download_pages(args.pages_dir)
+    run(args.pages_dir, args.iterations)
+    if args.processes:
+        run_pool(args.pages_dir, args.processes, args.iterations, args.threads)
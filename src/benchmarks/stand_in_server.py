@@ -0,0 +1,103 @@
+"""
+Local stand-in server for the platform sites.
+Serves recorded fixtures over real HTTP on localhost, so end-to-end runs
+exercise the whole client stack (pooling, parsing) without touching the
+live sites. Requests are redirected to it by LocalRedirectAdapter.
+"""
+
+import threading
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from extractors.http_client import TimedHTTPAdapter
+from benchmarks.fixtures import respond
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """
+    Request handler answering /<host>/<path> from the server's fixtures.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, body=None):
+        host, _, path = self.path.lstrip("/").partition("/")
+        status, headers, response_body = respond(self.server.fixtures, self.command, f"https://{host}/{path}", body)
+        payload = response_body.encode("utf-8")
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self._respond(self.rfile.read(length))
+
+    def log_message(self, format, *args):
+        pass
+
+class StandInServer:
+    """
+    Threaded localhost HTTP server serving fixtures.
+    """
+
+    def __init__(self, fixtures, host="127.0.0.1", port=0):
+        """
+        Initialize the server (not started yet).
+
+        Args:
+            fixtures (dict): Fixtures from load_fixtures()
+            host (str): Interface to bind to
+            port (int): Port to bind to (0 picks a free one)
+        """
+        self._server = ThreadingHTTPServer((host, port), _FixtureHandler)
+        self._server.daemon_threads = True
+        self._server.fixtures = fixtures
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Start serving in a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and close the socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+class LocalRedirectAdapter(TimedHTTPAdapter):
+    """
+    Transport adapter sending https://<host>/<path> to <base_url>/<host>/<path>.
+    """
+
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    def send(self, request, **kwargs):
+        parsed = urlparse(request.url)
+        if parsed.scheme == "https":
+            query = f"?{parsed.query}" if parsed.query else ""
+            request.url = f"{self.base_url}/{parsed.hostname}{parsed.path}{query}"
+        return super().send(request, **kwargs)
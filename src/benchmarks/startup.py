@@ -0,0 +1,80 @@
+"""
+Startup cost of the updater entry points.
+Imports a module in a fresh interpreter under -X importtime and reports the
+total import time, the slowest imports, and whether modules that should load
+lazily (requests, bs4, lxml, selectolax, numpy, the extractor modules)
+were pulled in.
+
+Run from src/:
+
+    python -m benchmarks.startup --module dark_theme_updater
+"""
+
+import re
+import sys
+import argparse
+import subprocess
+
+from extractors import REGISTRY
+
+# Modules that must not be imported just by loading the entry point
+LAZY_MODULES = ("requests", "bs4", "lxml", "selectolax", "numpy") + tuple(f"extractors.{module}" for _, module, _ in REGISTRY.values())
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+def measure_imports(module):
+    """
+    Import a module in a fresh interpreter under -X importtime.
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        list: (module name, self microseconds, cumulative microseconds, depth) per import
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return imports
+
+def report(module, top):
+    """
+    Print the import time report of a module.
+
+    Args:
+        module (str): Module to import
+        top (int): Number of slowest imports to list
+
+    Returns:
+        bool: True if none of the lazy modules were imported
+    """
+    imports = measure_imports(module)
+    total_us = sum(cumulative_us for _, _, cumulative_us, depth in imports if depth == 0)
+    print(f"import {module}: {total_us / 1000:.1f} ms, {len(imports)} modules")
+
+    print(f"Slowest {top} imports (self time):")
+    for name, self_us, cumulative_us, _ in sorted(imports, key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {name:<40} {self_us / 1000:>7.1f} ms  (cumulative {cumulative_us / 1000:.1f} ms)")
+
+    imported = {name for name, _, _, _ in imports}
+    eager = [name for name in LAZY_MODULES if name in imported]
+    if eager:
+        print(f"Imported at startup but should load lazily: {', '.join(eager)}")
+    else:
+        print("No HTTP, parser, extractor or NumPy modules imported at startup")
+    return not eager
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the import time of an entry point.")
+    parser.add_argument("--module", default="dark_theme_updater", help="Module to import")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    args = parser.parse_args()
+
+    sys.exit(0 if report(args.module, args.top) else 1)
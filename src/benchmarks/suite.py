@@ -0,0 +1,134 @@
+"""
+Offline benchmark suite for the statistics collectors.
+
+Measures, against recorded fixtures (see benchmarks.fixtures):
+  - each extractor's get_stats() throughput with responses replayed in-process
+  - collect_roster_stats() and generate_dark_theme_markdown() end to end for
+    rosters of increasing size, against a local stand-in server
+
+Run from src/:
+
+    python -m benchmarks.suite --fixtures-dir ../data/fixtures --sizes 1 100 10000
+"""
+
+import os
+import time
+import logging
+import argparse
+import tempfile
+
+import dark_theme_updater
+from dark_theme_updater import PROFILES, generate_dark_theme_markdown
+from batch import collect_roster_stats
+from extractors import REGISTRY, get_extractor, http_client, platform_name
+from extractors.codeforces_store import CodeforcesSubmissionStore
+from benchmarks.fixtures import DEFAULT_FIXTURES_DIR, ReplayAdapter, install_adapter, load_fixtures
+from benchmarks.stand_in_server import LocalRedirectAdapter, StandInServer
+
+def synthetic_roster(size):
+    """
+    Build a roster of users with a handle on every platform.
+
+    Args:
+        size (int): Number of users
+
+    Returns:
+        dict: Mapping of user id to profiles dict
+    """
+    return {
+        f"user{i}": {platform: {"username": f"user{i}", "url": ""} for platform in REGISTRY}
+        for i in range(size)
+    }
+
+def _use_fresh_codeforces_store(directory):
+    """
+    Point Codeforces syncs at an empty store so every run downloads full histories.
+    """
+    path = os.path.join(directory, f"codeforces_{time.time_ns()}.sqlite")
+    dark_theme_updater._codeforces_store = CodeforcesSubmissionStore(path)
+
+def bench_extractors(fixtures, iterations):
+    """
+    Time each extractor's get_stats() with responses replayed in-process.
+
+    Args:
+        fixtures (dict): Fixtures from load_fixtures()
+        iterations (int): Number of get_stats() calls per extractor
+
+    Returns:
+        dict: Platform -> calls per second
+    """
+    client = http_client.configure(cache=None, rate_limiter=None)
+    install_adapter(client, ReplayAdapter(fixtures))
+
+    results = {}
+    for platform in REGISTRY:
+        extractor = get_extractor(platform)(PROFILES.get(platform, {}).get("username", "benchmark"))
+        status = extractor.get_stats()["status"]
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            extractor.get_stats()
+        elapsed = time.perf_counter() - start
+
+        results[platform] = iterations / elapsed
+        print(f"{platform_name(platform):<12} {results[platform]:>10.1f} calls/s  (status: {status})")
+    return results
+
+def bench_end_to_end(fixtures, sizes, max_workers, work_dir):
+    """
+    Time collection and rendering for rosters of increasing size.
+
+    Args:
+        fixtures (dict): Fixtures from load_fixtures()
+        sizes (list): Roster sizes
+        max_workers (int): Maximum number of concurrent platform requests
+        work_dir (str): Directory for temporary stores
+
+    Returns:
+        dict: Roster size -> (collect seconds, render seconds)
+    """
+    results = {}
+    with StandInServer(fixtures) as server:
+        client = http_client.configure(pool_maxsize=max_workers, cache=None, rate_limiter=None)
+        install_adapter(client, LocalRedirectAdapter(server.base_url, pool_maxsize=max_workers))
+
+        for size in sizes:
+            roster = synthetic_roster(size)
+            _use_fresh_codeforces_store(work_dir)
+
+            start = time.perf_counter()
+            stats = collect_roster_stats(roster, max_workers=max_workers)
+            collect_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for user_id, user_stats in stats.items():
+                generate_dark_theme_markdown(user_stats, roster[user_id])
+            render_seconds = time.perf_counter() - start
+
+            results[size] = (collect_seconds, render_seconds)
+            print(f"{size:>7} users  collect {collect_seconds:>8.2f}s  render {render_seconds:>8.3f}s  "
+                  f"({size / collect_seconds:.1f} users/s)")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite against recorded fixtures.")
+    parser.add_argument("--fixtures-dir", default=DEFAULT_FIXTURES_DIR, help="Directory with recorded fixtures")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000], help="Roster sizes to run")
+    parser.add_argument("--iterations", type=int, default=200, help="get_stats() calls per extractor")
+    parser.add_argument("--max-workers", type=int, default=32, help="Maximum number of concurrent requests")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures_dir)
+    if not fixtures:
+        raise SystemExit(f"No fixtures in {args.fixtures_dir}; record them with python -m benchmarks.fixtures")
+
+    # Per-request log lines would dominate the timings
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        _use_fresh_codeforces_store(work_dir)
+        print("Extractor throughput (in-process replay):")
+        bench_extractors(fixtures, args.iterations)
+        print("End to end (local stand-in server):")
+        bench_end_to_end(fixtures, args.sizes, args.max_workers, work_dir)
@@ -0,0 +1,202 @@
+"""
+Self-contained SVG stats cards.
+Renders a ratings card, a LeetCode difficulty breakdown and a platform
+distribution chart from the collected stats, so the README doesn't depend on
+third-party badge services. Cards are only rewritten when their content
+changes, and each card's content hash is used as its version in the README.
+"""
+
+import os
+import logging
+from html import escape
+from functools import lru_cache
+
+from renderer import THEMES, build_context
+from readme_splice import content_hash, write_if_changed
+
+logger = logging.getLogger(__name__)
+
+CARD_WIDTH = 400
+FONT_FAMILY = "-apple-system,BlinkMacSystemFont,'Segoe UI',Helvetica,Arial,sans-serif"
+
+# Platforms of the distribution chart: (display name, context field, theme color)
+DISTRIBUTION = (
+    ("Codeforces", "cf_problems", "accent"),
+    ("LeetCode", "lc_problems", "medium"),
+    ("CodeChef", "cc_problems", "hard"),
+    ("AtCoder", "ac_problems", "easy"),
+    ("CSES", "cses_problems", "muted_color"),
+)
+
+def _frame(theme, height, title, body):
+    """
+    Wrap card content in the SVG document, background and title.
+    """
+    colors = THEMES[theme]
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{CARD_WIDTH}" height="{height}" '
+        f'viewBox="0 0 {CARD_WIDTH} {height}" role="img" aria-label="{escape(title)}">\n'
+        f'  <rect x="0.5" y="0.5" width="{CARD_WIDTH - 1}" height="{height - 1}" rx="6" '
+        f'fill="#{colors["card_background"]}" stroke="#{colors["card_border"]}"/>\n'
+        f'  <g font-family="{FONT_FAMILY}">\n'
+        f'    <text x="20" y="32" font-size="16" font-weight="600" fill="#{colors["accent"]}">{escape(title)}</text>\n'
+        f'{body}'
+        f'  </g>\n'
+        f'</svg>\n'
+    )
+
+def _count(value):
+    """
+    Numeric value of a stats field, 0 for placeholders like "N/A".
+    """
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+@lru_cache(maxsize=1024)
+def render_ratings_card(theme, rows, total_problems):
+    """
+    Render the ratings card.
+
+    Args:
+        theme (str): Theme name in renderer.THEMES
+        rows (tuple): (platform name, rating, rank) per rated platform
+        total_problems (int): Problems solved on all platforms
+
+    Returns:
+        str: SVG document
+    """
+    colors = THEMES[theme]
+    body = ""
+    for i, (name, rating, rank) in enumerate(rows):
+        y = 66 + i * 28
+        body += (
+            f'    <text x="20" y="{y}" font-size="14" fill="#{colors["text_color"]}">{escape(name)}</text>\n'
+            f'    <text x="230" y="{y}" font-size="16" font-weight="700" text-anchor="end" '
+            f'fill="#{colors["accent"]}">{escape(str(rating))}</text>\n'
+            f'    <text x="250" y="{y}" font-size="13" fill="#{colors["muted_color"]}">{escape(str(rank))}</text>\n'
+        )
+    height = 66 + len(rows) * 28 + 14
+    body += (
+        f'    <text x="20" y="{height - 16}" font-size="12" fill="#{colors["muted_color"]}">'
+        f'{total_problems} problems solved across all platforms</text>\n'
+    )
+    return _frame(theme, height + 10, "Ratings", body)
+
+@lru_cache(maxsize=1024)
+def render_leetcode_card(theme, easy, medium, hard, total):
+    """
+    Render the LeetCode difficulty breakdown card.
+
+    Args:
+        theme (str): Theme name in renderer.THEMES
+        easy (int): Easy problems solved
+        medium (int): Medium problems solved
+        hard (int): Hard problems solved
+        total (int): Problems solved
+
+    Returns:
+        str: SVG document
+    """
+    colors = THEMES[theme]
+    largest = max(1, easy, medium, hard)
+    body = ""
+    for i, (label, count, color) in enumerate((("Easy", easy, "easy"), ("Medium", medium, "medium"),
+                                                ("Hard", hard, "hard"))):
+        y = 62 + i * 28
+        bar_width = round(220 * count / largest)
+        body += (
+            f'    <text x="20" y="{y + 10}" font-size="13" fill="#{colors["text_color"]}">{label}</text>\n'
+            f'    <rect x="90" y="{y}" width="220" height="12" rx="6" fill="#{colors["card_border"]}"/>\n'
+            f'    <rect x="90" y="{y}" width="{bar_width}" height="12" rx="6" fill="#{colors[color]}"/>\n'
+            f'    <text x="380" y="{y + 10}" font-size="13" font-weight="600" text-anchor="end" '
+            f'fill="#{colors["text_color"]}">{count}</text>\n'
+        )
+    return _frame(theme, 160, f"LeetCode: {total} solved", body)
+
+@lru_cache(maxsize=1024)
+def render_distribution_card(theme, counts):
+    """
+    Render the platform distribution chart.
+
+    Args:
+        theme (str): Theme name in renderer.THEMES
+        counts (tuple): Problems solved per platform, in DISTRIBUTION order
+
+    Returns:
+        str: SVG document
+    """
+    colors = THEMES[theme]
+    total = sum(counts)
+    body = (
+        f'    <clipPath id="bar"><rect x="20" y="50" width="360" height="14" rx="7"/></clipPath>\n'
+        f'    <rect x="20" y="50" width="360" height="14" rx="7" fill="#{colors["card_border"]}"/>\n'
+        f'    <g clip-path="url(#bar)">\n'
+    )
+
+    x = 20.0
+    for (name, _, color), count in zip(DISTRIBUTION, counts):
+        if count:
+            width = 360 * count / total
+            body += f'      <rect x="{x:.1f}" y="50" width="{width:.1f}" height="14" fill="#{colors[color]}"/>\n'
+            x += width
+    body += '    </g>\n'
+
+    for i, ((name, _, color), count) in enumerate(zip(DISTRIBUTION, counts)):
+        column, row = i % 2, i // 2
+        lx, ly = 20 + column * 190, 92 + row * 24
+        percent = round(100 * count / total) if total else 0
+        body += (
+            f'    <circle cx="{lx + 5}" cy="{ly - 4}" r="5" fill="#{colors[color]}"/>\n'
+            f'    <text x="{lx + 16}" y="{ly}" font-size="13" fill="#{colors["text_color"]}">'
+            f'{name} <tspan fill="#{colors["muted_color"]}">{count} ({percent}%)</tspan></text>\n'
+        )
+    return _frame(theme, 92 + ((len(DISTRIBUTION) + 1) // 2) * 24, f"Platform Activity: {total} problems", body)
+
+def render_cards(context, theme="dark"):
+    """
+    Render all cards of one user.
+
+    Args:
+        context (dict): Fields as returned by renderer.build_context()
+        theme (str): Theme name in renderer.THEMES
+
+    Returns:
+        dict: Card name -> SVG document
+    """
+    rows = (
+        ("Codeforces", context["cf_rating"], context["cf_rank"]),
+        ("CodeChef", context["cc_rating"], context["cc_rank"]),
+        ("AtCoder", context["ac_rating"], context["ac_rank"]),
+    )
+    return {
+        "ratings": render_ratings_card(theme, rows, _count(context["total_problems"])),
+        "leetcode": render_leetcode_card(theme, _count(context["lc_easy"]), _count(context["lc_medium"]),
+                                         _count(context["lc_hard"]), _count(context["lc_problems"])),
+        "distribution": render_distribution_card(
+            theme, tuple(_count(context[field]) for _, field, _ in DISTRIBUTION)
+        ),
+    }
+
+def write_cards(stats, cards_dir, theme="dark"):
+    """
+    Render the cards of one user and write the ones that changed.
+
+    Args:
+        stats (dict): Dictionary of statistics from all platforms
+        cards_dir (str): Directory to write the cards to
+        theme (str): Theme name in renderer.THEMES
+
+    Returns:
+        dict: "<card>_version" -> short content hash, for the cards layout
+    """
+    versions = {}
+    written = []
+    for name, svg in render_cards(build_context(stats), theme).items():
+        if write_if_changed(os.path.join(cards_dir, f"{name}.svg"), svg):
+            written.append(name)
+        versions[f"{name}_version"] = content_hash(svg)[:12]
+
+    if written:
+        logger.info(f"Wrote stats cards to {cards_dir}: {', '.join(written)}")
+    else:
+        logger.info(f"Stats cards in {cards_dir} are unchanged")
+    return versions
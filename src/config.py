@@ -2,6 +2,27 @@
 Configuration file for competitive programming statistics.
 """
 
+import os
+
+# Directory for generated files and local state
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# User id of the PROFILES user in local state (snapshots, history)
+DEFAULT_USER_ID = "default"
+
+# Last successfully collected stats per user and platform, used when a platform fails
+SNAPSHOT_STORE_PATH = os.path.join(DATA_DIR, "last_good_stats.json")
+
+# Append-only SQLite history of every run's stats
+HISTORY_DB_PATH = os.path.join(DATA_DIR, "stats_history.sqlite")
+
+# Render the README from the last good stats right away, before waiting for the
+# platforms; it is rendered again once the refresh finishes
+STALE_WHILE_REVALIDATE = False
+
+# SQLite store of synced Codeforces submissions (for incremental solved counts)
+CODEFORCES_STORE_PATH = os.path.join(DATA_DIR, "codeforces_submissions.sqlite")
+
 # User profiles for competitive programming platforms
 PROFILES = {
     "codeforces": {
@@ -25,3 +46,100 @@ PROFILES = {
         "url": "https://cses.fi/user/334483",
     },
 }
+
+# Profile URL templates, used to build profiles for roster entries
+PROFILE_URLS = {
+    "codeforces": "https://codeforces.com/profile/{username}",
+    "leetcode": "https://leetcode.com/{username}/",
+    "codechef": "https://www.codechef.com/users/{username}",
+    "atcoder": "https://atcoder.jp/users/{username}",
+    "cses": "https://cses.fi/user/{username}",
+}
+
+# Maximum number of concurrent platform requests in batch (roster) mode
+BATCH_MAX_WORKERS = 16
+
+# Number of worker processes parsing scraped pages in batch mode (0 parses them
+# in the fetch threads). Parsing is CPU-bound, so this scales with the cores.
+BATCH_PARSE_PROCESSES = os.cpu_count() or 1
+
+# Work-queue mode of batch runs (batch.py --queue): queue file, users leased at
+# a time, seconds until a lease expires, leases per user before it is given up,
+# and number of shards the users are spread over
+QUEUE_DB_PATH = os.path.join(DATA_DIR, "roster_queue.sqlite")
+QUEUE_BATCH_SIZE = 25
+QUEUE_LEASE_SECONDS = 10 * 60
+QUEUE_MAX_ATTEMPTS = 3
+QUEUE_SHARDS = 64
+
+# Number of LeetCode users fetched per aliased GraphQL request in batch mode
+LEETCODE_BATCH_SIZE = 20
+
+# Shared HTTP client settings: per-host connection pools, connections per host
+# and default (connect, read) timeout in seconds
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 16
+HTTP_TIMEOUT = (5, 30)
+
+# Per-host rate limits as (requests per second, burst), and the number of
+# retries after a 429/503 response. Codeforces allows about one call every two seconds.
+RATE_LIMITS = {
+    "codeforces.com": (0.5, 1),
+    "leetcode.com": (2, 4),
+    "www.codechef.com": (1, 2),
+    "atcoder.jp": (1, 2),
+    "cses.fi": (2, 4),
+}
+HTTP_MAX_RETRIES = 3
+
+# Time budget in seconds for collecting stats in a single-user run. Requests
+# time out within it and unfinished platforms fall back to error stats.
+RUN_TIME_BUDGET = 120
+
+# On-disk cache for scraped profile pages: directory, size cap in bytes and
+# freshness lifetime in seconds for pages served without ETag/Last-Modified
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, "http_cache")
+HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+HTTP_CACHE_TTL = 6 * 60 * 60
+
+# HTML parser backend for scraped pages: "selectolax", "lxml", "html.parser",
+# or None to use the fastest one installed
+HTML_PARSER_BACKEND = None
+
+# Per-stage run metrics: Prometheus text file and JSON summary of each run
+METRICS_PROM_PATH = os.path.join(DATA_DIR, "metrics.prom")
+METRICS_SUMMARY_PATH = os.path.join(DATA_DIR, "run_summary.json")
+
+# Theme of the rendered stats Markdown: "dark" or "light" (see renderer.THEMES)
+MARKDOWN_THEME = "dark"
+
+# Markers around the stats section in README files
+README_START_MARKER = "<!-- CP-STATS:START -->"
+README_END_MARKER = "<!-- CP-STATS:END -->"
+
+# Maximum number of README/output files written at once in batch mode
+README_MAX_WORKERS = 8
+
+# Render the README stats as local SVG cards in CARDS_DIR instead of shields.io badges
+MARKDOWN_CARDS = True
+CARDS_DIR = os.path.join(DATA_DIR, "cards")
+
+# Stats server (server.py): address, cache size, and how long stats are served
+# from memory per platform before they are fetched again (seconds)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
+SERVER_CACHE_MAX_ENTRIES = 4096
+SERVER_CACHE_TTLS = {
+    "codeforces": 10 * 60,
+    "leetcode": 15 * 60,
+    "codechef": 30 * 60,
+    "atcoder": 30 * 60,
+    "cses": 60 * 60,
+}
+# Failed fetches are cached briefly so a broken platform isn't hammered
+SERVER_ERROR_TTL = 60
+# Keys read at least SERVER_HOT_HITS times since their last fetch are refreshed
+# in the background shortly before they expire
+SERVER_HOT_HITS = 2
+SERVER_REFRESH_INTERVAL = 30
+SERVER_REFRESH_WORKERS = 4
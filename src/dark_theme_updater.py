@@ -4,20 +4,34 @@ Updates a section in the GitHub README.md with the latest competitive programmin
 """
 
 import os
-import re
 import json
+import time
 import logging
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
-# Import extractors
-from extractors.codeforces import CodeforcesExtractor
-from extractors.leetcode import LeetCodeExtractor
-from extractors.codechef import CodeChefExtractor
-from extractors.atcoder import AtCoderExtractor
-from extractors.cses import CSESExtractor
+# Import extractors (platform modules are imported on first use)
+from extractors import configured_platforms, get_extractor, platform_name
+from extractors.codeforces_store import CodeforcesSubmissionStore
+from extractors.http_cache import HttpCache
+from extractors.rate_limit import RateLimiter
+from extractors.deadline import Deadline, exit_process, run_with_deadline, use_deadline
+from snapshot_store import SnapshotStore
+from history_store import HistoryStore
+from renderer import render_markdown
+from readme_splice import update_readme, write_if_changed
+from cards import write_cards
+from rating_analytics import add_rating_metrics
+from extractors import html_parser, metrics
 
 # Import config
-from config import PROFILES
+from config import (
+    PROFILES, DATA_DIR, CODEFORCES_STORE_PATH,
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_TIMEOUT, RATE_LIMITS, HTTP_MAX_RETRIES,
+    HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTL, HTML_PARSER_BACKEND, RUN_TIME_BUDGET,
+    DEFAULT_USER_ID, SNAPSHOT_STORE_PATH, STALE_WHILE_REVALIDATE, HISTORY_DB_PATH, MARKDOWN_THEME,
+    MARKDOWN_CARDS, CARDS_DIR, METRICS_PROM_PATH, METRICS_SUMMARY_PATH,
+)
 
 # Set up logging
 logging.basicConfig(
@@ -31,270 +45,205 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def collect_stats():
+_codeforces_store = None
+_codeforces_store_lock = threading.Lock()
+
+def get_codeforces_store():
+    """
+    Get the shared Codeforces submission store, opening it on first use.
+    
+    Returns:
+        CodeforcesSubmissionStore: Store used for incremental submission syncs
+    """
+    global _codeforces_store
+    with _codeforces_store_lock:
+        if _codeforces_store is None:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            _codeforces_store = CodeforcesSubmissionStore(CODEFORCES_STORE_PATH)
+        return _codeforces_store
+
+def configure_http_client(pool_maxsize=HTTP_POOL_MAXSIZE, rate_limit_share=1):
+    """
+    Set up the shared HTTP client, its on-disk page cache and rate limits from config.
+    
+    Args:
+        pool_maxsize (int): Maximum number of connections kept per host
+        rate_limit_share (int): Number of processes sharing the configured rate limits
+    
+    Returns:
+        HttpClient: The shared client
+    """
+    # Imported here: it pulls in requests and urllib3, which startup doesn't need
+    from extractors import http_client
+    
+    cache = HttpCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTL)
+    # Processes on one machine share its per-host limits
+    limits = {host: (rate / rate_limit_share, burst) for host, (rate, burst) in RATE_LIMITS.items()}
+    rate_limiter = RateLimiter(limits)
+    return http_client.configure(HTTP_POOL_CONNECTIONS, pool_maxsize, HTTP_TIMEOUT, cache,
+                                 rate_limiter, HTTP_MAX_RETRIES)
+
+def get_error_stats(platform, username):
+    """
+    Build the stats dict used when a platform could not be collected.
+    
+    Args:
+        platform (str): Platform key in extractors.REGISTRY
+        username (str): Username on the platform
+    
+    Returns:
+        dict: Error statistics, as returned by the platform's extractor
+    """
+    return get_extractor(platform)(username)._get_error_stats()
+
+def collect_platform_stats(platform, username, **extractor_kwargs):
+    """
+    Collect statistics from a single platform.
+    
+    Args:
+        platform (str): Platform key in extractors.REGISTRY
+        username (str): Username on the platform
+        **extractor_kwargs: Extra keyword arguments for the extractor
+    
+    Returns:
+        dict: Statistics for the platform, or error stats if collection failed
+    """
+    name = platform_name(platform)
+    extractor_class = get_extractor(platform)
+    with metrics.tags(platform=platform, user=username):
+        start = time.perf_counter()
+        try:
+            logger.info(f"Collecting {name} stats...")
+            if platform == "codeforces":
+                extractor_kwargs.setdefault("store", get_codeforces_store())
+            stats = extractor_class(username, **extractor_kwargs).get_stats()
+        except Exception as e:
+            logger.error(f"Error collecting {name} stats: {e}")
+            stats = get_error_stats(platform, username)
+        seconds = time.perf_counter() - start
+        metrics.record("collect", seconds)
+        metrics.count("profiles_collected", status=stats.get("status", "Unknown"))
+    logger.info(f"{name} stats for {username} collected in {seconds:.2f}s ({stats.get('status')})")
+    logger.debug(f"{name} stats: {stats}")
+    return stats
+
+def collect_stats(profiles=None, concurrent=True, max_workers=None, deadline=None):
     """
     Collect statistics from all platforms.
     
+    Each platform is independent, so by default every extractor runs in its
+    own worker thread and the total time is that of the slowest platform.
+    With a deadline, request timeouts are derived from the time left and
+    platforms still unfinished when it runs out get error stats.
+    
+    Args:
+        profiles (dict): Platform profiles to collect (defaults to config.PROFILES)
+        concurrent (bool): Run the extractors in parallel
+        max_workers (int): Maximum number of worker threads (defaults to one per platform)
+        deadline (Deadline): Time budget for the whole collection, if bounded
+    
     Returns:
         dict: Dictionary of statistics from all platforms
     """
+    profiles = PROFILES if profiles is None else profiles
+    platforms = configured_platforms(profiles)
+    
+    if not concurrent:
+        with use_deadline(deadline):
+            return {
+                platform: collect_platform_stats(platform, profiles[platform]["username"])
+                for platform in platforms
+            }
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers or max(1, len(platforms)))
+    futures = {
+        platform: executor.submit(run_with_deadline, deadline, collect_platform_stats,
+                                  platform, profiles[platform]["username"])
+        for platform in platforms
+    }
+    wait(futures.values(), timeout=deadline.remaining() if deadline else None)
+    # Don't block on stragglers; their requests time out on their own
+    executor.shutdown(wait=False, cancel_futures=True)
+    
+    # Keep the platform order stable regardless of completion order
     stats = {}
+    for platform, future in futures.items():
+        username = profiles[platform]["username"]
+        if future.done() and not future.cancelled():
+            stats[platform] = future.result()
+        else:
+            logger.warning(f"{platform_name(platform)} stats not collected within the time budget")
+            stats[platform] = get_error_stats(platform, username)
     
-    # Codeforces
-    try:
-        logger.info("Collecting Codeforces stats...")
-        cf_extractor = CodeforcesExtractor(PROFILES["codeforces"]["username"])
-        stats["codeforces"] = cf_extractor.get_stats()
-        logger.info(f"Codeforces stats collected: {stats['codeforces']}")
-    except Exception as e:
-        logger.error(f"Error collecting Codeforces stats: {e}")
-        stats["codeforces"] = {
-            "platform": "Codeforces",
-            "username": PROFILES["codeforces"]["username"],
-            "status": "Error",
-            "rating": "N/A",
-            "max_rating": "N/A",
-            "rank": "N/A",
-            "problems_solved": 0,
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-    
-    # LeetCode
-    try:
-        logger.info("Collecting LeetCode stats...")
-        lc_extractor = LeetCodeExtractor(PROFILES["leetcode"]["username"])
-        stats["leetcode"] = lc_extractor.get_stats()
-        logger.info(f"LeetCode stats collected: {stats['leetcode']}")
-    except Exception as e:
-        logger.error(f"Error collecting LeetCode stats: {e}")
-        stats["leetcode"] = {
-            "platform": "LeetCode",
-            "username": PROFILES["leetcode"]["username"],
-            "status": "Error",
-            "rating": "N/A",
-            "max_rating": "N/A",
-            "rank": "N/A",
-            "problems_solved": 0,
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-    
-    # CodeChef
-    try:
-        logger.info("Collecting CodeChef stats...")
-        cc_extractor = CodeChefExtractor(PROFILES["codechef"]["username"])
-        stats["codechef"] = cc_extractor.get_stats()
-        logger.info(f"CodeChef stats collected: {stats['codechef']}")
-    except Exception as e:
-        logger.error(f"Error collecting CodeChef stats: {e}")
-        stats["codechef"] = {
-            "platform": "CodeChef",
-            "username": PROFILES["codechef"]["username"],
-            "status": "Error",
-            "rating": "N/A",
-            "max_rating": "N/A",
-            "rank": "N/A",
-            "problems_solved": 0,
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-    
-    # AtCoder
-    try:
-        logger.info("Collecting AtCoder stats...")
-        ac_extractor = AtCoderExtractor(PROFILES["atcoder"]["username"])
-        stats["atcoder"] = ac_extractor.get_stats()
-        logger.info(f"AtCoder stats collected: {stats['atcoder']}")
-    except Exception as e:
-        logger.error(f"Error collecting AtCoder stats: {e}")
-        stats["atcoder"] = {
-            "platform": "AtCoder",
-            "username": PROFILES["atcoder"]["username"],
-            "status": "Error",
-            "rating": "N/A",
-            "max_rating": "N/A",
-            "rank": "N/A",
-            "problems_solved": 0,
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-    
-    # CSES
+    return stats
+
+def record_history(results):
+    """
+    Append a run's stats to the history store.
+    
+    Args:
+        results (dict): User id -> platform -> stats
+    
+    Returns:
+        bool: True if the stats were recorded, False otherwise
+    """
     try:
-        logger.info("Collecting CSES stats...")
-        cses_extractor = CSESExtractor(PROFILES["cses"]["username"])
-        stats["cses"] = cses_extractor.get_stats()
-        logger.info(f"CSES stats collected: {stats['cses']}")
+        history = HistoryStore(HISTORY_DB_PATH)
+        try:
+            history.append(results)
+        finally:
+            history.close()
+        return True
     except Exception as e:
-        logger.error(f"Error collecting CSES stats: {e}")
-        stats["cses"] = {
-            "platform": "CSES",
-            "username": PROFILES["cses"]["username"],
-            "status": "Error",
-            "rating": "N/A",
-            "max_rating": "N/A",
-            "rank": "N/A",
-            "problems_solved": 0,
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-    
-    return stats
+        logger.error(f"Error recording stats history: {e}")
+        return False
 
-def generate_dark_theme_markdown(stats):
+def generate_dark_theme_markdown(stats, profiles=None, theme=MARKDOWN_THEME, cards_dir=None, cards_path=None):
     """
-    Generate dark-themed Markdown for GitHub README.
+    Generate themed Markdown for GitHub README.
+    
+    With a cards directory, the stats are shown as SVG cards written there
+    instead of shields.io badges.
     
     Args:
         stats (dict): Dictionary of statistics from all platforms
+        profiles (dict): Platform profiles used for links (defaults to config.PROFILES)
+        theme (str): Theme name in renderer.THEMES
+        cards_dir (str): Directory to write the SVG cards to, if using cards
+        cards_path (str): Path of cards_dir as linked from the Markdown (defaults to cards_dir)
     
     Returns:
-        str: Dark-themed Markdown content
+        str: Themed Markdown content
     """
-    # Extract stats for each platform
-    cf_stats = stats.get("codeforces", {})
-    lc_stats = stats.get("leetcode", {})
-    cc_stats = stats.get("codechef", {})
-    ac_stats = stats.get("atcoder", {})
-    cses_stats = stats.get("cses", {})
-    
-    # Get values with fallbacks
-    cf_rating = cf_stats.get("rating", "N/A")
-    cf_rank = cf_stats.get("rank", "N/A")
-    cf_problems = cf_stats.get("problems_solved", 0)
-    
-    lc_problems = lc_stats.get("problems_solved", 0)
-    lc_easy = lc_stats.get("easy_solved", 0)
-    lc_medium = lc_stats.get("medium_solved", 0)
-    lc_hard = lc_stats.get("hard_solved", 0)
-    
-    cc_rating = cc_stats.get("rating", "N/A")
-    cc_rank = cc_stats.get("rank", "N/A")
-    cc_problems = cc_stats.get("problems_solved", 0)
-    
-    ac_rating = ac_stats.get("rating", "N/A")
-    ac_rank = ac_stats.get("rank", "N/A")
-    ac_problems = ac_stats.get("problems_solved", 0)
-    
-    cses_problems = cses_stats.get("problems_solved", 0)
-    
-    # Calculate total problems
-    total_problems = cf_problems + lc_problems + cc_problems + ac_problems + cses_problems
-    
-    # Calculate platform distribution percentages
-    total = max(1, total_problems)  # Avoid division by zero
-    cf_percent = round((cf_problems / total) * 100)
-    lc_percent = round((lc_problems / total) * 100)
-    others_percent = 100 - cf_percent - lc_percent
-    
-    # Format last updated date
-    last_updated = datetime.now().strftime("%B %d, %Y")
-    
-    # Generate the Markdown
-    markdown = f"""<!-- Competitive Programming Stats - Dark Theme -->
-
-<div align="center">
-
-  <!-- Title with custom styling -->
-  <h2>🏆 Competitive Programming Stats</h2>
-
-  <!-- Main Stats Cards - Top Row -->
-  <a href="https://codeforces.com/profile/{PROFILES['codeforces']['username']}">
-    <img src="https://img.shields.io/badge/Codeforces-{cf_rating}-58d3b9?style=for-the-badge&logo=codeforces&logoColor=white&labelColor=0d1117" alt="Codeforces">
-  </a>
-  <a href="https://leetcode.com/{PROFILES['leetcode']['username']}/">
-    <img src="https://img.shields.io/badge/LeetCode-{lc_problems}_problems-58d3b9?style=for-the-badge&logo=leetcode&logoColor=white&labelColor=0d1117" alt="LeetCode">
-  </a>
-  <a href="https://www.codechef.com/users/{PROFILES['codechef']['username']}">
-    <img src="https://img.shields.io/badge/CodeChef-{cc_rating}-58d3b9?style=for-the-badge&logo=codechef&logoColor=white&labelColor=0d1117" alt="CodeChef">
-  </a>
-
-  <!-- Stats Summary in GitHub-compatible table -->
-  <table>
-    <tr>
-      <td align="center" width="200">
-        <h1>{cf_rating}</h1>
-        <strong>Codeforces Rating</strong>
-        <br>
-        <code>{cf_rank}</code>
-      </td>
-      <td align="center" width="200">
-        <h1>{lc_problems}</h1>
-        <strong>Problems Solved</strong>
-        <br>
-        <code>LeetCode</code>
-      </td>
-      <td align="center" width="200">
-        <h1>{cc_rating}</h1>
-        <strong>CodeChef Rating</strong>
-        <br>
-        <code>{cc_rank}</code>
-      </td>
-    </tr>
-  </table>
-
-  <!-- LeetCode Progress -->
-  <h3>LeetCode Progress</h3>
-  <a href="https://leetcode.com/{PROFILES['leetcode']['username']}/">
-    <img src="https://img.shields.io/badge/Easy-{lc_easy}-3498db?style=flat-square&labelColor=0d1117" alt="Easy">
-    <img src="https://img.shields.io/badge/Medium-{lc_medium}-f39c12?style=flat-square&labelColor=0d1117" alt="Medium">
-    <img src="https://img.shields.io/badge/Hard-{lc_hard}-e74c3c?style=flat-square&labelColor=0d1117" alt="Hard">
-  </a>
-
-  <!-- Platform Distribution -->
-  <h3>Platform Activity</h3>
-  <a href="#">
-    <img src="https://img.shields.io/badge/Codeforces-{cf_percent}%25-58d3b9?style=flat-square&labelColor=0d1117" alt="Codeforces">
-    <img src="https://img.shields.io/badge/LeetCode-{lc_percent}%25-58d3b9?style=flat-square&labelColor=0d1117" alt="LeetCode">
-    <img src="https://img.shields.io/badge/Others-{others_percent}%25-58d3b9?style=flat-square&labelColor=0d1117" alt="Others">
-  </a>
-  
-  <br><br>
-  <i>Last updated: {last_updated}</i>
-</div>"""
-    
-    return markdown
+    with metrics.span("render"):
+        if cards_dir is None:
+            return render_markdown(stats, profiles, theme)
+        
+        versions = write_cards(stats, cards_dir, theme)
+        extra_fields = dict(versions, cards_path=cards_path or cards_dir)
+        return render_markdown(stats, profiles, theme, layout="cards", extra_fields=extra_fields)
 
-def update_readme_section(readme_path, stats_markdown, section_header="## Competitive Programming Stats"):
+def update_readme_section(readme_path, stats_markdown):
     """
-    Updates a specific section in the README.md file with new content.
+    Updates the stats section of the README.md file with new content.
+    
+    The section is delimited by README_START_MARKER and README_END_MARKER and
+    appended with them if missing. The file is left untouched when the
+    content is unchanged apart from the "Last updated" date, so the daily
+    workflow only commits when the stats change.
     
     Args:
         readme_path (str): Path to the README.md file
         stats_markdown (str): New markdown content to insert
-        section_header (str): Header that marks the section to update
     
     Returns:
         bool: True if update was successful, False otherwise
     """
     try:
-        # Check if README exists
-        if not os.path.exists(readme_path):
-            logger.warning(f"README file not found at {readme_path}. Creating new file.")
-            with open(readme_path, 'w', encoding='utf-8') as f:
-                f.write(f"{stats_markdown}\n")
-            return True
-        
-        # Read existing README
-        with open(readme_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Check if section exists
-        if section_header in content:
-            # Find the section and replace it
-            pattern = f"({re.escape(section_header)}.*?)(?=^#|\\Z)"
-            replacement = stats_markdown
-            
-            # Use regex with DOTALL flag to match across multiple lines
-            new_content = re.sub(pattern, replacement, content, flags=re.MULTILINE | re.DOTALL)
-            
-            with open(readme_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-                
-            logger.info(f"Updated section '{section_header}' in {readme_path}")
+        if update_readme(readme_path, stats_markdown, ignore_date=True):
+            logger.info(f"Updated stats section in {readme_path}")
         else:
-            # Section doesn't exist, append to the end
-            with open(readme_path, 'a', encoding='utf-8') as f:
-                f.write(f"\n{stats_markdown}\n")
-                
-            logger.info(f"Added new section '{section_header}' to {readme_path}")
-        
+            logger.info(f"Stats section in {readme_path} is unchanged, not rewriting it")
         return True
     except Exception as e:
         logger.error(f"Error updating README: {e}")
@@ -309,39 +258,82 @@ def save_markdown_to_file(markdown, output_path):
         output_path (str): Path to save the file
     """
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(markdown)
-        logger.info(f"Markdown saved to {output_path}")
+        if write_if_changed(output_path, markdown):
+            logger.info(f"Markdown saved to {output_path}")
+        else:
+            logger.info(f"Markdown at {output_path} is unchanged")
         return True
     except Exception as e:
         logger.error(f"Error saving Markdown: {e}")
         return False
 
-def main(readme_path=None):
+def main(readme_path=None, stale_while_revalidate=STALE_WHILE_REVALIDATE):
     """
     Main function to update README with dark-themed competitive programming statistics.
     
+    Platforms that fail are shown with their last good stats. In
+    stale-while-revalidate mode the README is rendered right away from the
+    last good stats, then rendered again once the refresh finishes: with
+    fresh stats for the platforms that finished in time, and the last good
+    stats only for the rest.
+    
     Args:
         readme_path (str): Path to the README.md file
+        stale_while_revalidate (bool): Render from the last good stats before waiting for the refresh
     """
     # Set default path if not provided
     if not readme_path:
         readme_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "README.md")
+    output_path = os.path.join(DATA_DIR, "dark_theme_stats.md")
+    os.makedirs(DATA_DIR, exist_ok=True)
+    
+    # Cards are linked relative to the README so they render on GitHub
+    cards_dir = CARDS_DIR if MARKDOWN_CARDS else None
+    cards_path = os.path.relpath(CARDS_DIR, os.path.dirname(os.path.abspath(readme_path))).replace(os.sep, "/")
+    
+    # Share one pooled, cached HTTP client across all extractors
+    configure_http_client()
+    html_parser.set_backend(HTML_PARSER_BACKEND)
     
-    # Collect stats
-    stats = collect_stats()
+    snapshots = SnapshotStore(SNAPSHOT_STORE_PATH)
+    
+    if stale_while_revalidate:
+        cached_stats = snapshots.get_stale(DEFAULT_USER_ID, configured_platforms(PROFILES))
+        if cached_stats:
+            update_readme_section(readme_path, generate_dark_theme_markdown(
+                cached_stats, cards_dir=cards_dir, cards_path=cards_path))
+            logger.info("Rendered last good stats, refreshing them")
+        else:
+            logger.info("No complete snapshot yet, waiting for fresh stats")
+    
+    # Collect stats within the run's time budget
+    stats = collect_stats(deadline=Deadline(RUN_TIME_BUDGET))
+    from extractors import http_client
+    logger.info(f"Rate limit queue waits: {http_client.queue_wait_stats()}")
+    
+    # Derive contest metrics from the synced Codeforces rating history
+    add_rating_metrics({DEFAULT_USER_ID: stats}, get_codeforces_store())
+    
+    # Remember what succeeded and fall back to the last good stats for the rest
+    record_history({DEFAULT_USER_ID: stats})
+    snapshots.update(DEFAULT_USER_ID, stats)
+    snapshots.save()
+    stats = snapshots.fill_failed(DEFAULT_USER_ID, stats)
     
     # Generate dark-themed Markdown
-    markdown = generate_dark_theme_markdown(stats)
+    markdown = generate_dark_theme_markdown(stats, cards_dir=cards_dir, cards_path=cards_path)
     
     # Save to file for reference
-    output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-    os.makedirs(output_dir, exist_ok=True)
-    save_markdown_to_file(markdown, os.path.join(output_dir, "dark_theme_stats.md"))
+    save_markdown_to_file(markdown, output_path)
+    
+    # Update README, replacing the last good stats of platforms that were refreshed
+    result = update_readme_section(readme_path, markdown)
     
-    # Update README
-    return update_readme_section(readme_path, markdown)
+    metrics.export(METRICS_PROM_PATH, METRICS_SUMMARY_PATH)
+    return result
 
 if __name__ == "__main__":
     # Run updater
     main()
+    # Don't let requests still running past the time budget hold up the exit
+    exit_process()
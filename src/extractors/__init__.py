@@ -0,0 +1,61 @@
+"""
+Registry of the platform extractors.
+Extractor modules are only imported when a platform is first used, so a run
+does not pay for (or require the dependencies of) platforms it doesn't collect.
+"""
+
+import threading
+import importlib
+
+# Platform key -> (display name, module, class name), in display order
+REGISTRY = {
+    "codeforces": ("Codeforces", "codeforces", "CodeforcesExtractor"),
+    "leetcode": ("LeetCode", "leetcode", "LeetCodeExtractor"),
+    "codechef": ("CodeChef", "codechef", "CodeChefExtractor"),
+    "atcoder": ("AtCoder", "atcoder", "AtCoderExtractor"),
+    "cses": ("CSES", "cses", "CSESExtractor"),
+}
+
+_classes = {}
+_classes_lock = threading.Lock()
+
+def platform_name(platform):
+    """
+    Get the display name of a platform.
+
+    Args:
+        platform (str): Platform key in REGISTRY
+
+    Returns:
+        str: Display name, e.g. "LeetCode"
+    """
+    return REGISTRY[platform][0]
+
+def configured_platforms(profiles):
+    """
+    List the platforms of a profiles dict that have an extractor.
+
+    Args:
+        profiles (dict): Platform profiles, e.g. config.PROFILES
+
+    Returns:
+        list: Platform keys in display order
+    """
+    return [platform for platform in REGISTRY if platform in profiles]
+
+def get_extractor(platform):
+    """
+    Get the extractor class of a platform, importing its module on first use.
+
+    Args:
+        platform (str): Platform key in REGISTRY
+
+    Returns:
+        type: Extractor class
+    """
+    with _classes_lock:
+        if platform not in _classes:
+            _, module_name, class_name = REGISTRY[platform]
+            module = importlib.import_module(f".{module_name}", __name__)
+            _classes[platform] = getattr(module, class_name)
+        return _classes[platform]
@@ -2,13 +2,24 @@
 AtCoder data extractor module.
 """
 
-import requests
 import logging
 from datetime import datetime
-from bs4 import BeautifulSoup
+
+from . import http_client, html_parser, parse_pool
+from .html_parser import ParseOnly
+from .html_stream import StopAfter, ElementTarget
 
 logger = logging.getLogger(__name__)
 
+# Only the profile tables and links are needed
+PARSE_ONLY = ParseOnly(names=["table", "a"])
+
+# The download can stop once the rating table and the accepted-submissions link are seen
+STOP_AFTER = StopAfter(
+    ElementTarget("table", classes=["dl-table"], text="Rating"),
+    ElementTarget("a", href="/submissions?f.Status=AC"),
+)
+
 class AtCoderExtractor:
     """
     Class for extracting user statistics from AtCoder.
@@ -36,64 +47,89 @@ class AtCoderExtractor:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
-            response = requests.get(self.profile_url, headers=headers)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Extract rating
-            rating = "N/A"
-            rank = "Unrated"
-            
-            # Find the table with user information
-            tables = soup.select("table.dl-table")
-            if tables:
-                for table in tables:
-                    rows = table.select("tr")
-                    for row in rows:
-                        cells = row.select("td, th")
-                        if len(cells) >= 2:
-                            header = cells[0].text.strip()
-                            value = cells[1].text.strip()
-                            
-                            if "Rating" in header:
-                                try:
-                                    rating = int(value.split()[0])
-                                except (ValueError, IndexError):
-                                    rating = "N/A"
-                            
-                            if "Class" in header or "Rank" in header:
-                                rank = value
+            page = http_client.get_cached(self.profile_url, headers=headers, stop_after=STOP_AFTER)
             
-            # Extract problems solved (this is an approximation)
-            problems_solved = 0
-            submissions_link = soup.select_one("a[href*='/submissions?f.Status=AC']")
-            if submissions_link:
-                try:
-                    # Try to extract the count from the link text
-                    text = submissions_link.text.strip()
-                    if "(" in text and ")" in text:
-                        count_str = text.split("(")[1].split(")")[0]
-                        problems_solved = int(count_str)
-                except Exception as e:
-                    logger.warning(f"Could not extract problems solved: {e}")
+            # Unchanged page: reuse the stats parsed on an earlier run
+            if page.parsed is not None:
+                stats = dict(page.parsed)
+                stats["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                return stats
             
-            return {
-                "platform": "AtCoder",
-                "username": self.username,
-                "status": "Active",
-                "rating": rating,
-                "max_rating": "N/A",  # AtCoder doesn't show max rating directly on profile
-                "rank": rank,
-                "problems_solved": problems_solved,
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            # Parse in the process pool when one is configured
+            stats = parse_pool.parse_stats(self, page.text)
+            if page.partial and stats["rating"] == "N/A":
+                # The start of the page looked complete but didn't parse: use the whole page
+                logger.info(f"Early-stopped download of {self.profile_url} was incomplete, downloading the full page")
+                page = http_client.get_cached(self.profile_url, headers=headers)
+                stats = parse_pool.parse_stats(self, page.text)
+            page.store_parsed(stats)
+            return stats
         
         except Exception as e:
             logger.error(f"Error extracting AtCoder stats: {e}")
             return self._get_error_stats()
     
+    def parse_stats(self, html):
+        """
+        Parse user statistics from an AtCoder profile page.
+        
+        Args:
+            html (str): Profile page HTML
+        
+        Returns:
+            dict: User statistics
+        """
+        # Parse HTML
+        soup = html_parser.parse_html(html, PARSE_ONLY)
+        
+        # Extract rating
+        rating = "N/A"
+        rank = "Unrated"
+        
+        # Find the table with user information
+        tables = soup.select("table.dl-table")
+        if tables:
+            for table in tables:
+                rows = table.select("tr")
+                for row in rows:
+                    cells = row.select("td, th")
+                    if len(cells) >= 2:
+                        header = cells[0].text.strip()
+                        value = cells[1].text.strip()
+                        
+                        if "Rating" in header:
+                            try:
+                                rating = int(value.split()[0])
+                            except (ValueError, IndexError):
+                                rating = "N/A"
+                        
+                        if "Class" in header or "Rank" in header:
+                            rank = value
+        
+        # Extract problems solved (this is an approximation)
+        problems_solved = 0
+        submissions_link = soup.select_one("a[href*='/submissions?f.Status=AC']")
+        if submissions_link:
+            try:
+                # Try to extract the count from the link text
+                text = submissions_link.text.strip()
+                if "(" in text and ")" in text:
+                    count_str = text.split("(")[1].split(")")[0]
+                    problems_solved = int(count_str)
+            except Exception as e:
+                logger.warning(f"Could not extract problems solved: {e}")
+        
+        return {
+            "platform": "AtCoder",
+            "username": self.username,
+            "status": "Active",
+            "rating": rating,
+            "max_rating": "N/A",  # AtCoder doesn't show max rating directly on profile
+            "rank": rank,
+            "problems_solved": problems_solved,
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    
     def _get_error_stats(self):
         """
         Return error stats when API call fails.
@@ -2,13 +2,17 @@
 CodeChef data extractor module.
 """
 
-import requests
 import logging
 from datetime import datetime
-from bs4 import BeautifulSoup
+
+from . import http_client, html_parser, parse_pool
+from .html_parser import ParseOnly
 
 logger = logging.getLogger(__name__)
 
+# Only the rating and problems elements are needed
+PARSE_ONLY = ParseOnly(classes=["rating-number", "rating-star", "problems-solved"])
+
 class CodeChefExtractor:
     """
     Class for extracting user statistics from CodeChef.
@@ -36,46 +40,66 @@ class CodeChefExtractor:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
-            response = requests.get(self.profile_url, headers=headers)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Extract rating
-            rating_element = soup.select_one(".rating-number")
-            rating = int(rating_element.text.strip()) if rating_element else "N/A"
+            page = http_client.get_cached(self.profile_url, headers=headers)
             
-            # Extract rank/stars
-            rank_element = soup.select_one(".rating-star")
-            rank = rank_element.text.strip() if rank_element else "Unrated"
+            # Unchanged page: reuse the stats parsed on an earlier run
+            if page.parsed is not None:
+                stats = dict(page.parsed)
+                stats["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                return stats
             
-            # Extract problems solved
-            problems_solved = 0
-            try:
-                # This is an approximation as CodeChef doesn't show total problems solved directly
-                problems_element = soup.select_one(".problems-solved")
-                if problems_element:
-                    problems_text = problems_element.text
-                    problems_solved = len(problems_text.split(",")) if "," in problems_text else 0
-            except Exception as e:
-                logger.warning(f"Could not extract problems solved: {e}")
-            
-            return {
-                "platform": "CodeChef",
-                "username": self.username,
-                "status": "Active",
-                "rating": rating,
-                "max_rating": "N/A",  # CodeChef doesn't show max rating on profile
-                "rank": rank,
-                "problems_solved": problems_solved,
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            # Parse in the process pool when one is configured
+            stats = parse_pool.parse_stats(self, page.text)
+            page.store_parsed(stats)
+            return stats
         
         except Exception as e:
             logger.error(f"Error extracting CodeChef stats: {e}")
             return self._get_error_stats()
     
+    def parse_stats(self, html):
+        """
+        Parse user statistics from a CodeChef profile page.
+        
+        Args:
+            html (str): Profile page HTML
+        
+        Returns:
+            dict: User statistics
+        """
+        # Parse HTML
+        soup = html_parser.parse_html(html, PARSE_ONLY)
+        
+        # Extract rating
+        rating_element = soup.select_one(".rating-number")
+        rating = int(rating_element.text.strip()) if rating_element else "N/A"
+        
+        # Extract rank/stars
+        rank_element = soup.select_one(".rating-star")
+        rank = rank_element.text.strip() if rank_element else "Unrated"
+        
+        # Extract problems solved
+        problems_solved = 0
+        try:
+            # This is an approximation as CodeChef doesn't show total problems solved directly
+            problems_element = soup.select_one(".problems-solved")
+            if problems_element:
+                problems_text = problems_element.text
+                problems_solved = len(problems_text.split(",")) if "," in problems_text else 0
+        except Exception as e:
+            logger.warning(f"Could not extract problems solved: {e}")
+        
+        return {
+            "platform": "CodeChef",
+            "username": self.username,
+            "status": "Active",
+            "rating": rating,
+            "max_rating": "N/A",  # CodeChef doesn't show max rating on profile
+            "rank": rank,
+            "problems_solved": problems_solved,
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    
     def _get_error_stats(self):
         """
         Return error stats when API call fails.
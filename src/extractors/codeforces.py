@@ -2,27 +2,195 @@
 Codeforces data extractor module.
 """
 
-import requests
+import re
+import time
 import logging
+import threading
 from datetime import datetime
 
+from . import http_client
+from .json_stream import iter_response_array
+
 logger = logging.getLogger(__name__)
 
+API_BASE_URL = "https://codeforces.com/api"
+
+# Number of handles sent in a single user.info call
+USER_INFO_BATCH_SIZE = 300
+
+# Number of submissions requested per user.status page. Pages are parsed as
+# they stream in, so page size doesn't affect memory use.
+SUBMISSIONS_PAGE_SIZE = 10000
+
+# Verdicts of submissions that are still being judged (no verdict yet, or "TESTING")
+JUDGING_VERDICTS = (None, "TESTING")
+
+# Seconds a user's stored rating history is used while the rating is unchanged
+RATING_REFRESH_INTERVAL = 24 * 60 * 60
+
+# Seconds the problemset.problems index is used before it is downloaded again
+PROBLEMSET_REFRESH_INTERVAL = 24 * 60 * 60
+
+def pack_problem(contest_id, index):
+    """
+    Pack a problem id into one integer for compact solved sets.
+    
+    Indexes that don't fit (more than 3 characters, or not ASCII) are kept
+    as a (contest_id, index) tuple instead, so no two problems share a key.
+    
+    Args:
+        contest_id (int): Contest id (0 for problems without one)
+        index (str): Problem index, e.g. "A" or "F2"
+    
+    Returns:
+        int: (contest_id << 24) | index characters, or a tuple for other indexes
+    """
+    if len(index) > 3 or not index.isascii() or "\0" in index:
+        return contest_id, index
+    code = 0
+    for char in index.encode("ascii").ljust(3, b"\0"):
+        code = (code << 8) | char
+    return (contest_id << 24) | code
+
+def unpack_problem(packed):
+    """
+    Unpack a key from pack_problem().
+    
+    Args:
+        packed (int): Packed problem id, or a (contest_id, index) tuple
+    
+    Returns:
+        tuple: (contest_id, index)
+    """
+    if isinstance(packed, tuple):
+        return packed
+    index = (packed & 0xFFFFFF).to_bytes(3, "big").rstrip(b"\0").decode("ascii")
+    return packed >> 24, index
+
+# Serializes problemset refreshes so concurrent extractors download it once
+_problemset_lock = threading.Lock()
+
 class CodeforcesExtractor:
     """
     Class for extracting user statistics from Codeforces.
     """
     
-    def __init__(self, username):
+    def __init__(self, username, user_info=None, store=None):
         """
         Initialize with username.
         
         Args:
             username (str): Codeforces username
+            user_info (dict): Already fetched user.info result for this user, if any
+            store (CodeforcesSubmissionStore): Submission store for incremental syncs, if any
         """
         self.username = username
-        self.api_url = f"https://codeforces.com/api/user.info?handles={username}"
-        self.solved_problems_url = f"https://codeforces.com/api/user.status?handle={username}&from=1&count=1000"
+        self.user_info = user_info
+        self.store = store
+        self.api_url = f"{API_BASE_URL}/user.info?handles={username}"
+        self.submissions_url = f"{API_BASE_URL}/user.status"
+    
+    @classmethod
+    def fetch_user_info_batch(cls, handles, batch_size=USER_INFO_BATCH_SIZE):
+        """
+        Fetch user.info for many handles using semicolon-separated batch calls.
+        
+        Codeforces fails the whole call when one handle does not exist, so
+        unknown handles are dropped from the chunk and the call is retried.
+        
+        Args:
+            handles (list): Codeforces handles
+            batch_size (int): Number of handles per request
+        
+        Returns:
+            dict: Mapping of lower-cased handle to its user.info result.
+                  Handles that were not found or could not be fetched are missing.
+        """
+        user_infos = {}
+        handles = list(dict.fromkeys(handles))
+        
+        for start in range(0, len(handles), batch_size):
+            pending = handles[start:start + batch_size]
+            while pending:
+                try:
+                    response = http_client.get(f"{API_BASE_URL}/user.info", params={"handles": ";".join(pending)})
+                    # Failed calls still carry a JSON body explaining the failure
+                    data = response.json()
+                except Exception as e:
+                    logger.error(f"Error fetching Codeforces user info batch: {e}")
+                    break
+                
+                if data.get("status") == "OK":
+                    for user_data in data["result"]:
+                        user_infos[user_data["handle"].lower()] = user_data
+                    break
+                
+                match = re.search(r"handle (\S+) not found", data.get("comment", ""))
+                if not match:
+                    logger.error(f"Error from Codeforces API: {data}")
+                    break
+                
+                missing = match.group(1).lower()
+                logger.warning(f"Codeforces user not found: {missing}")
+                pending = [handle for handle in pending if handle.lower() != missing]
+        
+        return user_infos
+    
+    @classmethod
+    def get_stats_batch(cls, handles, batch_size=USER_INFO_BATCH_SIZE):
+        """
+        Get user statistics for many handles, sharing batched user.info calls.
+        
+        Args:
+            handles (list): Codeforces handles
+            batch_size (int): Number of handles per user.info request
+        
+        Returns:
+            dict: Mapping of handle to user statistics
+        """
+        user_infos = cls.fetch_user_info_batch(handles, batch_size)
+        stats = {}
+        for handle in handles:
+            user_info = user_infos.get(handle.lower())
+            if user_info is None:
+                stats[handle] = cls(handle)._get_error_stats()
+            else:
+                stats[handle] = cls(handle, user_info=user_info).get_stats()
+        return stats
+    
+    @classmethod
+    def refresh_problemset(cls, store, max_age=PROBLEMSET_REFRESH_INTERVAL):
+        """
+        Download problemset.problems into the store unless its index is recent enough.
+        
+        All users share the index, so in a batch it is downloaded at most once
+        per refresh window. A failed download keeps the previous index.
+        
+        Args:
+            store (CodeforcesSubmissionStore): Store holding the index
+            max_age (int): Maximum age in seconds of an index that is kept
+        
+        Returns:
+            bool: True if the index was downloaded
+        """
+        with _problemset_lock:
+            fetched_at = store.get_problemset_fetched_at()
+            if fetched_at is not None and time.time() - fetched_at < max_age:
+                return False
+            
+            try:
+                response = http_client.get(f"{API_BASE_URL}/problemset.problems")
+                response.raise_for_status()
+                data = response.json()
+                if data["status"] != "OK":
+                    logger.error(f"Error from Codeforces API (problemset): {data}")
+                    return False
+                count = store.replace_problemset(data["result"]["problems"])
+                logger.info(f"Refreshed Codeforces problemset index with {count} problems")
+                return True
+            except Exception as e:
+                logger.warning(f"Error refreshing Codeforces problemset index: {e}")
+                return False
     
     def get_stats(self ):
         """
@@ -32,34 +200,25 @@ class CodeforcesExtractor:
             dict: User statistics
         """
         try:
-            # Get user info
-            response = requests.get(self.api_url)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data["status"] != "OK":
-                logger.error(f"Error from Codeforces API: {data}")
-                return self._get_error_stats()
-            
-            user_data = data["result"][0]
+            # Get user info, unless it was already fetched in a batch
+            user_data = self.user_info
+            if user_data is None:
+                response = http_client.get(self.api_url)
+                response.raise_for_status()
+                data = response.json()
+                
+                if data["status"] != "OK":
+                    logger.error(f"Error from Codeforces API: {data}")
+                    return self._get_error_stats()
+                
+                user_data = data["result"][0]
             
             # Get solved problems
-            problems_response = requests.get(self.solved_problems_url)
-            problems_response.raise_for_status()
-            problems_data = problems_response.json()
+            problems_solved = self._get_solved_count()
             
-            if problems_data["status"] != "OK":
-                logger.error(f"Error from Codeforces API (problems): {problems_data}")
-                problems_solved = 0
-            else:
-                # Count unique solved problems
-                solved_problems = set()
-                for submission in problems_data["result"]:
-                    if submission["verdict"] == "OK":
-                        problem_key = f"{submission['problem']['contestId']}-{submission['problem']['index']}"
-                        solved_problems.add(problem_key)
-                
-                problems_solved = len(solved_problems)
+            # Keep the contest history up to date for rating analytics
+            if self.store:
+                self._sync_rating_history(user_data)
             
             # Extract stats
             rating = user_data.get("rating", 0)
@@ -74,6 +233,7 @@ class CodeforcesExtractor:
                 "max_rating": max_rating,
                 "rank": rank,
                 "problems_solved": problems_solved,
+                **self._get_solved_breakdown(),
                 "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
         
@@ -81,6 +241,126 @@ class CodeforcesExtractor:
             logger.error(f"Error extracting Codeforces stats: {e}")
             return self._get_error_stats()
     
+    def _get_solved_count(self):
+        """
+        Count unique solved problems over the user's full submission history.
+        
+        Submissions are paged newest first and parsed as they stream in, so
+        memory use doesn't grow with the page size. With a store, paging stops
+        at the first submission already synced and only new solves are added to it.
+        The sync position stays below the oldest submission still being judged,
+        so a later sync sees its verdict.
+        
+        Returns:
+            int: Number of unique solved problems
+        """
+        last_seen_id = self.store.get_last_submission_id(self.username) if self.store else None
+        newest_id = None
+        # Oldest new submission without a final verdict yet
+        oldest_judging_id = None
+        # Solved problems packed with pack_problem()
+        solved_problems = set()
+        start = 1
+        
+        while True:
+            response = http_client.get(self.submissions_url, params={
+                "handle": self.username,
+                "from": start,
+                "count": SUBMISSIONS_PAGE_SIZE,
+            }, stream=True)
+            if not response.ok:
+                response.close()
+                response.raise_for_status()
+            
+            # Parse submissions as they download instead of loading the whole page
+            header = {}
+            page_length = 0
+            reached_known = False
+            submissions = iter_response_array(response, "result", header)
+            try:
+                for submission in submissions:
+                    page_length += 1
+                    if newest_id is None:
+                        newest_id = submission["id"]
+                    if last_seen_id is not None and submission["id"] <= last_seen_id:
+                        reached_known = True
+                        break
+                    if submission.get("verdict") in JUDGING_VERDICTS:
+                        oldest_judging_id = submission["id"]
+                    elif submission.get("verdict") == "OK":
+                        problem = submission["problem"]
+                        solved_problems.add(pack_problem(problem.get("contestId", 0), problem["index"]))
+            finally:
+                submissions.close()
+            
+            if header.get("status") != "OK":
+                logger.error(f"Error from Codeforces API (problems): {header}")
+                # Keep the previously synced count rather than a partial one
+                return self.store.count_solved(self.username) if self.store else 0
+            
+            if reached_known or page_length < SUBMISSIONS_PAGE_SIZE:
+                break
+            start += SUBMISSIONS_PAGE_SIZE
+        
+        if not self.store:
+            return len(solved_problems)
+        
+        logger.info(f"Synced {len(solved_problems)} new solved problems for {self.username}")
+        synced_id = newest_id if oldest_judging_id is None else oldest_judging_id - 1
+        self.store.record_sync(self.username, synced_id, map(unpack_problem, solved_problems))
+        return self.store.count_solved(self.username)
+    
+    def _get_solved_breakdown(self):
+        """
+        Get the user's solved problems per tag and per problem rating.
+        
+        Returns:
+            dict: "solved_by_tag" and "solved_by_rating" counts, or an empty dict without a store
+        """
+        if not self.store:
+            return {}
+        
+        self.refresh_problemset(self.store)
+        by_tag, by_rating = self.store.solved_breakdown(self.username)
+        return {
+            "solved_by_tag": by_tag,
+            "solved_by_rating": {str(rating): count for rating, count in by_rating.items()},
+        }
+    
+    def _sync_rating_history(self, user_data):
+        """
+        Store the user's contest rating changes from user.rating.
+        
+        user.rating always returns the whole history, so it is only requested
+        when the current rating differs from the last stored rating change, or
+        the history is older than RATING_REFRESH_INTERVAL (a contest can leave
+        the rating unchanged). Failures are logged and leave the stored history
+        as it was.
+        
+        Args:
+            user_data (dict): user.info result of the user
+        """
+        if "rating" not in user_data:
+            return  # Unrated users have no rating changes
+        
+        history = self.store.get_rating_histories([self.username]).get(self.username.lower())
+        fetched_at = self.store.get_rating_fetched_at(self.username)
+        if (history and history[-1][2] == user_data["rating"]
+                and fetched_at is not None and time.time() - fetched_at < RATING_REFRESH_INTERVAL):
+            return
+        
+        try:
+            response = http_client.get(f"{API_BASE_URL}/user.rating", params={"handle": self.username})
+            response.raise_for_status()
+            data = response.json()
+            if data["status"] != "OK":
+                logger.error(f"Error from Codeforces API (rating): {data}")
+                return
+            self.store.record_rating_changes(self.username, data["result"])
+            logger.info(f"Synced {len(data['result'])} rating changes for {self.username}")
+        except Exception as e:
+            logger.warning(f"Error syncing Codeforces rating history for {self.username}: {e}")
+    
     def _get_error_stats(self):
         """
         Return error stats when API call fails.
@@ -0,0 +1,293 @@
+"""
+Persistent Codeforces submission store.
+Keeps, per handle, the newest submission id already processed and the set of
+solved problems so later runs only need to download new submissions, and the
+contest rating changes from user.rating. Also holds the problemset.problems
+index (problems under interned integer ids, with their tags and ratings)
+shared by all handles.
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    handle TEXT PRIMARY KEY,
+    last_submission_id INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS solved_problems (
+    handle TEXT NOT NULL,
+    contest_id INTEGER NOT NULL,
+    problem_index TEXT NOT NULL,
+    PRIMARY KEY (handle, contest_id, problem_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rating_changes (
+    handle TEXT NOT NULL,
+    contest_id INTEGER NOT NULL,
+    update_time INTEGER NOT NULL,
+    old_rating INTEGER NOT NULL,
+    new_rating INTEGER NOT NULL,
+    PRIMARY KEY (handle, contest_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rating_sync_state (
+    handle TEXT PRIMARY KEY,
+    fetched_at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS problems (
+    problem_id INTEGER PRIMARY KEY,
+    contest_id INTEGER NOT NULL,
+    problem_index TEXT NOT NULL,
+    rating INTEGER,
+    UNIQUE (contest_id, problem_index)
+);
+CREATE TABLE IF NOT EXISTS tags (
+    tag_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS problem_tags (
+    problem_id INTEGER NOT NULL,
+    tag_id INTEGER NOT NULL,
+    PRIMARY KEY (problem_id, tag_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS problemset_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    fetched_at INTEGER NOT NULL
+);
+"""
+
+class CodeforcesSubmissionStore:
+    """
+    SQLite-backed store of synced Codeforces submissions.
+    """
+
+    def __init__(self, db_path):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            db_path (str): Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def get_last_submission_id(self, handle):
+        """
+        Get the newest submission id already synced for a handle.
+
+        Args:
+            handle (str): Codeforces handle
+
+        Returns:
+            int: Submission id, or None if the handle was never synced
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_submission_id FROM sync_state WHERE handle = ?",
+                (handle.lower(),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def record_sync(self, handle, last_submission_id, solved_problems):
+        """
+        Store newly solved problems and advance the sync position in one transaction.
+
+        Args:
+            handle (str): Codeforces handle
+            last_submission_id (int): Newest submission id seen in this sync
+            solved_problems (iterable): (contest_id, problem_index) pairs solved since the last sync
+        """
+        handle = handle.lower()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO solved_problems (handle, contest_id, problem_index) VALUES (?, ?, ?)",
+                [(handle, contest_id, problem_index) for contest_id, problem_index in solved_problems]
+            )
+            if last_submission_id is not None:
+                self._conn.execute(
+                    "INSERT INTO sync_state (handle, last_submission_id, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(handle) DO UPDATE SET "
+                    "last_submission_id = MAX(last_submission_id, excluded.last_submission_id), "
+                    "updated_at = excluded.updated_at",
+                    (handle, last_submission_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                )
+
+    def count_solved(self, handle):
+        """
+        Count the unique problems solved by a handle over its synced history.
+
+        Args:
+            handle (str): Codeforces handle
+
+        Returns:
+            int: Number of unique solved problems
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM solved_problems WHERE handle = ?",
+                (handle.lower(),)
+            ).fetchone()
+        return row[0]
+
+    def record_rating_changes(self, handle, changes, fetched_at=None):
+        """
+        Store the rating changes of a handle (already stored contests are updated).
+
+        Args:
+            handle (str): Codeforces handle
+            changes (list): user.rating results (contestId, ratingUpdateTimeSeconds, oldRating, newRating)
+            fetched_at (int): Unix timestamp of the download (defaults to now)
+        """
+        handle = handle.lower()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rating_changes "
+                "(handle, contest_id, update_time, old_rating, new_rating) VALUES (?, ?, ?, ?, ?)",
+                [(handle, change["contestId"], change["ratingUpdateTimeSeconds"],
+                  change["oldRating"], change["newRating"]) for change in changes]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rating_sync_state (handle, fetched_at) VALUES (?, ?)",
+                (handle, int(fetched_at if fetched_at is not None else time.time()))
+            )
+
+    def get_rating_fetched_at(self, handle):
+        """
+        Get when the rating changes of a handle were last downloaded.
+
+        Args:
+            handle (str): Codeforces handle
+
+        Returns:
+            int: Unix timestamp, or None if they were never downloaded
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at FROM rating_sync_state WHERE handle = ?",
+                (handle.lower(),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_rating_histories(self, handles):
+        """
+        Get the stored rating changes of many handles.
+
+        Args:
+            handles (list): Codeforces handles
+
+        Returns:
+            dict: Lower-cased handle -> list of (update_time, old_rating, new_rating), oldest first.
+                  Handles without stored changes are missing.
+        """
+        histories = {}
+        handles = list(dict.fromkeys(handle.lower() for handle in handles))
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(handles), 500):
+                chunk = handles[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT handle, update_time, old_rating, new_rating FROM rating_changes "
+                    f"WHERE handle IN ({','.join('?' * len(chunk))}) ORDER BY handle, update_time",
+                    chunk
+                ).fetchall()
+                for handle, update_time, old_rating, new_rating in rows:
+                    histories.setdefault(handle, []).append((update_time, old_rating, new_rating))
+        return histories
+
+    def get_problemset_fetched_at(self):
+        """
+        Get when the problemset index was last replaced.
+
+        Returns:
+            int: Unix timestamp, or None if the index was never fetched
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT fetched_at FROM problemset_state WHERE id = 1").fetchone()
+        return row[0] if row else None
+
+    def replace_problemset(self, problems, fetched_at=None):
+        """
+        Replace the problemset index with a fresh problemset.problems result.
+
+        Problems keep their interned ids across refreshes; ratings and tags
+        are updated.
+
+        Args:
+            problems (list): problemset.problems problems (contestId, index, rating, tags)
+            fetched_at (int): Unix timestamp of the download (defaults to now)
+
+        Returns:
+            int: Number of problems in the index
+        """
+        problems = [problem for problem in problems if "contestId" in problem]
+        tag_names = sorted({tag for problem in problems for tag in problem.get("tags", [])})
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO problems (contest_id, problem_index, rating) VALUES (?, ?, ?) "
+                "ON CONFLICT(contest_id, problem_index) DO UPDATE SET rating = excluded.rating",
+                [(problem["contestId"], problem["index"], problem.get("rating")) for problem in problems]
+            )
+            self._conn.executemany("INSERT OR IGNORE INTO tags (name) VALUES (?)", [(tag,) for tag in tag_names])
+
+            problem_ids = {(contest_id, index): problem_id for problem_id, contest_id, index
+                           in self._conn.execute("SELECT problem_id, contest_id, problem_index FROM problems")}
+            tag_ids = {name: tag_id for tag_id, name in self._conn.execute("SELECT tag_id, name FROM tags")}
+
+            self._conn.execute("DELETE FROM problem_tags")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO problem_tags (problem_id, tag_id) VALUES (?, ?)",
+                [(problem_ids[(problem["contestId"], problem["index"])], tag_ids[tag])
+                 for problem in problems for tag in problem.get("tags", [])]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO problemset_state (id, fetched_at) VALUES (1, ?)",
+                (int(fetched_at if fetched_at is not None else time.time()),)
+            )
+        return len(problems)
+
+    def solved_breakdown(self, handle):
+        """
+        Count a handle's solved problems per tag and per problem rating.
+
+        Solved problems are joined to the problemset index on its
+        (contest_id, problem_index) key; problems missing from the index
+        (e.g. gym problems) are not counted.
+
+        Args:
+            handle (str): Codeforces handle
+
+        Returns:
+            tuple: (tag -> count, most solved first; rating -> count, ascending rating)
+        """
+        handle = handle.lower()
+        with self._lock:
+            by_tag = self._conn.execute(
+                "SELECT t.name, COUNT(*) AS solved FROM solved_problems s "
+                "JOIN problems p ON p.contest_id = s.contest_id AND p.problem_index = s.problem_index "
+                "JOIN problem_tags pt ON pt.problem_id = p.problem_id "
+                "JOIN tags t ON t.tag_id = pt.tag_id "
+                "WHERE s.handle = ? GROUP BY t.tag_id ORDER BY solved DESC, t.name",
+                (handle,)
+            ).fetchall()
+            by_rating = self._conn.execute(
+                "SELECT p.rating, COUNT(*) FROM solved_problems s "
+                "JOIN problems p ON p.contest_id = s.contest_id AND p.problem_index = s.problem_index "
+                "WHERE s.handle = ? AND p.rating IS NOT NULL GROUP BY p.rating ORDER BY p.rating",
+                (handle,)
+            ).fetchall()
+        return dict(by_tag), dict(by_rating)
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._conn.close()
@@ -2,13 +2,25 @@
 CSES data extractor module.
 """
 
-import requests
+import re
 import logging
 from datetime import datetime
-from bs4 import BeautifulSoup
+
+from . import http_client, html_parser, parse_pool
+from .html_parser import ParseOnly
+from .html_stream import StopAfter, TextTarget
 
 logger = logging.getLogger(__name__)
 
+# Only the main content block is needed
+PARSE_ONLY = ParseOnly(classes=["content"])
+
+# The download can stop once the solved tasks count is seen
+STOP_AFTER = StopAfter(TextTarget(r"Solved tasks:\s*\d+", hint="Solved tasks"))
+
+# Solved task count in the profile text
+SOLVED_PATTERN = re.compile(r"Solved tasks:\s*(\d+)")
+
 class CSESExtractor:
     """
     Class for extracting user statistics from CSES.
@@ -36,42 +48,67 @@ class CSESExtractor:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
-            response = requests.get(self.profile_url, headers=headers)
-            response.raise_for_status()
+            page = http_client.get_cached(self.profile_url, headers=headers, stop_after=STOP_AFTER)
             
-            # Parse HTML
-            soup = BeautifulSoup(response.text, "html.parser")
+            # Unchanged page: reuse the stats parsed on an earlier run
+            if page.parsed is not None:
+                stats = dict(page.parsed)
+                stats["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                return stats
             
-            # Extract problems solved
-            problems_solved = 0
-            
-            # Look for the solved problems count
-            content_div = soup.select_one(".content")
-            if content_div:
-                text = content_div.text
-                if "Solved tasks" in text:
-                    try:
-                        # Try to extract the count
-                        solved_line = [line for line in text.split("\n") if "Solved tasks" in line][0]
-                        problems_solved = int(solved_line.split(":")[1].strip())
-                    except (IndexError, ValueError) as e:
-                        logger.warning(f"Could not extract problems solved: {e}")
-            
-            return {
-                "platform": "CSES",
-                "username": self.username,
-                "status": "Active",
-                "rating": "N/A",  # CSES doesn't have a rating system
-                "max_rating": "N/A",
-                "rank": "N/A",
-                "problems_solved": problems_solved,
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            # Parse in the process pool when one is configured
+            stats = parse_pool.parse_stats(self, page.text)
+            if page.partial and stats["problems_solved"] == 0:
+                # The start of the page looked complete but didn't parse: use the whole page
+                logger.info(f"Early-stopped download of {self.profile_url} was incomplete, downloading the full page")
+                page = http_client.get_cached(self.profile_url, headers=headers)
+                stats = parse_pool.parse_stats(self, page.text)
+            page.store_parsed(stats)
+            return stats
         
         except Exception as e:
             logger.error(f"Error extracting CSES stats: {e}")
             return self._get_error_stats()
     
+    def parse_stats(self, html):
+        """
+        Parse user statistics from a CSES profile page.
+        
+        Args:
+            html (str): Profile page HTML
+        
+        Returns:
+            dict: User statistics
+        """
+        # Parse HTML
+        soup = html_parser.parse_html(html, PARSE_ONLY)
+        
+        # Extract problems solved
+        problems_solved = 0
+        
+        # Look for the solved problems count
+        content_div = soup.select_one(".content")
+        if content_div:
+            text = content_div.text
+            if "Solved tasks" in text:
+                # The label and the count may be in separate table cells
+                match = SOLVED_PATTERN.search(text)
+                if match:
+                    problems_solved = int(match.group(1))
+                else:
+                    logger.warning("Could not extract problems solved")
+        
+        return {
+            "platform": "CSES",
+            "username": self.username,
+            "status": "Active",
+            "rating": "N/A",  # CSES doesn't have a rating system
+            "max_rating": "N/A",
+            "rank": "N/A",
+            "problems_solved": problems_solved,
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    
     def _get_error_stats(self):
         """
         Return error stats when API call fails.
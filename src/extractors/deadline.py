@@ -0,0 +1,141 @@
+"""
+Run-level time budget for outgoing requests.
+A Deadline is made current for a block of work; every request sent through the
+shared HTTP client while it is current derives its connect and read timeouts
+from the time left, and fails fast once the budget is spent. Streamed bodies
+check it between chunks, so a slow body can't outlast the budget either.
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_current_deadline = contextvars.ContextVar("deadline", default=None)
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a request is attempted after the run's time budget ran out.
+    """
+
+class Deadline:
+    """
+    Point in time by which a run has to be finished.
+    """
+
+    def __init__(self, seconds):
+        """
+        Start the time budget.
+
+        Args:
+            seconds (float): Time budget in seconds
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """
+        Seconds left in the budget (never negative).
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        """
+        Whether the budget is spent.
+        """
+        return self.remaining() <= 0
+
+    def check(self):
+        """
+        Raise DeadlineExceeded if the budget is spent.
+        """
+        if self.expired():
+            raise DeadlineExceeded(f"Time budget of {self.seconds}s exceeded")
+
+    def timeout(self, default):
+        """
+        Cap a requests timeout by the time left.
+
+        Args:
+            default (float or tuple): Timeout, or (connect, read) timeout, in seconds
+
+        Returns:
+            tuple: (connect, read) timeout in seconds
+        """
+        self.check()
+        remaining = self.remaining()
+        connect, read = default if isinstance(default, tuple) else (default, default)
+        return (min(connect, remaining), min(read, remaining))
+
+def current_deadline():
+    """
+    Get the deadline current in this context.
+
+    Returns:
+        Deadline: The current deadline, or None if the run is unbounded
+    """
+    return _current_deadline.get()
+
+def check_current():
+    """
+    Raise DeadlineExceeded if the deadline current in this context is spent.
+    """
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+
+@contextmanager
+def use_deadline(deadline):
+    """
+    Make a deadline current for the enclosed block.
+
+    Args:
+        deadline (Deadline): Deadline to use, or None for no bound
+    """
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+def run_with_deadline(deadline, function, *args, **kwargs):
+    """
+    Call a function with a deadline current, e.g. inside a worker thread.
+
+    Args:
+        deadline (Deadline): Deadline to use, or None for no bound
+        function (callable): Function to call
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        object: The function's return value
+    """
+    with use_deadline(deadline):
+        return function(*args, **kwargs)
+
+def exit_process(status=0):
+    """
+    Exit once the run's outputs are written, without waiting for stragglers.
+
+    Worker threads still running past the deadline are non-daemon, so a normal
+    exit would join them and the process could outlive its time budget. If
+    any are left, logs are flushed and the process exits immediately instead.
+
+    Args:
+        status (int): Exit status
+    """
+    stragglers = [thread for thread in threading.enumerate()
+                  if thread is not threading.main_thread() and not thread.daemon and thread.is_alive()]
+    if not stragglers:
+        sys.exit(status)
+    logger.warning(f"Exiting without waiting for {len(stragglers)} unfinished worker threads")
+    logging.shutdown()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(status)
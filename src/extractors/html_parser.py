@@ -0,0 +1,157 @@
+"""
+Pluggable HTML parsing backends for the scraping extractors.
+Uses the fastest installed backend (selectolax, then lxml) and falls back to
+the standard library html.parser. All backends expose the small part of the
+BeautifulSoup API the extractors use: select(), select_one() and .text.
+"""
+
+import logging
+import threading
+import importlib.util
+
+logger = logging.getLogger(__name__)
+
+# Backends in order of preference
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+_backend = None
+_backend_lock = threading.Lock()
+
+class ParseOnly:
+    """
+    Description of the parts of a page an extractor needs.
+
+    BeautifulSoup backends only build the tree for matching elements (and
+    their descendants); backends without such filtering parse the whole page.
+    """
+
+    def __init__(self, names=None, classes=None):
+        """
+        Initialize with either tag names or CSS classes to keep.
+
+        Args:
+            names (list): Tag names to keep, e.g. ["table", "a"]
+            classes (list): CSS classes to keep, e.g. ["rating-number"]
+        """
+        if bool(names) == bool(classes):
+            raise ValueError("ParseOnly needs exactly one of names or classes")
+        self.names = list(names) if names else None
+        self.classes = list(classes) if classes else None
+
+    def to_soup_strainer(self):
+        """
+        Convert to a BeautifulSoup SoupStrainer.
+
+        Returns:
+            SoupStrainer: Strainer keeping only the matching elements
+        """
+        from bs4 import SoupStrainer
+        if self.names:
+            return SoupStrainer(self.names)
+        return SoupStrainer(class_=self.classes)
+
+class _LexborNode:
+    """
+    Adapter giving a selectolax node the BeautifulSoup methods the extractors use.
+    """
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def text(self):
+        return self._node.text(deep=True)
+
+    def select(self, selector):
+        return [_LexborNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector):
+        node = self._node.css_first(selector)
+        return _LexborNode(node) if node is not None else None
+
+    def get(self, attribute, default=None):
+        return self._node.attributes.get(attribute, default)
+
+def _is_available(backend):
+    """
+    Check whether a backend's library is installed.
+
+    Args:
+        backend (str): Backend name
+
+    Returns:
+        bool: True if the backend can be used
+    """
+    module_name = {"selectolax": "selectolax.lexbor", "lxml": "lxml", "html.parser": "bs4"}[backend]
+    # Only locate the module; importing it here would load every parser at startup
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except ImportError:
+        return False
+
+def available_backends():
+    """
+    List the installed backends in order of preference.
+
+    Returns:
+        list: Backend names
+    """
+    return [backend for backend in BACKENDS if _is_available(backend)]
+
+def set_backend(backend=None):
+    """
+    Select the backend used by parse_html().
+
+    Args:
+        backend (str): Backend name, or None to pick the fastest installed one
+
+    Returns:
+        str: The selected backend
+    """
+    global _backend
+    if backend is None:
+        backend = available_backends()[0]
+    elif backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+    elif not _is_available(backend):
+        fallback = available_backends()[0]
+        logger.warning(f"HTML parser backend {backend} is not installed, using {fallback}")
+        backend = fallback
+
+    with _backend_lock:
+        _backend = backend
+    logger.debug(f"HTML parser backend: {backend}")
+    return backend
+
+def get_backend():
+    """
+    Get the backend used by parse_html(), selecting one on first use.
+
+    Returns:
+        str: Backend name
+    """
+    if _backend is None:
+        return set_backend()
+    return _backend
+
+def parse_html(text, parse_only=None, backend=None):
+    """
+    Parse an HTML document.
+
+    Args:
+        text (str): HTML document
+        parse_only (ParseOnly): Parts of the page to keep, if not the whole page
+        backend (str): Backend to use instead of the selected one
+
+    Returns:
+        object: Document supporting select(), select_one() and .text
+    """
+    backend = backend or get_backend()
+
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        return _LexborNode(LexborHTMLParser(text).root)
+
+    from bs4 import BeautifulSoup
+    strainer = parse_only.to_soup_strainer() if parse_only is not None else None
+    return BeautifulSoup(text, backend, parse_only=strainer)
@@ -0,0 +1,227 @@
+"""
+Early-terminating downloads of scraped profile pages.
+Feeds the body to an incremental HTML tokenizer as it is downloaded and stops
+reading once every element or text an extractor needs has been seen, so the rest of
+the page is neither transferred nor parsed. Closing a response early drops its
+connection from the pool instead of reusing it.
+"""
+
+import re
+from html.parser import HTMLParser
+
+from . import metrics
+from .deadline import check_current
+
+# Bytes read from the response per chunk
+CHUNK_SIZE = 16 * 1024
+
+# Characters of recent text TextTarget patterns are searched in
+TEXT_WINDOW = 512
+
+class ElementTarget:
+    """
+    An element an extractor needs from a page, seen once it is closed.
+    """
+
+    def __init__(self, tag, classes=None, href=None, text=None):
+        """
+        Initialize the target.
+
+        Args:
+            tag (str): Tag name, e.g. "table"
+            classes (list): CSS classes the element must have, if any
+            href (str): Substring its href attribute must contain, if any
+            text (str): Substring its text must contain, if any
+        """
+        self.tag = tag
+        self.classes = set(classes or ())
+        self.href = href
+        self.text = text
+        # Literal appearing in the element's start tag
+        self.hint = href or (sorted(self.classes)[0] if self.classes else f"<{tag}")
+
+    def matches_start(self, tag, attrs):
+        """
+        Whether a start tag can begin this target (its text is checked once it is closed).
+        """
+        if tag != self.tag:
+            return False
+        attrs = dict(attrs)
+        if self.classes and not self.classes.issubset((attrs.get("class") or "").split()):
+            return False
+        return self.href is None or self.href in (attrs.get("href") or "")
+
+class TextTarget:
+    """
+    A piece of text an extractor needs from a page, seen once the page text matches.
+
+    The pattern is searched in the text runs seen so far joined together
+    (tags between them dropped), so a label and a value in adjacent elements,
+    e.g. <td>Solved tasks:</td><td>123</td>, match as "Solved tasks:123".
+    Text is searched once the next tag starts, so a run cut off at a chunk
+    boundary (e.g. "12" of "123") never matches.
+    """
+
+    def __init__(self, pattern, hint=None):
+        """
+        Initialize the target.
+
+        Args:
+            pattern (str): Regular expression searched in the recent page text (TEXT_WINDOW characters)
+            hint (str): Literal every match starts with, if any
+        """
+        self.pattern = re.compile(pattern)
+        self.hint = hint
+
+class StopAfter:
+    """
+    Description of where the part of a page an extractor needs ends.
+
+    The download stops once each target has been seen.
+    """
+
+    def __init__(self, *targets):
+        """
+        Initialize with the targets to wait for.
+
+        Args:
+            *targets (ElementTarget or TextTarget): Targets that must all be seen
+        """
+        if not targets:
+            raise ValueError("StopAfter needs at least one target")
+        self.targets = targets
+
+    def watcher(self):
+        """
+        Create a fresh watcher for one download.
+
+        Returns:
+            TargetWatcher: Watcher for these targets
+        """
+        return TargetWatcher(self.targets)
+
+class TargetWatcher(HTMLParser):
+    """
+    Incremental tokenizer tracking which targets of a page have been seen.
+
+    Text before the first target hint is only searched, not tokenized:
+    tokenizing starts at the tag where the first hint appears.
+    """
+
+    def __init__(self, targets):
+        super().__init__(convert_charrefs=True)
+        self._pending = list(targets)
+        # Open candidate elements: [target, nesting depth of its tag, text parts]
+        self._open = []
+        hints = [target.hint for target in targets]
+        self._hints = None if None in hints else hints
+        # Text not tokenized yet, while no hint has been seen
+        self._skipped = ""
+        # Recent text runs, joined, for TextTarget patterns
+        self._text = ""
+        self._text_changed = False
+
+    @property
+    def done(self):
+        """
+        Whether every target has been seen.
+        """
+        return not self._pending
+
+    def handle_starttag(self, tag, attrs):
+        self._search_text()
+        for candidate in self._open:
+            if candidate[0].tag == tag:
+                candidate[1] += 1
+        for target in self._pending:
+            if not isinstance(target, ElementTarget) or not target.matches_start(tag, attrs):
+                continue
+            if not any(candidate[0] is target for candidate in self._open):
+                self._open.append([target, 1, []])
+
+    def handle_endtag(self, tag):
+        self._search_text()
+        for candidate in list(self._open):
+            if candidate[0].tag != tag:
+                continue
+            candidate[1] -= 1
+            if candidate[1] > 0:
+                continue
+            self._open.remove(candidate)
+            target = candidate[0]
+            if target.text is None or target.text in "".join(candidate[2]):
+                self._pending.remove(target)
+
+    def handle_data(self, data):
+        # With convert_charrefs, data is the whole text run up to the next tag
+        for candidate in self._open:
+            candidate[2].append(data)
+        # The run may continue in the next chunk; it is searched at the next tag
+        self._text = (self._text + data)[-TEXT_WINDOW:]
+        self._text_changed = True
+
+    def _search_text(self):
+        if not self._text_changed:
+            return
+        self._text_changed = False
+        for target in list(self._pending):
+            if isinstance(target, TextTarget) and target.pattern.search(self._text):
+                self._pending.remove(target)
+
+    def feed_chunk(self, chunk):
+        """
+        Feed the next chunk of the page.
+
+        Args:
+            chunk (str): Decoded text chunk
+
+        Returns:
+            bool: True once every target has been seen
+        """
+        if self._hints is None:
+            self.feed(chunk)
+            return self.done
+
+        searched = max(len(self._skipped) - max(len(hint) for hint in self._hints), 0)
+        self._skipped += chunk
+        found = [index for index in (self._skipped.find(hint, searched) for hint in self._hints) if index != -1]
+        if found:
+            start = max(self._skipped.rfind("<", 0, min(found)), 0)
+            self._hints = None
+            self.feed(self._skipped[start:])
+            self._skipped = ""
+        return self.done
+
+def read_until(response, stop_after, chunk_size=CHUNK_SIZE):
+    """
+    Read a streamed response until the targets have been seen.
+
+    The response is always closed. While a deadline is current, it is
+    checked before every chunk.
+
+    Args:
+        response (requests.Response): Response requested with stream=True
+        stop_after (StopAfter): Targets after which the rest of the page is not needed
+        chunk_size (int): Bytes read per chunk
+
+    Returns:
+        tuple: (text read, True if the download stopped before the end of the body)
+
+    Raises:
+        DeadlineExceeded: If the deadline runs out before the targets are seen
+    """
+    if response.encoding is None:
+        response.encoding = "utf-8"
+    watcher = stop_after.watcher()
+    parts = []
+    try:
+        with metrics.span("download"):
+            for chunk in response.iter_content(chunk_size=chunk_size, decode_unicode=True):
+                check_current()
+                parts.append(chunk)
+                if watcher.feed_chunk(chunk):
+                    return "".join(parts), True
+    finally:
+        metrics.count_response_bytes(response)
+        response.close()
+    return "".join(parts), False
@@ -0,0 +1,286 @@
+"""
+On-disk HTTP cache for scraped profile pages.
+Stores bodies together with their ETag/Last-Modified validators so pages can be
+revalidated with conditional requests, and optionally the stats parsed from a
+body so an unchanged page skips both the download and the parse. Bodies of
+early-terminated downloads are marked partial.
+
+Each entry is a body file and a small metadata file; parsed stats go to a
+sidecar file of their own, so attaching them doesn't rewrite the body.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Default size cap of the cache directory in bytes
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Default freshness lifetime in seconds for pages served without validators
+DEFAULT_TTL = 6 * 60 * 60
+
+class CacheEntry:
+    """
+    A cached response body with its validators and parsed result.
+    """
+
+    def __init__(self, url, body, etag=None, last_modified=None, stored_at=None, parsed=None, partial=False):
+        """
+        Initialize the entry.
+
+        Args:
+            url (str): Request URL
+            body (str): Response body
+            etag (str): ETag response header, if any
+            last_modified (str): Last-Modified response header, if any
+            stored_at (float): Time the body was stored
+            parsed (dict): Stats parsed from the body, if any
+            partial (bool): Whether the body is only the start of the page
+        """
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at if stored_at is not None else time.time()
+        self.parsed = parsed
+        self.partial = partial
+
+    @property
+    def has_validators(self):
+        """
+        Whether the entry can be revalidated with a conditional request.
+        """
+        return bool(self.etag or self.last_modified)
+
+class CachedResponse:
+    """
+    Result of a cached GET, either freshly downloaded or reused from the cache.
+    """
+
+    def __init__(self, url, text, status_code, from_cache, parsed=None, cache=None, partial=False):
+        """
+        Initialize the response.
+
+        Args:
+            url (str): Request URL
+            text (str): Response body
+            status_code (int): HTTP status of the last request (304 when revalidated)
+            from_cache (bool): Whether the body was reused from the cache
+            parsed (dict): Stats parsed from the body on an earlier run, if any
+            cache (HttpCache): Cache the response belongs to, if any
+            partial (bool): Whether the body is only the start of the page
+        """
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        self.from_cache = from_cache
+        self.parsed = parsed
+        self.partial = partial
+        self._cache = cache
+
+    def store_parsed(self, parsed):
+        """
+        Remember the stats parsed from this body for later runs.
+
+        Args:
+            parsed (dict): Parsed stats
+        """
+        if self._cache is not None:
+            self._cache.set_parsed(self.url, parsed)
+
+class HttpCache:
+    """
+    Size-capped on-disk cache with least-recently-used eviction.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, default_ttl=DEFAULT_TTL):
+        """
+        Open (and create if needed) the cache directory.
+
+        Args:
+            directory (str): Cache directory
+            max_bytes (int): Size cap of the cache in bytes
+            default_ttl (int): Freshness lifetime in seconds for entries without validators
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        # Entry key -> size in bytes, least recently used first
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        """
+        Build the LRU index from the entries already on disk.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            key = name[:-len(".json")]
+            try:
+                meta_stat = os.stat(self._meta_path(key))
+                body_stat = os.stat(self._body_path(key))
+            except OSError:
+                continue
+            size = meta_stat.st_size + body_stat.st_size + self._parsed_size(key)
+            entries.append((meta_stat.st_mtime, key, size))
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _meta_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, f"{key}.body")
+
+    def _parsed_path(self, key):
+        return os.path.join(self.directory, f"{key}.parsed")
+
+    def _parsed_size(self, key):
+        try:
+            return os.path.getsize(self._parsed_path(key))
+        except OSError:
+            return 0
+
+    def _write_atomic(self, path, data):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url):
+        """
+        Look up a URL and mark it as recently used.
+
+        Args:
+            url (str): Request URL
+
+        Returns:
+            CacheEntry: The cached entry, or None on a miss
+        """
+        key = self._key(url)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            try:
+                with open(self._meta_path(key), 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                with open(self._body_path(key), 'r', encoding='utf-8') as f:
+                    body = f.read()
+                parsed = None
+                if os.path.exists(self._parsed_path(key)):
+                    with open(self._parsed_path(key), 'r', encoding='utf-8') as f:
+                        parsed = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable cache entry for {url}: {e}")
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            os.utime(self._meta_path(key))
+
+        return CacheEntry(url, body, meta.get("etag"), meta.get("last_modified"),
+                          meta.get("stored_at"), parsed, meta.get("partial", False))
+
+    def is_fresh(self, entry):
+        """
+        Whether an entry without validators can be served without a request.
+
+        Args:
+            entry (CacheEntry): Cached entry
+
+        Returns:
+            bool: True if the entry is still within its TTL
+        """
+        return not entry.has_validators and time.time() - entry.stored_at < self.default_ttl
+
+    def put(self, url, body, etag=None, last_modified=None, parsed=None, partial=False):
+        """
+        Store a response body, replacing any previous entry for the URL.
+
+        Args:
+            url (str): Request URL
+            body (str): Response body
+            etag (str): ETag response header, if any
+            last_modified (str): Last-Modified response header, if any
+            parsed (dict): Stats parsed from the body, if any
+            partial (bool): Whether the body is only the start of the page
+        """
+        entry = CacheEntry(url, body, etag, last_modified, parsed=parsed, partial=partial)
+        with self._lock:
+            self._write_entry(self._key(url), entry)
+            self._evict()
+
+    def set_parsed(self, url, parsed):
+        """
+        Attach parsed stats to the cached entry of a URL.
+
+        Only the entry's small sidecar file is written; the body is left alone.
+
+        Args:
+            url (str): Request URL
+            parsed (dict): Parsed stats
+        """
+        key = self._key(url)
+        with self._lock:
+            if key not in self._entries:
+                return
+            old_size = self._parsed_size(key)
+            parsed_bytes = json.dumps(parsed).encode("utf-8")
+            self._write_atomic(self._parsed_path(key), parsed_bytes)
+            self._entries[key] += len(parsed_bytes) - old_size
+            self._total_bytes += len(parsed_bytes) - old_size
+
+    def _write_entry(self, key, entry):
+        meta = {
+            "url": entry.url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "stored_at": entry.stored_at,
+            "partial": entry.partial,
+        }
+        body_bytes = entry.body.encode("utf-8")
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        self._write_atomic(self._body_path(key), body_bytes)
+        # Stats parsed from the previous body no longer apply
+        parsed_bytes = b""
+        if entry.parsed is not None:
+            parsed_bytes = json.dumps(entry.parsed).encode("utf-8")
+            self._write_atomic(self._parsed_path(key), parsed_bytes)
+        elif os.path.exists(self._parsed_path(key)):
+            os.remove(self._parsed_path(key))
+        self._write_atomic(self._meta_path(key), meta_bytes)
+
+        self._total_bytes -= self._entries.pop(key, 0)
+        self._entries[key] = len(body_bytes) + len(meta_bytes) + len(parsed_bytes)
+        self._total_bytes += self._entries[key]
+
+    def _remove(self, key):
+        for path in (self._meta_path(key), self._body_path(key), self._parsed_path(key)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._total_bytes -= self._entries.pop(key, 0)
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            logger.debug(f"Evicting cache entry {key}")
+            self._remove(key)
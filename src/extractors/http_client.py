@@ -0,0 +1,349 @@
+"""
+Shared HTTP client for all extractors.
+Every extractor goes through one pooled requests session, so connections to a
+host are kept alive and reused instead of paying a new TLS handshake per request.
+"""
+
+import time
+import logging
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .http_cache import CachedResponse
+from .html_stream import read_until
+from .rate_limit import backoff_delay, parse_retry_after
+from .deadline import current_deadline
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Default (connect, read) timeout in seconds
+DEFAULT_TIMEOUT = (5, 30)
+
+# Number of per-host connection pools to keep, and connections kept per host
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 16
+
+# Number of retries after a 429 or 503 response
+DEFAULT_MAX_RETRIES = 3
+
+# Status codes answered with a retry after backing off
+RETRY_STATUS_CODES = (429, 503)
+
+def _accept_encoding():
+    """
+    Build the Accept-Encoding header for the encodings urllib3 can decode.
+
+    Returns:
+        str: Accept-Encoding header value
+    """
+    encodings = ["gzip", "deflate"]
+    for module_name in ("brotli", "brotlicffi"):
+        try:
+            __import__(module_name)
+        except ImportError:
+            continue
+        encodings.append("br")
+        break
+    return ", ".join(encodings)
+
+class _TimedConnectionMixin:
+    """
+    Records the time of opening a connection (DNS lookup, TCP and TLS handshakes) as the "connect" stage.
+    """
+
+    def connect(self):
+        with metrics.span("connect"):
+            super().connect()
+        metrics.count("connections_opened")
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter whose new connections are timed.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+class HttpClient:
+    """
+    Pooled HTTP client with keep-alive, compression negotiation and default timeouts.
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 timeout=DEFAULT_TIMEOUT, cache=None, rate_limiter=None, max_retries=DEFAULT_MAX_RETRIES):
+        """
+        Initialize the client.
+
+        Args:
+            pool_connections (int): Number of per-host connection pools to keep
+            pool_maxsize (int): Maximum number of connections kept per host
+            timeout (tuple): Default (connect, read) timeout in seconds
+            cache (HttpCache): On-disk cache used by get_cached(), if any
+            rate_limiter (RateLimiter): Per-host rate limiter, if any
+            max_retries (int): Number of retries after a 429 or 503 response
+        """
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = _accept_encoding()
+
+        adapter = TimedHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request through the pooled session.
+
+        The request waits for a slot from the host's rate limiter. 429 and 503
+        responses are retried after the Retry-After delay, or an exponential
+        backoff with jitter, during which the whole host is held back. While a
+        deadline is current, timeouts are capped by the time left and no
+        attempt or wait is started that would end after it.
+
+        The time until the response is in is recorded as the "download" stage,
+        or as "response_headers" when it is streamed; the stream readers time
+        the body as "download" while they read it.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Extra arguments for requests.Session.request
+
+        Returns:
+            requests.Response: The response, with the seconds it waited for
+                               rate limiting in its queue_wait attribute
+        """
+        timeout = kwargs.pop("timeout", self.timeout)
+        deadline = current_deadline()
+        host = urlparse(url).hostname
+        queue_wait = 0.0
+        stage = "response_headers" if kwargs.get("stream") else "download"
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                max_wait = deadline.remaining() if deadline else None
+                waited = self.rate_limiter.acquire(host, max_wait)
+                queue_wait += waited
+                metrics.count("rate_limit_wait_seconds", waited, host=host)
+
+            request_timeout = deadline.timeout(timeout) if deadline else timeout
+            with metrics.span(stage):
+                response = self.session.request(method, url, timeout=request_timeout, **kwargs)
+            metrics.count("http_responses", status=str(response.status_code))
+            if not kwargs.get("stream"):
+                metrics.count_response_bytes(response)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                break
+
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = backoff_delay(attempt)
+            if deadline and delay >= deadline.remaining():
+                # Not worth waiting: the retry could not finish within the budget
+                break
+            logger.warning(f"{host} answered {response.status_code}, retrying in {delay:.1f}s")
+            response.close()
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.backoff(host, delay)
+            else:
+                time.sleep(delay)
+                queue_wait += delay
+
+        response.queue_wait = queue_wait
+        return response
+
+    def _read_page(self, response, stop_after):
+        """
+        Read a page body, stopping early if the needed elements have been seen.
+
+        Returns:
+            tuple: (body text, True if only the start of the page was read)
+        """
+        if stop_after is None:
+            return response.text, False
+        return read_until(response, stop_after)
+
+    def get_cached(self, url, headers=None, stop_after=None, **kwargs):
+        """
+        GET a page through the on-disk cache.
+
+        Entries with validators are revalidated with If-None-Match /
+        If-Modified-Since and reused on a 304. Entries without validators are
+        reused without a request while they are within the cache TTL.
+
+        With stop_after, the body is streamed and the download ends once the
+        described elements have been seen; such partial bodies are only reused
+        by later calls that also pass stop_after.
+
+        Args:
+            url (str): Request URL
+            headers (dict): Request headers
+            stop_after (StopAfter): Elements after which the rest of the page is not needed, if any
+            **kwargs: Extra arguments for requests.Session.request
+
+        Returns:
+            CachedResponse: The downloaded or reused page
+        """
+        if stop_after is not None:
+            kwargs["stream"] = True
+
+        if self.cache is None:
+            response = self.request("GET", url, headers=headers, **kwargs)
+            response.raise_for_status()
+            text, partial = self._read_page(response, stop_after)
+            return CachedResponse(url, text, response.status_code, from_cache=False, partial=partial)
+
+        headers = dict(headers or {})
+        entry = self.cache.get(url)
+        if entry is not None and entry.partial and stop_after is None:
+            # The cached body is incomplete for a caller needing the whole page
+            entry = None
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                logger.debug(f"Cache hit (fresh): {url}")
+                metrics.count("http_cache_requests", result="hit")
+                return CachedResponse(url, entry.body, 200, True, entry.parsed, self.cache, entry.partial)
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = self.request("GET", url, headers=headers, **kwargs)
+        if entry is not None and response.status_code == 304:
+            logger.debug(f"Cache hit (not modified): {url}")
+            metrics.count("http_cache_requests", result="revalidated")
+            response.close()
+            return CachedResponse(url, entry.body, 304, True, entry.parsed, self.cache, entry.partial)
+
+        response.raise_for_status()
+        metrics.count("http_cache_requests", result="miss")
+        text, partial = self._read_page(response, stop_after)
+        if partial:
+            logger.debug(f"Stopped reading {url} after {len(text)} characters")
+        self.cache.put(url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                       partial=partial)
+        return CachedResponse(url, text, response.status_code, False, cache=self.cache, partial=partial)
+
+    def close(self):
+        """
+        Close all pooled connections.
+        """
+        self.session.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def configure(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, timeout=DEFAULT_TIMEOUT,
+              cache=None, rate_limiter=None, max_retries=DEFAULT_MAX_RETRIES):
+    """
+    Replace the shared client with one using the given settings.
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to keep
+        pool_maxsize (int): Maximum number of connections kept per host
+        timeout (tuple): Default (connect, read) timeout in seconds
+        cache (HttpCache): On-disk cache used by get_cached(), if any
+        rate_limiter (RateLimiter): Per-host rate limiter, if any
+        max_retries (int): Number of retries after a 429 or 503 response
+
+    Returns:
+        HttpClient: The new shared client
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HttpClient(pool_connections, pool_maxsize, timeout, cache, rate_limiter, max_retries)
+        logger.debug(f"HTTP client configured: pool_connections={pool_connections}, "
+                     f"pool_maxsize={pool_maxsize}, timeout={timeout}")
+        return _client
+
+def get_client():
+    """
+    Get the shared client, creating it with default settings on first use.
+
+    Returns:
+        HttpClient: The shared client
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+def get(url, **kwargs):
+    """
+    Send a GET request through the shared client.
+
+    Args:
+        url (str): Request URL
+        **kwargs: Extra arguments for requests.Session.request
+
+    Returns:
+        requests.Response: The response
+    """
+    return get_client().request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    """
+    Send a POST request through the shared client.
+
+    Args:
+        url (str): Request URL
+        **kwargs: Extra arguments for requests.Session.request
+
+    Returns:
+        requests.Response: The response
+    """
+    return get_client().request("POST", url, **kwargs)
+
+def get_cached(url, headers=None, stop_after=None, **kwargs):
+    """
+    GET a page through the shared client's on-disk cache.
+
+    Args:
+        url (str): Request URL
+        headers (dict): Request headers
+        stop_after (StopAfter): Elements after which the rest of the page is not needed, if any
+        **kwargs: Extra arguments for requests.Session.request
+
+    Returns:
+        CachedResponse: The downloaded or reused page
+    """
+    return get_client().get_cached(url, headers=headers, stop_after=stop_after, **kwargs)
+
+def queue_wait_stats():
+    """
+    Summarize how long requests of the shared client waited for rate limiting.
+
+    Returns:
+        dict: Host -> {"requests", "total_wait", "max_wait"}
+    """
+    rate_limiter = get_client().rate_limiter
+    return rate_limiter.wait_stats() if rate_limiter is not None else {}
@@ -0,0 +1,158 @@
+"""
+Incremental parsing of large JSON API responses.
+Yields the items of a top-level array one at a time from the response body
+as it is downloaded, so memory use is bounded by a single item (plus one
+chunk) instead of the whole document.
+"""
+
+import re
+import json
+import time
+
+from . import metrics
+from .deadline import check_current
+
+# Bytes read from the response per chunk
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[\s,]*")
+# Characters that may follow a complete scalar array item
+_SCALAR_END = frozenset(",] \t\r\n")
+
+def _array_start(buffer, key):
+    """
+    Find where the items of the top-level array `key` start.
+
+    Returns:
+        tuple: (index of the first character after "[", header text before the key),
+               or None if the array has not been seen yet
+    """
+    match = re.search(rf'"{re.escape(key)}"\s*:\s*\[', buffer)
+    if match is None:
+        return None
+    return match.end(), buffer[:match.start()]
+
+def _parse_header(text):
+    """
+    Parse the top-level fields preceding the array, e.g. '{"status":"OK",'.
+    """
+    text = text.strip().rstrip(",")
+    if not text.endswith("}"):
+        text += "}"
+    try:
+        return json.loads(text)
+    except ValueError:
+        return {}
+
+def iter_array(chunks, key, header=None):
+    """
+    Yield the items of a top-level JSON array while the document streams in.
+
+    Args:
+        chunks (iterable): Text chunks of the JSON document
+        key (str): Name of the top-level array, e.g. "result"
+        header (dict): Filled with the top-level fields preceding the array,
+                       or with the whole document if it has no such array
+                       (e.g. an API error)
+
+    Yields:
+        object: Decoded array items, in order
+    """
+    header = {} if header is None else header
+    chunks = iter(chunks)
+    buffer = ""
+    position = None
+
+    # Read until the array starts
+    for chunk in chunks:
+        buffer += chunk
+        start = _array_start(buffer, key)
+        if start is not None:
+            position, header_text = start
+            header.update(_parse_header(header_text))
+            break
+    if position is None:
+        header.update(json.loads(buffer))
+        return
+
+    exhausted = False
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            item, end = _decoder.raw_decode(buffer, position)
+            # Objects, arrays and strings end with a delimiter; a number (or literal)
+            # is only complete once the character after it is seen
+            complete = (exhausted or isinstance(item, (dict, list, str))
+                        or (end < len(buffer) and buffer[end] in _SCALAR_END))
+        except ValueError:
+            if exhausted:
+                raise
+            complete = False
+        if not complete:
+            # Incomplete item: drop what was consumed and read more
+            buffer = buffer[position:]
+            position = 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+            else:
+                buffer += chunk
+            continue
+        yield item
+        position = end
+        if position >= len(buffer) and not exhausted:
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+            else:
+                buffer = buffer[position:] + chunk
+                position = 0
+
+def _checked_chunks(response, chunk_size):
+    # Only the reads are timed as the "download" stage, not the consumer's work between chunks
+    chunks = response.iter_content(chunk_size=chunk_size, decode_unicode=True)
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            elapsed += time.perf_counter() - start
+            if chunk is None:
+                return
+            check_current()
+            yield chunk
+    finally:
+        metrics.record("download", elapsed)
+
+def iter_response_array(response, key, header=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield the items of a top-level JSON array of a streamed response.
+
+    The response is closed once the items are consumed or the generator is
+    closed early. While a deadline is current, it is checked before every
+    chunk.
+
+    Args:
+        response (requests.Response): Response requested with stream=True
+        key (str): Name of the top-level array
+        header (dict): Filled as in iter_array()
+        chunk_size (int): Bytes read per chunk
+
+    Yields:
+        object: Decoded array items, in order
+
+    Raises:
+        DeadlineExceeded: If the deadline runs out before the body is read
+    """
+    if response.encoding is None:
+        response.encoding = "utf-8"
+    chunks = _checked_chunks(response, chunk_size)
+    try:
+        yield from iter_array(chunks, key, header)
+    finally:
+        chunks.close()
+        metrics.count_response_bytes(response)
+        response.close()
@@ -2,29 +2,20 @@
 LeetCode data extractor module.
 """
 
-import requests
 import logging
 from datetime import datetime
 
+from . import http_client
+
 logger = logging.getLogger(__name__)
 
-class LeetCodeExtractor:
-    """
-    Class for extracting user statistics from LeetCode.
-    """
-    
-    def __init__(self, username):
-        """
-        Initialize with username.
-        
-        Args:
-            username (str): LeetCode username
-        """
-        self.username = username
-        self.graphql_url = "https://leetcode.com/graphql"
-        self.query = """
-        query userProfile($username: String! ) {
-          matchedUser(username: $username) {
+GRAPHQL_URL = "https://leetcode.com/graphql"
+
+# Number of users packed into one aliased GraphQL query
+DEFAULT_BATCH_SIZE = 20
+
+# Fields fetched for every matched user
+USER_PROFILE_FIELDS = """
             username
             submitStats: submitStatsGlobal {
               acSubmissionNum {
@@ -38,9 +29,95 @@ class LeetCodeExtractor:
               reputation
               starRating
             }
-          }
-        }
+"""
+
+class LeetCodeExtractor:
+    """
+    Class for extracting user statistics from LeetCode.
+    """
+    
+    def __init__(self, username):
+        """
+        Initialize with username.
+        
+        Args:
+            username (str): LeetCode username
+        """
+        self.username = username
+        self.graphql_url = GRAPHQL_URL
+        self.query = f"""
+        query userProfile($username: String! ) {{
+          matchedUser(username: $username) {{{USER_PROFILE_FIELDS}          }}
+        }}
+        """
+    
+    @classmethod
+    def get_stats_batch(cls, usernames, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Get user statistics for many users with aliased GraphQL queries.
+        
+        Each request fetches matchedUser for up to batch_size users under the
+        aliases u0, u1, ... Users that are not found get error stats without
+        failing the rest of their batch.
+        
+        Args:
+            usernames (list): LeetCode usernames
+            batch_size (int): Number of users per request
+        
+        Returns:
+            dict: Mapping of username to user statistics
         """
+        usernames = list(dict.fromkeys(usernames))
+        stats = {}
+        for start in range(0, len(usernames), batch_size):
+            stats.update(cls._get_stats_chunk(usernames[start:start + batch_size]))
+        return stats
+    
+    @classmethod
+    def _get_stats_chunk(cls, usernames):
+        """
+        Get user statistics for one batch of users in a single request.
+        
+        Args:
+            usernames (list): LeetCode usernames
+        
+        Returns:
+            dict: Mapping of username to user statistics
+        """
+        variables = {f"u{i}": username for i, username in enumerate(usernames)}
+        declarations = ", ".join(f"${alias}: String!" for alias in variables)
+        fields = "".join(
+            f"          {alias}: matchedUser(username: ${alias}) {{{USER_PROFILE_FIELDS}          }}\n"
+            for alias in variables
+        )
+        query = f"query userProfiles({declarations}) {{\n{fields}}}"
+        
+        try:
+            response = http_client.post(
+                GRAPHQL_URL,
+                json={"query": query, "variables": variables},
+                headers={"Content-Type": "application/json"}
+            )
+            response.raise_for_status()
+            data = response.json().get("data") or {}
+        except Exception as e:
+            logger.error(f"Error extracting LeetCode stats batch: {e}")
+            return {username: cls(username)._get_error_stats() for username in usernames}
+        
+        stats = {}
+        for alias, username in variables.items():
+            extractor = cls(username)
+            user_data = data.get(alias)
+            if not user_data:
+                logger.error(f"User not found on LeetCode: {username}")
+                stats[username] = extractor._get_error_stats()
+                continue
+            try:
+                stats[username] = extractor._build_stats(user_data)
+            except Exception as e:
+                logger.error(f"Error extracting LeetCode stats for {username}: {e}")
+                stats[username] = extractor._get_error_stats()
+        return stats
     
     def get_stats(self):
         """
@@ -51,7 +128,7 @@ class LeetCodeExtractor:
         """
         try:
             # Make GraphQL request
-            response = requests.post(
+            response = http_client.post(
                 self.graphql_url,
                 json={
                     "query": self.query,
@@ -71,50 +148,61 @@ class LeetCodeExtractor:
                 return self._get_error_stats()
             
             user_data = data["data"]["matchedUser"]
-            
-            # Extract stats
-            submission_stats = user_data["submitStats"]["acSubmissionNum"]
-            
-            total_solved = 0
-            easy_solved = 0
-            medium_solved = 0
-            hard_solved = 0
-            
-            for stat in submission_stats:
-                if stat["difficulty"] == "All":
-                    total_solved = stat["count"]
-                elif stat["difficulty"] == "Easy":
-                    easy_solved = stat["count"]
-                elif stat["difficulty"] == "Medium":
-                    medium_solved = stat["count"]
-                elif stat["difficulty"] == "Hard":
-                    hard_solved = stat["count"]
-            
-            ranking = user_data["profile"]["ranking"] if user_data["profile"]["ranking"] else "N/A"
-            
-            # Calculate acceptance rate
-            total_submissions = sum(stat["submissions"] for stat in submission_stats if stat["difficulty"] == "All")
-            acceptance_rate = round((total_solved / total_submissions) * 100, 1) if total_submissions > 0 else 0
-            
-            return {
-                "platform": "LeetCode",
-                "username": self.username,
-                "status": "Active",
-                "rating": total_solved,  # LeetCode doesn't have a rating system like Codeforces
-                "max_rating": "N/A",
-                "rank": ranking,
-                "problems_solved": total_solved,
-                "easy_solved": easy_solved,
-                "medium_solved": medium_solved,
-                "hard_solved": hard_solved,
-                "acceptance_rate": acceptance_rate,
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            return self._build_stats(user_data)
         
         except Exception as e:
             logger.error(f"Error extracting LeetCode stats: {e}")
             return self._get_error_stats()
     
+    def _build_stats(self, user_data):
+        """
+        Build the stats dict from a matchedUser result.
+        
+        Args:
+            user_data (dict): matchedUser result
+        
+        Returns:
+            dict: User statistics
+        """
+        # Extract stats
+        submission_stats = user_data["submitStats"]["acSubmissionNum"]
+        
+        total_solved = 0
+        easy_solved = 0
+        medium_solved = 0
+        hard_solved = 0
+        
+        for stat in submission_stats:
+            if stat["difficulty"] == "All":
+                total_solved = stat["count"]
+            elif stat["difficulty"] == "Easy":
+                easy_solved = stat["count"]
+            elif stat["difficulty"] == "Medium":
+                medium_solved = stat["count"]
+            elif stat["difficulty"] == "Hard":
+                hard_solved = stat["count"]
+        
+        ranking = user_data["profile"]["ranking"] if user_data["profile"]["ranking"] else "N/A"
+        
+        # Calculate acceptance rate
+        total_submissions = sum(stat["submissions"] for stat in submission_stats if stat["difficulty"] == "All")
+        acceptance_rate = round((total_solved / total_submissions) * 100, 1) if total_submissions > 0 else 0
+        
+        return {
+            "platform": "LeetCode",
+            "username": self.username,
+            "status": "Active",
+            "rating": total_solved,  # LeetCode doesn't have a rating system like Codeforces
+            "max_rating": "N/A",
+            "rank": ranking,
+            "problems_solved": total_solved,
+            "easy_solved": easy_solved,
+            "medium_solved": medium_solved,
+            "hard_solved": hard_solved,
+            "acceptance_rate": acceptance_rate,
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    
     def _get_error_stats(self):
         """
         Return error stats when API call fails.
@@ -0,0 +1,337 @@
+"""
+Per-stage performance metrics of a run.
+Stages (connect, download, parse, render, README write, ...) are timed with
+spans tagged with the platform and user they worked for, and collected into
+histograms alongside byte counts and cache hit/miss counters. At the end of a
+run they are exported as a Prometheus text file (for the node exporter's
+textfile collector) and a JSON summary of where the time went.
+
+Prometheus series are labeled by stage and platform only; the per-user
+breakdown goes to the JSON summary to keep the series count bounded.
+"""
+
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# Prefix of all exported metric names
+PREFIX = "cp_stats"
+
+# Upper bounds in seconds of the stage duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Number of slowest spans listed in the JSON summary
+SLOWEST_SPANS = 20
+
+# Platform and user the current context works for
+_current_tags = ContextVar("metrics_tags", default={})
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+class _Histogram:
+    """
+    Duration histogram of one stage and platform.
+    """
+
+    __slots__ = ("counts", "total", "samples")
+
+    def __init__(self):
+        self.counts = [0] * (len(DURATION_BUCKETS) + 1)
+        self.total = 0.0
+        self.samples = []
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(DURATION_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+class MetricsRegistry:
+    """
+    Thread-safe collection of stage durations and counters.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty registry; the run's clock starts now.
+        """
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        # (stage, platform) -> _Histogram
+        self._histograms = {}
+        # (name, sorted label items) -> value
+        self._counters = {}
+        # (user, platform) -> stage -> seconds
+        self._per_user = {}
+        # (seconds, stage, platform, user), slowest last
+        self._slowest = []
+
+    def observe(self, stage, seconds, platform="", user=""):
+        """
+        Record the duration of one stage.
+
+        Args:
+            stage (str): Stage name, e.g. "download"
+            seconds (float): Duration in seconds
+            platform (str): Platform key the stage worked for, if any
+            user (str): Username the stage worked for, if any
+        """
+        with self._lock:
+            histogram = self._histograms.get((stage, platform))
+            if histogram is None:
+                histogram = self._histograms[(stage, platform)] = _Histogram()
+            histogram.observe(seconds)
+            if user:
+                stages = self._per_user.setdefault((user, platform), {})
+                stages[stage] = stages.get(stage, 0.0) + seconds
+            if len(self._slowest) < SLOWEST_SPANS or seconds > self._slowest[0][0]:
+                bisect.insort(self._slowest, (seconds, stage, platform, user))
+                if len(self._slowest) > SLOWEST_SPANS:
+                    self._slowest.pop(0)
+
+    def count(self, name, value=1, **labels):
+        """
+        Add to a counter.
+
+        Args:
+            name (str): Counter name without prefix or _total suffix, e.g. "response_bytes"
+            value (float): Amount to add
+            **labels: Label values of the series
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def to_prometheus(self, constant_labels=None):
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            constant_labels (dict): Labels added to every series, e.g. a worker id
+
+        Returns:
+            str: Exposition text
+        """
+        constant = tuple(sorted((constant_labels or {}).items()))
+
+        def labels(items):
+            items = constant + tuple(items)
+            if not items:
+                return ""
+            return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+        lines = []
+        with self._lock:
+            name = f"{PREFIX}_stage_duration_seconds"
+            lines.append(f"# HELP {name} Duration of run stages.")
+            lines.append(f"# TYPE {name} histogram")
+            for (stage, platform), histogram in sorted(self._histograms.items()):
+                series = (("stage", stage), ("platform", platform))
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{labels(series + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{name}_sum{labels(series)} {histogram.total:.6f}")
+                lines.append(f"{name}_count{labels(series)} {cumulative}")
+
+            for counter in sorted({counter for counter, _ in self._counters}):
+                name = f"{PREFIX}_{counter}_total"
+                lines.append(f"# TYPE {name} counter")
+                for (other, items), value in sorted(self._counters.items()):
+                    if other == counter:
+                        lines.append(f"{name}{labels(items)} {value:g}")
+
+            name = f"{PREFIX}_run_duration_seconds"
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name}{labels(())} {time.perf_counter() - self._started:.3f}")
+            name = f"{PREFIX}_run_started_timestamp_seconds"
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name}{labels(())} {self.started_at:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """
+        Summarize the run: time per stage, platform and user, counters and slowest spans.
+
+        Returns:
+            dict: JSON-serializable summary
+        """
+        with self._lock:
+            stages = {}
+            platforms = {}
+            for (stage, platform), histogram in sorted(self._histograms.items()):
+                samples = sorted(histogram.samples)
+                stages.setdefault(stage, {})[platform or "all"] = {
+                    "count": len(samples),
+                    "total_seconds": round(histogram.total, 4),
+                    "p50_seconds": round(_percentile(samples, 0.5), 4),
+                    "p95_seconds": round(_percentile(samples, 0.95), 4),
+                    "max_seconds": round(samples[-1], 4),
+                }
+                if platform:
+                    platform_stages = platforms.setdefault(platform, {})
+                    platform_stages[stage] = round(platform_stages.get(stage, 0.0) + histogram.total, 4)
+
+            users = {}
+            for (user, platform), user_stages in sorted(self._per_user.items()):
+                users.setdefault(user, {})[platform or "all"] = {
+                    stage: round(seconds, 4) for stage, seconds in sorted(user_stages.items())
+                }
+
+            counters = {}
+            for (name, items), value in sorted(self._counters.items()):
+                label_text = ",".join(f"{key}={label}" for key, label in items)
+                counters.setdefault(name, {})[label_text or "all"] = value
+
+            return {
+                "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+                "duration_seconds": round(time.perf_counter() - self._started, 3),
+                "stages": stages,
+                "platforms": platforms,
+                "users": users,
+                "counters": counters,
+                "slowest_spans": [
+                    {"stage": stage, "platform": platform, "user": user, "seconds": round(seconds, 4)}
+                    for seconds, stage, platform, user in reversed(self._slowest)
+                ],
+            }
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+_registry = MetricsRegistry()
+
+def get_registry():
+    """
+    Get the registry of the current run.
+
+    Returns:
+        MetricsRegistry: The shared registry
+    """
+    return _registry
+
+def reset():
+    """
+    Start a new run with an empty registry.
+
+    Returns:
+        MetricsRegistry: The new shared registry
+    """
+    global _registry
+    _registry = MetricsRegistry()
+    return _registry
+
+@contextmanager
+def tags(**values):
+    """
+    Tag spans and counters in the enclosed block, e.g. with the platform and user.
+
+    Args:
+        **values: Tags to add ("platform", "user")
+    """
+    token = _current_tags.set({**_current_tags.get(), **values})
+    try:
+        yield
+    finally:
+        _current_tags.reset(token)
+
+def current_tags():
+    """
+    Get the tags of the current context.
+
+    Returns:
+        dict: Tag name -> value
+    """
+    return _current_tags.get()
+
+@contextmanager
+def span(stage, **values):
+    """
+    Time the enclosed block as one stage.
+
+    Args:
+        stage (str): Stage name
+        **values: Tags overriding the current ones ("platform", "user")
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start, **values)
+
+def record(stage, seconds, **values):
+    """
+    Record a stage duration measured elsewhere.
+
+    Args:
+        stage (str): Stage name
+        seconds (float): Duration in seconds
+        **values: Tags overriding the current ones ("platform", "user")
+    """
+    current = {**_current_tags.get(), **values}
+    _registry.observe(stage, seconds, current.get("platform", ""), current.get("user", ""))
+
+def count(name, value=1, **labels):
+    """
+    Add to a counter, labeled with the current platform unless given.
+
+    Args:
+        name (str): Counter name, e.g. "response_bytes"
+        value (float): Amount to add
+        **labels: Label values of the series
+    """
+    platform = _current_tags.get().get("platform")
+    if platform and "platform" not in labels:
+        labels["platform"] = platform
+    _registry.count(name, value, **labels)
+
+def count_response_bytes(response):
+    """
+    Count the bytes of a response body read from the wire (compressed, if it was).
+
+    Args:
+        response (requests.Response): Response whose body has been read
+    """
+    tell = getattr(response.raw, "tell", None)
+    transferred = tell() if tell is not None else len(response.content)
+    count("response_bytes", transferred)
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def export(prometheus_path, summary_path, constant_labels=None):
+    """
+    Write the run's metrics as a Prometheus text file and a JSON summary.
+
+    Args:
+        prometheus_path (str): Path of the .prom file
+        summary_path (str): Path of the JSON summary
+        constant_labels (dict): Labels added to every Prometheus series, e.g. a worker id
+
+    Returns:
+        dict: The summary
+    """
+    summary = _registry.summary()
+    try:
+        _write_atomic(prometheus_path, _registry.to_prometheus(constant_labels))
+        _write_atomic(summary_path, json.dumps(summary, indent=2))
+        logger.info(f"Wrote run metrics to {prometheus_path} and {summary_path}")
+    except OSError as e:
+        logger.error(f"Error writing run metrics: {e}")
+    return summary
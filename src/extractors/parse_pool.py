@@ -0,0 +1,92 @@
+"""
+Process pool for parsing scraped profile pages.
+Fetching pages is I/O-bound, but building the parse tree is CPU-bound and
+holds the GIL, so more fetch threads stop helping once parsing dominates.
+When the pool is configured, the HTML extractors hand the raw page body to a
+worker process and only get the small stats dict back; otherwise pages are
+parsed in the calling thread.
+"""
+
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from . import html_parser, metrics
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _init_worker(backend):
+    """
+    Select the parent's HTML parser backend in a worker process.
+    """
+    html_parser.set_backend(backend)
+
+def _parse_in_worker(extractor_class, username, html):
+    """
+    Parse a page in a worker process.
+
+    Args:
+        extractor_class (type): Extractor class with a parse_stats() method
+        username (str): Username the page belongs to
+        html (str): Page HTML
+
+    Returns:
+        dict: Statistics parsed from the page
+    """
+    return extractor_class(username).parse_stats(html)
+
+def configure(processes):
+    """
+    Start (or stop) the parse pool.
+
+    Args:
+        processes (int): Number of worker processes; 0 or None parses pages in the calling thread
+
+    Returns:
+        int: Number of worker processes in use
+    """
+    global _pool
+    shutdown()
+    if not processes:
+        return 0
+    with _pool_lock:
+        _pool = ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                    initargs=(html_parser.get_backend(),))
+    logger.info(f"Parsing scraped pages in {processes} worker processes")
+    return processes
+
+def shutdown():
+    """
+    Stop the parse pool, if any; later pages are parsed in the calling thread.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def parse_stats(extractor, html):
+    """
+    Parse a page with an extractor, in the pool if one is configured.
+
+    Args:
+        extractor (object): Extractor with username and parse_stats()
+        html (str): Page HTML
+
+    Returns:
+        dict: Statistics parsed from the page
+    """
+    with metrics.span("parse"):
+        pool = _pool
+        if pool is not None:
+            try:
+                future = pool.submit(_parse_in_worker, type(extractor), extractor.username, html)
+            except RuntimeError:
+                # Pool shut down by a concurrent shutdown() (e.g. a straggler after a batch run)
+                future = None
+            if future is not None:
+                return future.result()
+        return extractor.parse_stats(html)
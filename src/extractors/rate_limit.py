@@ -0,0 +1,194 @@
+"""
+Per-host rate limiting for outgoing requests.
+Each host gets a token bucket; callers reserve the next free slot in arrival
+order and sleep until it comes up, so requests queue instead of tripping the
+platform's rate limit. Hosts can be slowed down further after 429/503 replies.
+"""
+
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+
+from .deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Token bucket handing out request slots in FIFO order.
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate (float): Sustained requests per second
+            burst (int): Number of requests allowed back to back
+        """
+        self.rate = rate
+        self.burst = burst
+        # Tokens available at _updated_at, which is in the future while slots are
+        # queued or the host is blocked; tokens refill from there on
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """
+        Reserve the next request slot.
+
+        Args:
+            max_wait (float): Longest acceptable wait in seconds, if bounded
+
+        Returns:
+            float: Seconds the caller has to wait before sending, or None if the
+                   slot would come up after max_wait (no slot is taken then)
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._updated_at)
+            tokens = min(self.burst, self._tokens + (start - self._updated_at) * self.rate)
+            # Each queued caller takes the next slot after the previous one
+            slot = start if tokens >= 1 else start + (1 - tokens) / self.rate
+            wait = slot - now
+            if max_wait is not None and wait > max_wait:
+                return None
+
+            self._tokens = tokens + (slot - start) * self.rate - 1
+            self._updated_at = slot
+            return wait
+
+    def block_for(self, seconds):
+        """
+        Hold back every request to the host for a while, e.g. after a 429.
+
+        The first request after the block goes out when it ends; later ones are
+        spaced out at the sustained rate again.
+
+        Args:
+            seconds (float): How long to hold requests back
+        """
+        with self._lock:
+            blocked_until = time.monotonic() + seconds
+            if blocked_until > self._updated_at:
+                self._tokens = 1.0
+                self._updated_at = blocked_until
+
+class RateLimiter:
+    """
+    Token buckets per host with wait-time accounting.
+    """
+
+    def __init__(self, limits=None, default_limit=None):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits (dict): Host -> (requests per second, burst)
+            default_limit (tuple): (requests per second, burst) for other hosts, or None for no limit
+        """
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self._buckets = {}
+        self._lock = threading.Lock()
+        # Host -> (number of requests, total seconds waited, longest wait)
+        self._waits = {}
+
+    def _bucket(self, host):
+        with self._lock:
+            if host not in self._buckets:
+                limit = self.limits.get(host, self.default_limit)
+                self._buckets[host] = TokenBucket(*limit) if limit else None
+            return self._buckets[host]
+
+    def acquire(self, host, max_wait=None):
+        """
+        Wait for a request slot for a host.
+
+        Args:
+            host (str): Host name
+            max_wait (float): Longest acceptable wait in seconds, if bounded
+
+        Returns:
+            float: Seconds spent waiting in the queue
+
+        Raises:
+            DeadlineExceeded: If the slot would come up after max_wait; no slot is used up then
+        """
+        bucket = self._bucket(host)
+        wait = bucket.reserve(max_wait) if bucket else 0.0
+        if wait is None:
+            raise DeadlineExceeded(f"No request slot on {host} within {max_wait:.1f}s")
+        if wait > 0:
+            logger.debug(f"Waiting {wait:.2f}s for a request slot on {host}")
+            time.sleep(wait)
+
+        with self._lock:
+            count, total, longest = self._waits.get(host, (0, 0.0, 0.0))
+            self._waits[host] = (count + 1, total + wait, max(longest, wait))
+        return wait
+
+    def backoff(self, host, seconds):
+        """
+        Hold back all requests to a host, e.g. when it answered 429 or 503.
+
+        Args:
+            host (str): Host name
+            seconds (float): How long to hold requests back
+        """
+        bucket = self._bucket(host)
+        if bucket:
+            bucket.block_for(seconds)
+
+    def wait_stats(self):
+        """
+        Summarize how long requests waited in the queue.
+
+        Returns:
+            dict: Host -> {"requests", "total_wait", "max_wait"}
+        """
+        with self._lock:
+            return {
+                host: {"requests": count, "total_wait": round(total, 3), "max_wait": round(longest, 3)}
+                for host, (count, total, longest) in self._waits.items()
+            }
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Zero-based retry attempt
+        base (float): Delay of the first retry in seconds
+        cap (float): Maximum delay in seconds
+
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Args:
+        value (str): Header value
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,198 @@
+"""
+Append-only history of collected statistics.
+Every run's stats are appended to a SQLite database, indexed by
+(user, platform, timestamp), so rating and problem-count changes over time can
+be queried without parsing old README commits.
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Stats fields stored in their own columns; everything else goes to "extra"
+NUMERIC_FIELDS = ("rating", "max_rating", "problems_solved")
+
+# Fields stored in columns, and fields not worth keeping per point
+COLUMN_FIELDS = NUMERIC_FIELDS + ("rank",)
+SKIPPED_FIELDS = ("platform", "username", "status", "last_updated", "stale")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    series_id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    UNIQUE (user_id, platform)
+);
+CREATE TABLE IF NOT EXISTS points (
+    series_id INTEGER NOT NULL REFERENCES series (series_id),
+    ts INTEGER NOT NULL,
+    rating INTEGER,
+    max_rating INTEGER,
+    problems_solved INTEGER,
+    rank TEXT,
+    extra TEXT,
+    PRIMARY KEY (series_id, ts)
+) WITHOUT ROWID;
+"""
+
+def _to_int(value):
+    """
+    Convert a stats value to an integer column value.
+
+    Args:
+        value (object): Stats value, e.g. 1500 or "N/A"
+
+    Returns:
+        int: The value, or None if it is not a number
+    """
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+class HistoryStore:
+    """
+    SQLite-backed time series of stats per user and platform.
+    """
+
+    def __init__(self, db_path):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            db_path (str): Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        # (user_id, platform) -> series_id
+        self._series_ids = {}
+
+    def _series_id(self, user_id, platform):
+        key = (user_id, platform)
+        if key not in self._series_ids:
+            self._conn.execute("INSERT OR IGNORE INTO series (user_id, platform) VALUES (?, ?)", key)
+            row = self._conn.execute(
+                "SELECT series_id FROM series WHERE user_id = ? AND platform = ?", key
+            ).fetchone()
+            self._series_ids[key] = row[0]
+        return self._series_ids[key]
+
+    def append(self, results, ts=None):
+        """
+        Append one run's stats for one or many users.
+
+        Only successfully collected stats are recorded; failed and stale
+        platforms would otherwise show up as fake drops. Stored points are never
+        overwritten: a point that already exists at the same timestamp is kept.
+
+        Args:
+            results (dict): User id -> platform -> stats
+            ts (int): Unix timestamp of the run (defaults to now)
+
+        Returns:
+            int: Number of points appended
+        """
+        ts = int(ts if ts is not None else time.time())
+        rows = []
+        with self._lock, self._conn:
+            for user_id, stats in results.items():
+                for platform, platform_stats in stats.items():
+                    if platform_stats.get("status") != "Active" or platform_stats.get("stale"):
+                        continue
+                    extra = {key: value for key, value in platform_stats.items()
+                             if key not in COLUMN_FIELDS and key not in SKIPPED_FIELDS}
+                    rows.append((
+                        self._series_id(user_id, platform),
+                        ts,
+                        _to_int(platform_stats.get("rating")),
+                        _to_int(platform_stats.get("max_rating")),
+                        _to_int(platform_stats.get("problems_solved")),
+                        str(platform_stats.get("rank", "")),
+                        json.dumps(extra, separators=(",", ":")) if extra else None,
+                    ))
+            appended = self._conn.executemany(
+                "INSERT OR IGNORE INTO points "
+                "(series_id, ts, rating, max_rating, problems_solved, rank, extra) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            ).rowcount
+        logger.info(f"Appended {appended} history points")
+        return appended
+
+    def range(self, user_id, platform, start_ts=None, end_ts=None):
+        """
+        Get the points of a user on a platform within a time range.
+
+        Args:
+            user_id (str): User id
+            platform (str): Platform key
+            start_ts (int): Earliest timestamp, inclusive (unbounded if None)
+            end_ts (int): Latest timestamp, inclusive (unbounded if None)
+
+        Returns:
+            list: Points as dicts, oldest first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.ts, p.rating, p.max_rating, p.problems_solved, p.rank, p.extra "
+                "FROM points p JOIN series s ON s.series_id = p.series_id "
+                "WHERE s.user_id = ? AND s.platform = ? AND p.ts >= ? AND p.ts <= ? ORDER BY p.ts",
+                (user_id, platform, start_ts if start_ts is not None else 0,
+                 end_ts if end_ts is not None else 2 ** 62)
+            ).fetchall()
+
+        points = []
+        for row in rows:
+            point = dict(row)
+            extra = point.pop("extra")
+            if extra:
+                point.update(json.loads(extra))
+            points.append(point)
+        return points
+
+    def delta(self, user_id, platform, field, since_ts):
+        """
+        Change of a numeric field since a point in time, e.g. rating change over 30 days.
+
+        The baseline is the last point at or before since_ts, or the first point
+        after it when the history starts later. The latest point must be a
+        different, later point than the baseline.
+
+        Args:
+            user_id (str): User id
+            platform (str): Platform key
+            field (str): One of "rating", "max_rating", "problems_solved"
+            since_ts (int): Unix timestamp to measure from
+
+        Returns:
+            int: Latest value minus baseline value, or None without two points
+        """
+        if field not in NUMERIC_FIELDS:
+            raise ValueError(f"Unsupported history field: {field}")
+
+        query = (
+            f"SELECT p.ts, p.{field} FROM points p JOIN series s ON s.series_id = p.series_id "
+            f"WHERE s.user_id = ? AND s.platform = ? AND p.{field} IS NOT NULL AND p.ts {{op}} ? "
+            f"ORDER BY p.ts {{order}} LIMIT 1"
+        )
+        params = (user_id, platform, since_ts)
+        with self._lock:
+            baseline = self._conn.execute(query.format(op="<=", order="DESC"), params).fetchone()
+            if baseline is None:
+                baseline = self._conn.execute(query.format(op=">", order="ASC"), params).fetchone()
+            latest = self._conn.execute(query.format(op=">", order="DESC"), params).fetchone()
+
+        if baseline is None or latest is None or latest[0] <= baseline[0]:
+            return None
+        return latest[1] - baseline[1]
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,157 @@
+"""
+Codeforces rating history analytics.
+Derives per-user metrics from the stored user.rating changes of a whole
+roster at once: rating volatility, trend slope, best single-contest delta,
+percentile of the current rating within the roster, and contests per month.
+
+The metrics are computed with NumPy over flat arrays of all users' contests;
+without NumPy a (slower) per-user loop gives the same results. NumPy is
+only imported when metrics are computed, not when the module is loaded.
+"""
+
+import math
+import time
+import bisect
+import logging
+from itertools import chain
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+DAYS_PER_MONTH = 30.4375
+
+def _compute_numpy(np, histories, now):
+    """
+    Compute the metrics of all users with vectorised array operations.
+    """
+    users = list(histories)
+    lengths = np.fromiter((len(histories[user]) for user in users), dtype=np.int64, count=len(users))
+    changes = chain.from_iterable(chain.from_iterable(histories[user] for user in users))
+    flat = np.fromiter(changes, dtype=np.float64, count=3 * int(lengths.sum())).reshape(-1, 3)
+    times, old_ratings, new_ratings = flat[:, 0], flat[:, 1], flat[:, 2]
+    user_index = np.repeat(np.arange(len(users)), lengths)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    counts = lengths.astype(np.float64)
+
+    def per_user_sum(values):
+        return np.bincount(user_index, weights=values, minlength=len(users))
+
+    # Volatility: standard deviation of the rating deltas
+    deltas = new_ratings - old_ratings
+    mean_delta = per_user_sum(deltas) / counts
+    volatility = np.sqrt(np.maximum(per_user_sum(deltas * deltas) / counts - mean_delta * mean_delta, 0))
+
+    best_delta = np.maximum.reduceat(deltas, offsets)
+
+    # Trend: least-squares slope of the rating over time, per month. Times are
+    # taken relative to each user's first contest to keep the sums well conditioned.
+    months = (times - times[offsets][user_index]) / (SECONDS_PER_DAY * DAYS_PER_MONTH)
+    sum_x, sum_y = per_user_sum(months), per_user_sum(new_ratings)
+    sum_xx, sum_xy = per_user_sum(months * months), per_user_sum(months * new_ratings)
+    denominator = counts * sum_xx - sum_x * sum_x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(denominator > 0, (counts * sum_xy - sum_x * sum_y) / denominator, 0.0)
+
+    # Percentile of the current (last) rating within the roster
+    current = new_ratings[offsets + lengths - 1]
+    percentile = 100.0 * np.searchsorted(np.sort(current), current, side="right") / len(users)
+
+    active_months = np.maximum((now - times[offsets]) / (SECONDS_PER_DAY * DAYS_PER_MONTH), 1.0)
+    contests_per_month = counts / active_months
+
+    columns = zip(lengths.tolist(), volatility.tolist(), slope.tolist(), best_delta.tolist(),
+                  percentile.tolist(), contests_per_month.tolist())
+    return {user: _metrics(*column) for user, column in zip(users, columns)}
+
+def _compute_python(histories, now):
+    """
+    Compute the metrics of all users with a per-user loop.
+    """
+    current = sorted(history[-1][2] for history in histories.values())
+    metrics = {}
+    for user, history in histories.items():
+        count = len(history)
+        deltas = [new - old for _, old, new in history]
+        mean_delta = sum(deltas) / count
+        volatility = math.sqrt(max(sum(delta * delta for delta in deltas) / count - mean_delta * mean_delta, 0))
+
+        first_time = history[0][0]
+        months = [(ts - first_time) / (SECONDS_PER_DAY * DAYS_PER_MONTH) for ts, _, _ in history]
+        ratings = [new for _, _, new in history]
+        sum_x, sum_y = sum(months), sum(ratings)
+        sum_xx = sum(x * x for x in months)
+        sum_xy = sum(x * y for x, y in zip(months, ratings))
+        denominator = count * sum_xx - sum_x * sum_x
+        slope = (count * sum_xy - sum_x * sum_y) / denominator if denominator > 0 else 0.0
+
+        percentile = 100.0 * bisect.bisect_right(current, history[-1][2]) / len(current)
+
+        active_months = max((now - first_time) / (SECONDS_PER_DAY * DAYS_PER_MONTH), 1.0)
+        metrics[user] = _metrics(count, volatility, slope, max(deltas), percentile, count / active_months)
+    return metrics
+
+def _metrics(contests, volatility, slope, best_delta, percentile, contests_per_month):
+    """
+    Build the metrics dict of one user.
+    """
+    return {
+        "contests": int(contests),
+        "rating_volatility": round(float(volatility), 2),
+        "rating_trend": round(float(slope), 2),
+        "best_rating_delta": int(best_delta),
+        "rating_percentile": round(float(percentile), 2),
+        "contests_per_month": round(float(contests_per_month), 2),
+    }
+
+def compute_rating_metrics(histories, now=None, use_numpy=True):
+    """
+    Compute rating metrics for a roster.
+
+    Args:
+        histories (dict): User -> list of (update_time, old_rating, new_rating), oldest first
+        now (float): Unix time the contest rate is measured up to (defaults to now)
+        use_numpy (bool): Use NumPy when it is installed
+
+    Returns:
+        dict: User -> metrics dict ("contests", "rating_volatility", "rating_trend" per
+              month, "best_rating_delta", "rating_percentile", "contests_per_month").
+              Users without rating changes are missing.
+    """
+    histories = {user: history for user, history in histories.items() if history}
+    if not histories:
+        return {}
+    now = time.time() if now is None else now
+    if use_numpy:
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+        else:
+            return _compute_numpy(np, histories, now)
+    return _compute_python(histories, now)
+
+def add_rating_metrics(results, store):
+    """
+    Add rating metrics to the Codeforces stats of every user in a run's results.
+
+    Args:
+        results (dict): User id -> platform -> stats
+        store (CodeforcesSubmissionStore): Store holding the synced rating changes
+
+    Returns:
+        int: Number of users the metrics were added to
+    """
+    handles = {
+        user_id: stats["codeforces"]["username"] for user_id, stats in results.items()
+        if stats.get("codeforces", {}).get("status") == "Active"
+    }
+    if not handles:
+        return 0
+
+    stored = store.get_rating_histories(list(handles.values()))
+    histories = {user_id: stored.get(handle.lower()) for user_id, handle in handles.items()}
+    metrics = compute_rating_metrics(histories)
+    for user_id, user_metrics in metrics.items():
+        results[user_id]["codeforces"].update(user_metrics)
+    logger.info(f"Computed rating metrics for {len(metrics)} Codeforces users")
+    return len(metrics)
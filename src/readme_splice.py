@@ -0,0 +1,159 @@
+"""
+Marker-based README updates.
+The stats block lives between explicit start/end markers and is spliced in
+with a single scan of the file. Files are only rewritten when their content
+actually changes, and always through a temporary file and an atomic rename,
+so unchanged runs leave the working tree (and git) untouched.
+"""
+
+import os
+import re
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from extractors import metrics
+
+# Import config
+from config import README_START_MARKER, README_END_MARKER, README_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Rendered "Last updated" date, ignored on request when comparing a README with its new content
+DATE_PATTERN = re.compile(r"Last updated: [A-Z][a-z]+ \d{1,2}, \d{4}")
+
+def splice_section(content, section, start_marker=README_START_MARKER, end_marker=README_END_MARKER):
+    """
+    Replace the text between the markers, or append a marked section.
+
+    Args:
+        content (str): Current file content
+        section (str): New text to put between the markers
+        start_marker (str): Line marking the start of the section
+        end_marker (str): Line marking the end of the section
+
+    Returns:
+        str: New file content
+    """
+    start = content.find(start_marker)
+    end = content.find(end_marker, start + len(start_marker)) if start != -1 else -1
+    if start == -1 or end == -1:
+        separator = "\n" if content and not content.endswith("\n") else ""
+        return f"{content}{separator}\n{start_marker}\n{section}\n{end_marker}\n"
+    return f"{content[:start + len(start_marker)]}\n{section}\n{content[end:]}"
+
+def content_hash(content):
+    """
+    Hash file content for change detection.
+
+    Args:
+        content (str): File content
+
+    Returns:
+        str: SHA-256 hex digest of the UTF-8 encoded content
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def write_if_changed(path, content, ignore_date=False):
+    """
+    Atomically write a file unless it already has exactly this content.
+
+    Args:
+        path (str): File path
+        content (str): New file content
+        ignore_date (bool): Also skip the write when only the "Last updated" date differs
+
+    Returns:
+        bool: True if the file was written, False if it was already up to date
+    """
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            current = f.read()
+        if ignore_date:
+            current, compared = DATE_PATTERN.sub("", current), DATE_PATTERN.sub("", content)
+        else:
+            compared = content
+        if content_hash(current) == content_hash(compared):
+            return False
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+def update_readme(readme_path, section, start_marker=README_START_MARKER, end_marker=README_END_MARKER,
+                  ignore_date=False):
+    """
+    Splice a section into a README, creating the file if needed.
+
+    Args:
+        readme_path (str): Path to the README file
+        section (str): New text to put between the markers
+        start_marker (str): Line marking the start of the section
+        end_marker (str): Line marking the end of the section
+        ignore_date (bool): Leave the README alone when only the "Last updated" date changed
+
+    Returns:
+        bool: True if the file was written, False if it was already up to date
+    """
+    with metrics.span("readme_write"):
+        content = ""
+        if os.path.exists(readme_path):
+            with open(readme_path, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
+        else:
+            logger.warning(f"README file not found at {readme_path}. Creating new file.")
+        written = write_if_changed(readme_path, splice_section(content, section, start_marker, end_marker),
+                                   ignore_date)
+    metrics.count("readme_writes", result="written" if written else "unchanged")
+    return written
+
+def update_readmes(sections, max_workers=README_MAX_WORKERS):
+    """
+    Splice sections into many README files in parallel.
+
+    Args:
+        sections (dict): README path -> new section text
+        max_workers (int): Maximum number of files updated at once
+
+    Returns:
+        dict: README path -> True if written, False if unchanged, None if the update failed
+    """
+    def update(readme_path):
+        try:
+            return update_readme(readme_path, sections[readme_path])
+        except Exception as e:
+            logger.error(f"Error updating README {readme_path}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = dict(zip(sections, executor.map(update, sections)))
+
+    written = sum(1 for changed in results.values() if changed)
+    logger.info(f"Updated {written} of {len(results)} README files, {len(results) - written} unchanged or failed")
+    return results
+
+def write_files(contents, max_workers=README_MAX_WORKERS):
+    """
+    Write many files in parallel, skipping the ones that are already up to date.
+
+    Args:
+        contents (dict): File path -> new content
+        max_workers (int): Maximum number of files written at once
+
+    Returns:
+        int: Number of files written
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sum(executor.map(lambda path: write_if_changed(path, contents[path]), contents))
@@ -0,0 +1,320 @@
+"""
+Template renderer for the statistics Markdown.
+Each theme is compiled once into fragments with known input fields. Rendered
+fragments are cached by the values of their fields, so re-rendering a user
+(or rendering many users) only formats the blocks whose inputs changed.
+"""
+
+import string
+import threading
+from datetime import datetime
+from collections import OrderedDict
+
+# Import config
+from config import PROFILES
+
+# Colors and labels substituted into the layout when a theme is compiled
+THEMES = {
+    "dark": {
+        "theme_name": "Dark Theme",
+        "label_color": "0d1117",
+        "logo_color": "white",
+        "accent": "58d3b9",
+        "easy": "3498db",
+        "medium": "f39c12",
+        "hard": "e74c3c",
+        "card_background": "0d1117",
+        "card_border": "30363d",
+        "text_color": "c9d1d9",
+        "muted_color": "8b949e",
+    },
+    "light": {
+        "theme_name": "Light Theme",
+        "label_color": "eaeef2",
+        "logo_color": "24292f",
+        "accent": "1f883d",
+        "easy": "0969da",
+        "medium": "bf8700",
+        "hard": "cf222e",
+        "card_background": "ffffff",
+        "card_border": "d0d7de",
+        "text_color": "24292f",
+        "muted_color": "57606a",
+    },
+}
+
+# (fragment name, text) in output order. $names are theme values, {names} are
+# per-user fields from build_context().
+LAYOUT = [
+    ("header", """<!-- Competitive Programming Stats - $theme_name -->
+
+<div align="center">
+
+  <!-- Title with custom styling -->
+  <h2>🏆 Competitive Programming Stats</h2>
+
+"""),
+    ("badges", """  <!-- Main Stats Cards - Top Row -->
+  <a href="https://codeforces.com/profile/{cf_username}">
+    <img src="https://img.shields.io/badge/Codeforces-{cf_rating}-$accent?style=for-the-badge&logo=codeforces&logoColor=$logo_color&labelColor=$label_color" alt="Codeforces">
+  </a>
+  <a href="https://leetcode.com/{lc_username}/">
+    <img src="https://img.shields.io/badge/LeetCode-{lc_problems}_problems-$accent?style=for-the-badge&logo=leetcode&logoColor=$logo_color&labelColor=$label_color" alt="LeetCode">
+  </a>
+  <a href="https://www.codechef.com/users/{cc_username}">
+    <img src="https://img.shields.io/badge/CodeChef-{cc_rating}-$accent?style=for-the-badge&logo=codechef&logoColor=$logo_color&labelColor=$label_color" alt="CodeChef">
+  </a>
+
+"""),
+    ("summary", """  <!-- Stats Summary in GitHub-compatible table -->
+  <table>
+    <tr>
+      <td align="center" width="200">
+        <h1>{cf_rating}</h1>
+        <strong>Codeforces Rating</strong>
+        <br>
+        <code>{cf_rank}</code>
+      </td>
+      <td align="center" width="200">
+        <h1>{lc_problems}</h1>
+        <strong>Problems Solved</strong>
+        <br>
+        <code>LeetCode</code>
+      </td>
+      <td align="center" width="200">
+        <h1>{cc_rating}</h1>
+        <strong>CodeChef Rating</strong>
+        <br>
+        <code>{cc_rank}</code>
+      </td>
+    </tr>
+  </table>
+
+"""),
+    ("leetcode", """  <!-- LeetCode Progress -->
+  <h3>LeetCode Progress</h3>
+  <a href="https://leetcode.com/{lc_username}/">
+    <img src="https://img.shields.io/badge/Easy-{lc_easy}-$easy?style=flat-square&labelColor=$label_color" alt="Easy">
+    <img src="https://img.shields.io/badge/Medium-{lc_medium}-$medium?style=flat-square&labelColor=$label_color" alt="Medium">
+    <img src="https://img.shields.io/badge/Hard-{lc_hard}-$hard?style=flat-square&labelColor=$label_color" alt="Hard">
+  </a>
+
+"""),
+    ("distribution", """  <!-- Platform Distribution -->
+  <h3>Platform Activity</h3>
+  <a href="#">
+    <img src="https://img.shields.io/badge/Codeforces-{cf_percent}%25-$accent?style=flat-square&labelColor=$label_color" alt="Codeforces">
+    <img src="https://img.shields.io/badge/LeetCode-{lc_percent}%25-$accent?style=flat-square&labelColor=$label_color" alt="LeetCode">
+    <img src="https://img.shields.io/badge/Others-{others_percent}%25-$accent?style=flat-square&labelColor=$label_color" alt="Others">
+  </a>
+  
+"""),
+    ("footer", """  <br><br>
+  <i>Last updated: {last_updated}</i>
+</div>"""),
+]
+
+# Same page with locally generated SVG cards (see cards.py) instead of badges.
+# {cards_path} is the cards directory relative to the README; the version
+# query changes with the card content so viewers don't see cached images.
+CARDS_LAYOUT = [
+    LAYOUT[0],
+    ("cards", """  <!-- Stats Cards -->
+  <a href="https://codeforces.com/profile/{cf_username}">
+    <img src="{cards_path}/ratings.svg?v={ratings_version}" alt="Ratings">
+  </a>
+  <a href="https://leetcode.com/{lc_username}/">
+    <img src="{cards_path}/leetcode.svg?v={leetcode_version}" alt="LeetCode Progress">
+  </a>
+  <br>
+  <img src="{cards_path}/distribution.svg?v={distribution_version}" alt="Platform Activity">
+  
+"""),
+    LAYOUT[-1],
+]
+
+# Layout name -> layout
+LAYOUTS = {"badges": LAYOUT, "cards": CARDS_LAYOUT}
+
+# Rendered fragments kept per compiled theme
+FRAGMENT_CACHE_SIZE = 4096
+
+def build_context(stats, profiles=None, now=None):
+    """
+    Compute the template fields of one user.
+
+    Args:
+        stats (dict): Dictionary of statistics from all platforms
+        profiles (dict): Platform profiles used for links (defaults to config.PROFILES)
+        now (datetime): Time shown as last updated (defaults to now)
+
+    Returns:
+        dict: Field name -> value
+    """
+    profiles = PROFILES if profiles is None else profiles
+
+    # Extract stats for each platform
+    cf_stats = stats.get("codeforces", {})
+    lc_stats = stats.get("leetcode", {})
+    cc_stats = stats.get("codechef", {})
+    ac_stats = stats.get("atcoder", {})
+    cses_stats = stats.get("cses", {})
+
+    # Get values with fallbacks
+    context = {
+        "cf_username": profiles.get("codeforces", {}).get("username", ""),
+        "lc_username": profiles.get("leetcode", {}).get("username", ""),
+        "cc_username": profiles.get("codechef", {}).get("username", ""),
+        "cf_rating": cf_stats.get("rating", "N/A"),
+        "cf_rank": cf_stats.get("rank", "N/A"),
+        "cf_problems": cf_stats.get("problems_solved", 0),
+        "lc_problems": lc_stats.get("problems_solved", 0),
+        "lc_easy": lc_stats.get("easy_solved", 0),
+        "lc_medium": lc_stats.get("medium_solved", 0),
+        "lc_hard": lc_stats.get("hard_solved", 0),
+        "cc_rating": cc_stats.get("rating", "N/A"),
+        "cc_rank": cc_stats.get("rank", "N/A"),
+        "cc_problems": cc_stats.get("problems_solved", 0),
+        "ac_rating": ac_stats.get("rating", "N/A"),
+        "ac_rank": ac_stats.get("rank", "N/A"),
+        "ac_problems": ac_stats.get("problems_solved", 0),
+        "cses_problems": cses_stats.get("problems_solved", 0),
+    }
+
+    # Calculate platform distribution percentages
+    total_problems = (context["cf_problems"] + context["lc_problems"] + context["cc_problems"]
+                      + context["ac_problems"] + context["cses_problems"])
+    total = max(1, total_problems)  # Avoid division by zero
+    context["total_problems"] = total_problems
+    context["cf_percent"] = round((context["cf_problems"] / total) * 100)
+    context["lc_percent"] = round((context["lc_problems"] / total) * 100)
+    context["others_percent"] = 100 - context["cf_percent"] - context["lc_percent"]
+
+    # Format last updated date, noting platforms shown from their last good stats
+    last_updated = (now or datetime.now()).strftime("%B %d, %Y")
+    stale_platforms = [platform_stats.get("platform", platform) for platform, platform_stats in stats.items()
+                       if platform_stats.get("stale")]
+    if stale_platforms:
+        last_updated += f" (cached: {', '.join(stale_platforms)})"
+    context["last_updated"] = last_updated
+
+    return context
+
+class CompiledTemplate:
+    """
+    A theme compiled into fragments, with a cache of rendered fragments.
+    """
+
+    def __init__(self, theme, layout="badges", cache_size=FRAGMENT_CACHE_SIZE):
+        """
+        Compile a theme.
+
+        Args:
+            theme (str): Theme name in THEMES
+            layout (str): Layout name in LAYOUTS
+            cache_size (int): Maximum number of rendered fragments kept
+        """
+        if theme not in THEMES:
+            raise ValueError(f"Unknown theme: {theme}")
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}")
+        self.theme = theme
+        self.layout = layout
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        # (fragment name, format string, field names)
+        self._fragments = []
+        for name, text in LAYOUTS[layout]:
+            text = string.Template(text).substitute(THEMES[theme])
+            fields = tuple(dict.fromkeys(
+                field for _, field, _, _ in string.Formatter().parse(text) if field
+            ))
+            self._fragments.append((name, text, fields))
+        # (fragment name, field values) -> rendered fragment
+        self._cache = OrderedDict()
+
+    def _render_fragment(self, name, text, fields, context):
+        key = (name,) + tuple(context[field] for field in fields)
+        with self._lock:
+            rendered = self._cache.get(key)
+            if rendered is not None:
+                self._cache.move_to_end(key)
+                return rendered
+
+        rendered = text.format_map(context) if fields else text
+        with self._lock:
+            self._cache[key] = rendered
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return rendered
+
+    def render(self, context):
+        """
+        Render one user.
+
+        Args:
+            context (dict): Fields as returned by build_context()
+
+        Returns:
+            str: Rendered Markdown
+        """
+        return "".join(self._render_fragment(name, text, fields, context)
+                       for name, text, fields in self._fragments)
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+def get_template(theme="dark", layout="badges"):
+    """
+    Get the compiled template of a theme, compiling it on first use.
+
+    Args:
+        theme (str): Theme name in THEMES
+        layout (str): Layout name in LAYOUTS
+
+    Returns:
+        CompiledTemplate: Compiled template shared by all renders of the theme
+    """
+    key = (theme, layout)
+    with _templates_lock:
+        if key not in _templates:
+            _templates[key] = CompiledTemplate(theme, layout)
+        return _templates[key]
+
+def render_markdown(stats, profiles=None, theme="dark", now=None, layout="badges", extra_fields=None):
+    """
+    Render the statistics Markdown of one user.
+
+    Args:
+        stats (dict): Dictionary of statistics from all platforms
+        profiles (dict): Platform profiles used for links (defaults to config.PROFILES)
+        theme (str): Theme name in THEMES
+        now (datetime): Time shown as last updated (defaults to now)
+        layout (str): Layout name in LAYOUTS
+        extra_fields (dict): Fields the layout needs beyond build_context(), e.g. card paths
+
+    Returns:
+        str: Rendered Markdown
+    """
+    context = build_context(stats, profiles, now)
+    if extra_fields:
+        context.update(extra_fields)
+    return get_template(theme, layout).render(context)
+
+def render_many(users, theme="dark"):
+    """
+    Render the statistics Markdown of many users with one compiled template.
+
+    Args:
+        users (dict): User id -> (stats, profiles)
+        theme (str): Theme name in THEMES
+
+    Returns:
+        dict: User id -> rendered Markdown
+    """
+    template = get_template(theme)
+    now = datetime.now()
+    return {
+        user_id: template.render(build_context(stats, profiles, now))
+        for user_id, (stats, profiles) in users.items()
+    }
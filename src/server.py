@@ -0,0 +1,352 @@
+"""
+Long-running stats server.
+Serves collected statistics over local HTTP as JSON, Markdown and SVG cards.
+Stats are kept in an in-memory LRU cache with a TTL per platform; concurrent
+requests for the same profile share one upstream fetch, and frequently read
+profiles are refreshed in the background before they expire.
+
+Routes (handles default to config.PROFILES when none are given):
+
+    GET /health
+    GET /api/<platform>/<username>                  stats of one profile (JSON)
+    GET /api/stats?codeforces=<handle>&...          stats of a user (JSON)
+    GET /markdown?codeforces=<handle>&...&theme=    README Markdown
+    GET /cards/<card>.svg?codeforces=<handle>&...   ratings, leetcode or distribution card
+
+Run from src/:
+
+    python server.py --port 8080
+"""
+
+import json
+import time
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+from dark_theme_updater import collect_platform_stats, configure_http_client
+from extractors import REGISTRY, configured_platforms, html_parser
+from renderer import THEMES, build_context, render_markdown
+from cards import render_cards
+
+# Import config
+from config import (
+    PROFILES, PROFILE_URLS, HTML_PARSER_BACKEND, MARKDOWN_THEME,
+    SERVER_HOST, SERVER_PORT, SERVER_CACHE_MAX_ENTRIES, SERVER_CACHE_TTLS, SERVER_ERROR_TTL,
+    SERVER_HOT_HITS, SERVER_REFRESH_INTERVAL, SERVER_REFRESH_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+class _CacheEntry:
+    """
+    Cached stats of one profile.
+    """
+
+    __slots__ = ("stats", "fetched_at", "expires_at", "hits")
+
+    def __init__(self, stats, ttl):
+        self.stats = stats
+        self.fetched_at = time.monotonic()
+        self.expires_at = self.fetched_at + ttl
+        self.hits = 0
+
+class StatsCache:
+    """
+    In-memory LRU cache of platform stats with per-platform TTLs and request coalescing.
+    """
+
+    def __init__(self, fetch=collect_platform_stats, max_entries=SERVER_CACHE_MAX_ENTRIES,
+                 ttls=SERVER_CACHE_TTLS, error_ttl=SERVER_ERROR_TTL):
+        """
+        Initialize an empty cache.
+
+        Args:
+            fetch (callable): fetch(platform, username) -> stats dict
+            max_entries (int): Maximum number of cached profiles
+            ttls (dict): Platform -> seconds stats are served from memory
+            error_ttl (int): Seconds failed fetches are served from memory
+        """
+        self.fetch = fetch
+        self.max_entries = max_entries
+        self.ttls = ttls
+        self.error_ttl = error_ttl
+        self._lock = threading.Lock()
+        # (platform, username) -> _CacheEntry, least recently used first
+        self._entries = OrderedDict()
+        # (platform, username) -> Future of the fetch in flight
+        self._inflight = {}
+
+    def _ttl(self, platform, stats):
+        if stats.get("status") == "Error":
+            return self.error_ttl
+        return self.ttls.get(platform, min(self.ttls.values()))
+
+    def _fetch(self, key, future):
+        try:
+            stats = self.fetch(*key)
+        except Exception as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._entries[key] = _CacheEntry(stats, self._ttl(key[0], stats))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(stats)
+
+    def get(self, platform, username):
+        """
+        Get the stats of a profile, fetching them if missing or expired.
+
+        Concurrent calls for the same profile wait for a single fetch.
+
+        Args:
+            platform (str): Platform key
+            username (str): Username on the platform
+
+        Returns:
+            dict: Statistics for the platform
+        """
+        key = (platform, username)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                entry.hits += 1
+                self._entries.move_to_end(key)
+                return entry.stats
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if owner:
+            self._fetch(key, future)
+        return future.result()
+
+    def refresh(self, platform, username):
+        """
+        Fetch the stats of a profile again unless a fetch is already in flight.
+
+        Args:
+            platform (str): Platform key
+            username (str): Username on the platform
+        """
+        key = (platform, username)
+        with self._lock:
+            if key in self._inflight:
+                return
+            future = self._inflight[key] = Future()
+        self._fetch(key, future)
+
+    def hot_keys(self, horizon, min_hits):
+        """
+        Keys read often since their last fetch that expire within the horizon.
+
+        Args:
+            horizon (float): Seconds from now
+            min_hits (int): Minimum number of reads since the last fetch
+
+        Returns:
+            list: (platform, username) keys
+        """
+        deadline = time.monotonic() + horizon
+        with self._lock:
+            return [key for key, entry in self._entries.items()
+                    if entry.hits >= min_hits and entry.expires_at <= deadline and key not in self._inflight]
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Number of cached profiles and fetches in flight
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "inflight": len(self._inflight)}
+
+class BackgroundRefresher:
+    """
+    Thread refreshing hot cache keys shortly before they expire.
+    """
+
+    def __init__(self, cache, interval=SERVER_REFRESH_INTERVAL, min_hits=SERVER_HOT_HITS,
+                 max_workers=SERVER_REFRESH_WORKERS):
+        """
+        Initialize the refresher (not started yet).
+
+        Args:
+            cache (StatsCache): Cache to refresh
+            interval (float): Seconds between scans for hot keys
+            min_hits (int): Reads since the last fetch that make a key hot
+            max_workers (int): Maximum number of concurrent refreshes
+        """
+        self.cache = cache
+        self.interval = interval
+        self.min_hits = min_hits
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            # Look two intervals ahead so keys are refreshed before the next scan misses them
+            for platform, username in self.cache.hot_keys(2 * self.interval, self.min_hits):
+                logger.info(f"Refreshing hot key {platform}/{username} in the background")
+                self._executor.submit(self.cache.refresh, platform, username)
+
+    def start(self):
+        """
+        Start scanning in a background thread.
+        """
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop scanning and drop queued refreshes.
+        """
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+def profiles_from_query(query):
+    """
+    Build a profiles dict from query parameters.
+
+    Args:
+        query (dict): Parsed query string, platform -> [handle]
+
+    Returns:
+        dict: Profiles for the given handles, or config.PROFILES if none are given
+    """
+    profiles = {
+        platform: {"username": query[platform][0], "url": PROFILE_URLS[platform].format(username=query[platform][0])}
+        for platform in REGISTRY if query.get(platform)
+    }
+    return profiles or PROFILES
+
+class _StatsHandler(BaseHTTPRequestHandler):
+    """
+    Request handler for the stats routes.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, content_type, body):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_json(self, status, data):
+        self._send(status, "application/json", json.dumps(data))
+
+    def _user_stats(self, profiles):
+        # Platforms are independent, so cache misses are fetched in parallel as in collect_stats()
+        cache = self.server.cache
+        platforms = configured_platforms(profiles)
+        with ThreadPoolExecutor(max_workers=max(1, len(platforms))) as executor:
+            futures = {platform: executor.submit(cache.get, platform, profiles[platform]["username"])
+                       for platform in platforms}
+        return {platform: future.result() for platform, future in futures.items()}
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        parts = [unquote(part) for part in parsed.path.split("/") if part]
+        theme = query.get("theme", [MARKDOWN_THEME])[0]
+
+        try:
+            if parts == ["health"]:
+                self._send_json(200, {"status": "ok", "cache": self.server.cache.stats()})
+            elif len(parts) == 3 and parts[0] == "api" and parts[1] in REGISTRY:
+                self._send_json(200, self.server.cache.get(parts[1], parts[2]))
+            elif parts == ["api", "stats"]:
+                self._send_json(200, self._user_stats(profiles_from_query(query)))
+            elif parts == ["markdown"] and theme in THEMES:
+                profiles = profiles_from_query(query)
+                self._send(200, "text/markdown; charset=utf-8",
+                           render_markdown(self._user_stats(profiles), profiles, theme))
+            elif len(parts) == 2 and parts[0] == "cards" and parts[1].endswith(".svg") and theme in THEMES:
+                profiles = profiles_from_query(query)
+                cards = render_cards(build_context(self._user_stats(profiles), profiles), theme)
+                card = parts[1][:-len(".svg")]
+                if card in cards:
+                    self._send(200, "image/svg+xml", cards[card])
+                else:
+                    self._send_json(404, {"error": f"Unknown card: {card}"})
+            else:
+                self._send_json(404, {"error": f"Not found: {parsed.path}"})
+        except Exception as e:
+            logger.error(f"Error serving {self.path}: {e}")
+            self._send_json(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+class StatsServer:
+    """
+    Threaded HTTP server in front of a StatsCache.
+    """
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, cache=None):
+        """
+        Initialize the server (not started yet).
+
+        Args:
+            host (str): Interface to bind to
+            port (int): Port to bind to (0 picks a free one)
+            cache (StatsCache): Cache to serve from (defaults to a new one)
+        """
+        self.cache = cache or StatsCache()
+        self.refresher = BackgroundRefresher(self.cache)
+        self._server = ThreadingHTTPServer((host, port), _StatsHandler)
+        self._server.daemon_threads = True
+        self._server.cache = self.cache
+
+    @property
+    def address(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        """
+        Serve requests until interrupted.
+        """
+        self.refresher.start()
+        logger.info(f"Serving stats on {self.address}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self.refresher.stop()
+            self._server.server_close()
+
+    def shutdown(self):
+        """
+        Stop serve_forever() from another thread.
+        """
+        self._server.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve competitive programming stats over local HTTP.")
+    parser.add_argument("--host", default=SERVER_HOST, help="Interface to bind to")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Port to listen on")
+    args = parser.parse_args()
+
+    configure_http_client()
+    html_parser.set_backend(HTML_PARSER_BACKEND)
+    try:
+        StatsServer(args.host, args.port).serve_forever()
+    except KeyboardInterrupt:
+        pass
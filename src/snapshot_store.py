@@ -0,0 +1,120 @@
+"""
+Last known good statistics per user and platform.
+Used to render real values instead of "N/A"/0 when a platform fails, and to
+render immediately from cache in stale-while-revalidate mode.
+"""
+
+import os
+import json
+import copy
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class SnapshotStore:
+    """
+    JSON-file store of the last successfully collected stats.
+    """
+
+    def __init__(self, path):
+        """
+        Load the store from disk (an empty store if the file does not exist).
+
+        Args:
+            path (str): Path to the JSON file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._snapshots = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable snapshot store {path}: {e}")
+
+    def get(self, user_id, platform):
+        """
+        Get the last good stats of a user on a platform.
+
+        Args:
+            user_id (str): User id
+            platform (str): Platform key
+
+        Returns:
+            dict: Copy of the stats, or None if none were stored
+        """
+        with self._lock:
+            stats = self._snapshots.get(user_id, {}).get(platform)
+            return copy.deepcopy(stats) if stats is not None else None
+
+    def get_stale(self, user_id, platforms):
+        """
+        Get the last good stats of a user on several platforms, marked as stale.
+
+        Args:
+            user_id (str): User id
+            platforms (list): Platform keys
+
+        Returns:
+            dict: Platform -> stale stats, or None if any platform has no snapshot
+        """
+        stats = {}
+        for platform in platforms:
+            snapshot = self.get(user_id, platform)
+            if snapshot is None:
+                return None
+            snapshot["stale"] = True
+            stats[platform] = snapshot
+        return stats
+
+    def update(self, user_id, stats):
+        """
+        Record the platforms that were collected successfully.
+
+        Args:
+            user_id (str): User id
+            stats (dict): Platform -> stats as returned by collect_stats()
+        """
+        with self._lock:
+            user_snapshots = self._snapshots.setdefault(user_id, {})
+            for platform, platform_stats in stats.items():
+                if platform_stats.get("status") == "Active" and not platform_stats.get("stale"):
+                    user_snapshots[platform] = copy.deepcopy(platform_stats)
+
+    def fill_failed(self, user_id, stats):
+        """
+        Replace failed platforms with their last good stats, marked as stale.
+
+        Args:
+            user_id (str): User id
+            stats (dict): Platform -> stats as returned by collect_stats()
+
+        Returns:
+            dict: Stats with failed platforms filled in where a snapshot exists
+        """
+        filled = {}
+        for platform, platform_stats in stats.items():
+            snapshot = self.get(user_id, platform) if platform_stats.get("status") == "Error" else None
+            if snapshot is not None:
+                logger.warning(f"Using last good {platform} stats for {user_id} from {snapshot.get('last_updated')}")
+                snapshot["stale"] = True
+                filled[platform] = snapshot
+            else:
+                filled[platform] = platform_stats
+        return filled
+
+    def save(self):
+        """
+        Write the store to disk atomically.
+        """
+        with self._lock:
+            data = json.dumps(self._snapshots, indent=1)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
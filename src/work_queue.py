@@ -0,0 +1,286 @@
+"""
+Resumable work queue for sharded roster runs.
+A SQLite file holds one task per roster user. Worker processes lease small
+batches of users, collect their stats and checkpoint each batch's results back
+into the queue, so a crashed or timed-out run resumes from the users still
+missing instead of starting over. Leases expire, so users held by a dead
+worker are handed out again; users that keep failing are given up after a
+number of leases. The run is finished once every user is done or given up.
+
+Workers on other machines can share the file as long as its filesystem
+supports POSIX locks (the queue uses SQLite's rollback journal, not WAL, for
+that reason); many network filesystems don't.
+
+Each run has an id (by default the UTC date); starting a run with a new id
+clears the previous run's tasks, starting it again with the same id resumes it.
+"""
+
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    user_id TEXT PRIMARY KEY,
+    shard INTEGER NOT NULL,
+    profiles TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    completed_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, shard);
+CREATE TABLE IF NOT EXISTS queue_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Task states
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+def shard_of(user_id, shards):
+    """
+    Stable shard of a user id.
+
+    Args:
+        user_id (str): Roster user id
+        shards (int): Number of shards
+
+    Returns:
+        int: Shard index in [0, shards)
+    """
+    return zlib.crc32(user_id.encode("utf-8")) % shards
+
+class WorkQueue:
+    """
+    SQLite-backed queue of roster users with expiring leases and checkpointed results.
+    """
+
+    def __init__(self, db_path):
+        """
+        Open (and create if needed) the queue.
+
+        Args:
+            db_path (str): Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        # WAL needs shared memory between the processes and does not work across machines
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Run a write transaction holding the database write lock from its start,
+        so concurrent workers never lease the same users.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _get_state(self, conn, key):
+        row = conn.execute("SELECT value FROM queue_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, conn, key, value):
+        conn.execute("INSERT OR REPLACE INTO queue_state (key, value) VALUES (?, ?)", (key, value))
+
+    def start_run(self, run_id, roster, shards):
+        """
+        Enqueue a roster for a run, resuming the run if it was started before.
+
+        Users already in the run keep their state and results; new roster
+        users are added (and reopen a finished run). A different run id
+        discards the previous run.
+
+        Args:
+            run_id (str): Run id
+            roster (dict): Mapping of user id to profiles dict
+            shards (int): Number of shards the users are spread over
+
+        Returns:
+            bool: True if an existing run is resumed, False if a new run started
+        """
+        with self._transaction() as conn:
+            resumed = self._get_state(conn, "run_id") == run_id
+            if not resumed:
+                conn.execute("DELETE FROM tasks")
+                conn.execute("DELETE FROM queue_state")
+                self._set_state(conn, "run_id", run_id)
+            added = conn.executemany(
+                "INSERT OR IGNORE INTO tasks (user_id, shard, profiles) VALUES (?, ?, ?)",
+                [(user_id, shard_of(user_id, shards), json.dumps(profiles)) for user_id, profiles in roster.items()]
+            ).rowcount
+            if added > 0:
+                conn.execute("DELETE FROM queue_state WHERE key = 'finalized_by'")
+
+        progress = self.progress()
+        action = "Resuming" if resumed else "Started"
+        logger.info(f"{action} run {run_id}: {progress[DONE]} of {progress['total']} users done")
+        return resumed
+
+    def lease(self, worker, limit, lease_seconds, shard=None, max_attempts=None):
+        """
+        Lease users that are pending or whose lease expired.
+
+        Users of the worker's own shard are handed out first; once it is
+        empty, the worker takes users of other shards.
+
+        Args:
+            worker (str): Worker id
+            limit (int): Maximum number of users to lease
+            lease_seconds (float): Seconds until the lease expires
+            shard (int): Preferred shard, if any
+            max_attempts (int): Users leased this many times without a result are marked failed
+                                instead of handed out again, if set
+
+        Returns:
+            dict: Mapping of leased user id to profiles dict (empty when nothing is left)
+        """
+        now = time.time()
+        available = "(state = ? OR (state = ? AND lease_expires < ?))"
+        params = [PENDING, LEASED, now]
+
+        with self._transaction() as conn:
+            if max_attempts is not None:
+                conn.execute(f"UPDATE tasks SET state = ?, worker = NULL, lease_expires = NULL "
+                             f"WHERE {available} AND attempts >= ?", [FAILED] + params + [max_attempts])
+            rows = conn.execute(
+                f"SELECT user_id, profiles FROM tasks WHERE {available} "
+                f"ORDER BY shard != ?, shard, user_id LIMIT ?",
+                params + [shard if shard is not None else -1, limit]
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET state = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE user_id = ?",
+                [(LEASED, worker, now + lease_seconds, user_id) for user_id, _ in rows]
+            )
+        return {user_id: json.loads(profiles) for user_id, profiles in rows}
+
+    def complete(self, worker, results):
+        """
+        Checkpoint the results of leased users.
+
+        Only users the worker still holds an unexpired lease on are updated;
+        a user whose lease expired may have been leased by another worker.
+
+        Args:
+            worker (str): Worker id
+            results (dict): Mapping of user id to per-platform statistics
+
+        Returns:
+            int: Number of users marked done
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.executemany(
+                "UPDATE tasks SET state = ?, lease_expires = NULL, result = ?, completed_at = ? "
+                "WHERE user_id = ? AND worker = ? AND state = ? AND lease_expires >= ?",
+                [(DONE, json.dumps(stats), now, user_id, worker, LEASED, now) for user_id, stats in results.items()]
+            )
+            completed = cursor.rowcount
+        if completed < len(results):
+            logger.warning(f"Worker {worker} lost the lease on {len(results) - completed} users, "
+                           f"their results were dropped")
+        return completed
+
+    def release(self, worker, user_ids):
+        """
+        Hand leased users back without results, e.g. when a worker stops early.
+
+        The lease is not counted as an attempt, so users a worker did not get
+        to are never marked failed for it.
+
+        Args:
+            worker (str): Worker id holding the leases
+            user_ids (list): User ids to release
+        """
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE tasks SET state = ?, worker = NULL, lease_expires = NULL, attempts = attempts - 1 "
+                "WHERE user_id = ? AND worker = ? AND state = ?",
+                [(PENDING, user_id, worker, LEASED) for user_id in user_ids]
+            )
+
+    def progress(self):
+        """
+        Count the users per state.
+
+        Returns:
+            dict: "pending", "leased" (unexpired leases), "expired", "done", "failed" and "total" counts
+        """
+        with self._lock:
+            return self._progress(self._conn)
+
+    def _progress(self, conn):
+        now = time.time()
+        row = conn.execute(
+            "SELECT COUNT(*), "
+            "SUM(state = ?), SUM(state = ? AND lease_expires >= ?), "
+            "SUM(state = ? AND lease_expires < ?), SUM(state = ?), SUM(state = ?) FROM tasks",
+            (PENDING, LEASED, now, LEASED, now, DONE, FAILED)
+        ).fetchone()
+        total, pending, leased, expired, done, failed = (value or 0 for value in row)
+        return {PENDING: pending, LEASED: leased, "expired": expired, DONE: done, FAILED: failed, "total": total}
+
+    def results(self):
+        """
+        Get the checkpointed results of the run.
+
+        Returns:
+            dict: Mapping of user id to per-platform statistics, for users that are done
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT user_id, result FROM tasks WHERE state = ? ORDER BY user_id", (DONE,)
+            ).fetchall()
+        return {user_id: json.loads(result) for user_id, result in rows}
+
+    def claim_finalize(self, worker):
+        """
+        Claim writing the run's outputs.
+
+        Succeeds only once the run is finished (every user done or failed),
+        and only for the first caller.
+
+        Args:
+            worker (str): Worker id
+
+        Returns:
+            bool: True if this worker should write the outputs
+        """
+        with self._transaction() as conn:
+            if self._get_state(conn, "finalized_by") is not None:
+                return False
+            progress = self._progress(conn)
+            if progress[DONE] + progress[FAILED] < progress["total"]:
+                return False
+            self._set_state(conn, "finalized_by", worker)
+            return True
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,125 @@
+"""
+Shared test setup.
+The modules live in src/ and import each other as top-level modules, as
+they do when run from there.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+# dark_theme_updater logs to ../data/ relative to the working directory; give it a scratch one
+_workdir = tempfile.mkdtemp(prefix="stats-tests-")
+os.makedirs(os.path.join(_workdir, "data"))
+os.makedirs(os.path.join(_workdir, "src"))
+os.chdir(os.path.join(_workdir, "src"))
+
+class FakeResponse:
+    """
+    Stand-in for a requests.Response serving a fixed body.
+    """
+
+    def __init__(self, text, status_code=200, chunk_size=None):
+        """
+        Initialize the response.
+
+        Args:
+            text (str): Response body
+            status_code (int): HTTP status code
+            chunk_size (int): Characters per chunk, overriding the reader's chunk size
+        """
+        self.text = text
+        self.status_code = status_code
+        self.chunk_size = chunk_size
+        self.ok = status_code < 400
+        self.headers = {}
+        self.encoding = "utf-8"
+        self.content = text.encode("utf-8")
+        self.closed = False
+        self.chunks_read = 0
+        self.raw = None
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        size = self.chunk_size or chunk_size
+        for start in range(0, len(self.text), size):
+            self.chunks_read += 1
+            yield self.text[start:start + size]
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def fake_response():
+    """
+    Factory of FakeResponse objects.
+    """
+    return FakeResponse
+
+class LocalServer:
+    """
+    HTTP/1.1 server on localhost answering every GET with respond(request).
+
+    respond() gets the request handler and returns (status, headers, body);
+    the requests seen are kept as (path, headers, client port) tuples.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests.append((self.path, dict(self.headers), self.client_address[1]))
+                status, headers, body = server.respond(self)
+                body = body.encode("utf-8")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def local_server():
+    """
+    Factory of LocalServer objects, shut down after the test.
+    """
+    servers = []
+
+    def start(respond):
+        server = LocalServer(respond)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
@@ -0,0 +1,91 @@
+"""
+Tests for batch (roster) mode.
+"""
+
+import os
+import json
+import time
+import threading
+
+import pytest
+
+import batch
+from extractors.atcoder import AtCoderExtractor
+from extractors.codechef import CodeChefExtractor
+from extractors.cses import CSESExtractor
+from extractors.leetcode import LeetCodeExtractor
+
+ROSTER = [
+    {"id": "alice", "codechef": "alice_cc", "atcoder": "alice"},
+    {"id": 7, "cses": 12345},
+    {"id": "carol/../x", "atcoder": "carol", "unknown": "ignored"},
+]
+
+@pytest.fixture
+def roster_path(tmp_path):
+    path = tmp_path / "roster.json"
+    path.write_text(json.dumps(ROSTER), encoding="utf-8")
+    return str(path)
+
+def test_load_roster_builds_profiles(roster_path):
+    roster = batch.load_roster(roster_path)
+    assert list(roster) == ["alice", "7", "carol/../x"]
+    assert roster["alice"] == {
+        "codechef": {"username": "alice_cc", "url": "https://www.codechef.com/users/alice_cc"},
+        "atcoder": {"username": "alice", "url": "https://atcoder.jp/users/alice"},
+    }
+    assert roster["7"]["cses"]["username"] == "12345"
+    assert list(roster["carol/../x"]) == ["atcoder"]
+
+def test_requests_in_flight_are_bounded(roster_path, monkeypatch):
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def get_stats(self):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return {"username": self.username, "status": "Active"}
+
+    for extractor_class in (CodeChefExtractor, AtCoderExtractor, CSESExtractor):
+        monkeypatch.setattr(extractor_class, "get_stats", get_stats)
+    roster = batch.load_roster(roster_path)
+    results = batch.collect_roster_stats(roster, max_workers=2)
+    assert peak[0] <= 2
+    assert {user_id: sorted(stats) for user_id, stats in results.items()} == {
+        "alice": ["atcoder", "codechef"], "7": ["cses"], "carol/../x": ["atcoder"]}
+    assert results["7"]["cses"] == {"username": "12345", "status": "Active"}
+
+def test_leetcode_users_are_fetched_in_batches(tmp_path, monkeypatch):
+    batches = []
+
+    def get_stats_batch(cls, usernames, batch_size=None):
+        batches.append((list(usernames), batch_size))
+        return {username: {"username": username, "status": "Active"} for username in usernames}
+
+    monkeypatch.setattr(LeetCodeExtractor, "get_stats_batch", classmethod(get_stats_batch))
+    monkeypatch.setattr(batch, "LEETCODE_BATCH_SIZE", 2)
+    path = tmp_path / "roster.json"
+    roster = [{"id": name, "leetcode": f"{name}_lc"} for name in ("a", "b", "c")]
+    path.write_text(json.dumps(roster), encoding="utf-8")
+    results = batch.collect_roster_stats(batch.load_roster(str(path)))
+    assert sorted(batches) == [(["a_lc", "b_lc"], 2), (["c_lc"], 2)]
+    assert results["c"] == {"leetcode": {"username": "c_lc", "status": "Active"}}
+
+def test_outputs_are_written_per_user(roster_path, tmp_path):
+    roster = batch.load_roster(roster_path)
+    results = {
+        user_id: {platform: {**CodeChefExtractor(profile["username"])._get_error_stats(), "status": "Active"}
+                  for platform, profile in profiles.items()}
+        for user_id, profiles in roster.items()
+    }
+    output_dir = tmp_path / "out"
+    combined_path = batch.write_outputs(roster, results, str(output_dir))
+    assert sorted(os.listdir(output_dir / "users")) == [
+        "7.json", "7.md", "alice.json", "alice.md", "carol_.._x.json", "carol_.._x.md"]
+    with open(combined_path, encoding="utf-8") as f:
+        assert json.load(f)["users"] == results
@@ -0,0 +1,48 @@
+"""
+Tests for cards.
+"""
+
+import os
+
+from cards import write_cards
+from readme_splice import content_hash
+
+STATS = {
+    "codeforces": {"platform": "Codeforces", "status": "Active", "rating": 1650, "rank": "expert",
+                   "problems_solved": 420},
+    "leetcode": {"platform": "LeetCode", "status": "Active", "rating": 300, "rank": 51234, "problems_solved": 300,
+                 "easy_solved": 150, "medium_solved": 120, "hard_solved": 30},
+    "codechef": {"platform": "CodeChef", "status": "Error", "rating": "N/A", "rank": "N/A", "problems_solved": 0},
+    "atcoder": {"platform": "AtCoder", "status": "Active", "rating": 1200, "rank": "3 Kyu", "problems_solved": 40},
+    "cses": {"platform": "CSES", "status": "Active", "rating": "N/A", "rank": "N/A", "problems_solved": 77},
+}
+
+def test_cards_are_versioned_by_content(tmp_path):
+    versions = write_cards(STATS, str(tmp_path))
+
+    assert sorted(os.listdir(tmp_path)) == ["distribution.svg", "leetcode.svg", "ratings.svg"]
+    for name in ("ratings", "leetcode", "distribution"):
+        with open(tmp_path / f"{name}.svg", encoding="utf-8") as f:
+            svg = f.read()
+        assert svg.startswith("<svg ")
+        assert versions[f"{name}_version"] == content_hash(svg)[:12]
+
+    with open(tmp_path / "leetcode.svg", encoding="utf-8") as f:
+        assert "LeetCode: 300 solved" in f.read()
+    with open(tmp_path / "distribution.svg", encoding="utf-8") as f:
+        # The failed CodeChef fetch adds nothing to the chart
+        assert "Platform Activity: 837 problems" in f.read()
+
+def test_unchanged_cards_are_not_rewritten(tmp_path):
+    versions = write_cards(STATS, str(tmp_path))
+    path = tmp_path / "ratings.svg"
+    os.utime(path, (0, 0))
+
+    assert write_cards(STATS, str(tmp_path)) == versions
+    assert os.path.getmtime(path) == 0
+
+    changed = dict(STATS, codeforces=dict(STATS["codeforces"], rating=1700))
+    new_versions = write_cards(changed, str(tmp_path))
+    assert new_versions["ratings_version"] != versions["ratings_version"]
+    assert new_versions["leetcode_version"] == versions["leetcode_version"]
+    assert os.path.getmtime(path) != 0
@@ -0,0 +1,167 @@
+"""
+Tests for extractors.codeforces against a faked Codeforces API.
+"""
+
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from extractors import codeforces
+from extractors.codeforces import CodeforcesExtractor
+from extractors.codeforces_store import CodeforcesSubmissionStore
+
+class FakeApi:
+    """
+    Codeforces API answering from canned results and logging the methods called.
+    """
+
+    def __init__(self, fake_response):
+        self.fake_response = fake_response
+        self.calls = []
+        self.users = {}
+        self.submissions = []
+        self.ratings = {}
+        self.problems = []
+
+    def get(self, url, params=None, **kwargs):
+        method = urlparse(url).path.rsplit("/", 1)[-1]
+        params = {**{key: values[0] for key, values in parse_qs(urlparse(url).query).items()}, **(params or {})}
+        self.calls.append(method)
+        if method == "user.info":
+            return self.user_info(params["handles"].split(";"))
+        if method == "user.status":
+            start = int(params["from"]) - 1
+            return self.ok(self.submissions[start:start + int(params["count"])])
+        if method == "user.rating":
+            return self.ok(self.ratings.get(params["handle"], []))
+        if method == "problemset.problems":
+            return self.ok({"problems": self.problems, "problemStatistics": []})
+        raise AssertionError(f"Unexpected call: {url}")
+
+    def ok(self, result):
+        return self.fake_response(json.dumps({"status": "OK", "result": result}))
+
+    def user_info(self, handles):
+        for handle in handles:
+            if handle.lower() not in self.users:
+                # Codeforces fails the whole call on the first unknown handle
+                return self.fake_response(json.dumps({
+                    "status": "FAILED", "comment": f"handles: User with handle {handle} not found"}), 400)
+        return self.ok([self.users[handle.lower()] for handle in handles])
+
+@pytest.fixture
+def api(fake_response, monkeypatch):
+    api = FakeApi(fake_response)
+    monkeypatch.setattr(codeforces.http_client, "get", api.get)
+    return api
+
+@pytest.fixture
+def store(tmp_path):
+    store = CodeforcesSubmissionStore(str(tmp_path / "codeforces.sqlite"))
+    yield store
+    store.close()
+
+def user(handle, rating):
+    return {"handle": handle, "rating": rating, "maxRating": rating, "rank": "expert"}
+
+def test_user_info_batch_drops_unknown_handles(api):
+    api.users = {"alice": user("Alice", 1500), "bob": user("bob", 1600)}
+    user_infos = CodeforcesExtractor.fetch_user_info_batch(["Alice", "bob", "ghost", "alice"], batch_size=2)
+    assert user_infos == {"alice": user("Alice", 1500), "bob": user("bob", 1600)}
+    # One call per chunk, plus the retry after "ghost" was dropped
+    assert api.calls == ["user.info"] * 3
+
+def test_user_info_batch_without_known_handles(api):
+    assert CodeforcesExtractor.fetch_user_info_batch(["ghost", "phantom"]) == {}
+    assert api.calls == ["user.info"] * 2
+
+def submission(submission_id, contest_id, index, verdict="OK"):
+    return {"id": submission_id, "problem": {"contestId": contest_id, "index": index}, "verdict": verdict}
+
+def test_submissions_sync_incrementally(api, store, monkeypatch):
+    monkeypatch.setattr(codeforces, "SUBMISSIONS_PAGE_SIZE", 2)
+    extractor = CodeforcesExtractor("tourist", store=store)
+    api.submissions = [submission(3, 1, "A"), submission(2, 1, "B", "WRONG_ANSWER"), submission(1, 2, "A")]
+    assert extractor._get_solved_count() == 2
+    assert store.get_last_submission_id("tourist") == 3
+
+    # Paging stops at the first submission already synced
+    api.submissions = [submission(5, 1, "C"), submission(4, 1, "A")] + api.submissions
+    api.calls.clear()
+    assert extractor._get_solved_count() == 3
+    assert api.calls == ["user.status"] * 2
+    assert store.get_last_submission_id("tourist") == 5
+
+def test_submissions_still_being_judged_are_synced_again(api, store):
+    extractor = CodeforcesExtractor("tourist", store=store)
+    api.submissions = [submission(3, 1, "A"), submission(2, 1, "B", "TESTING"), submission(1, 2, "A")]
+    assert extractor._get_solved_count() == 2
+    assert store.get_last_submission_id("tourist") == 1
+
+    api.submissions[1] = submission(2, 1, "B")
+    assert extractor._get_solved_count() == 3
+    assert store.get_last_submission_id("tourist") == 3
+
+def test_failed_sync_keeps_the_stored_count(api, store, fake_response, monkeypatch):
+    extractor = CodeforcesExtractor("tourist", store=store)
+    api.submissions = [submission(1, 1, "A")]
+    assert extractor._get_solved_count() == 1
+
+    failed = fake_response(json.dumps({"status": "FAILED", "comment": "Call limit exceeded"}))
+    monkeypatch.setattr(api, "ok", lambda result: failed)
+    assert extractor._get_solved_count() == 1
+    assert store.get_last_submission_id("tourist") == 1
+
+def rating_change(contest_id, old_rating, new_rating):
+    return {"contestId": contest_id, "ratingUpdateTimeSeconds": contest_id * 1000,
+            "oldRating": old_rating, "newRating": new_rating}
+
+def test_rating_history_is_refetched_after_a_zero_change_contest(api, store, monkeypatch):
+    extractor = CodeforcesExtractor("tourist", store=store)
+    api.ratings["tourist"] = [rating_change(1, 0, 1500)]
+    extractor._sync_rating_history({"rating": 1500})
+    assert api.calls == ["user.rating"]
+
+    # Same rating, recently fetched: the stored history is used
+    api.ratings["tourist"].append(rating_change(2, 1500, 1500))
+    extractor._sync_rating_history({"rating": 1500})
+    assert api.calls == ["user.rating"]
+
+    later = store.get_rating_fetched_at("tourist") + codeforces.RATING_REFRESH_INTERVAL
+    monkeypatch.setattr(codeforces.time, "time", lambda: later)
+    extractor._sync_rating_history({"rating": 1500})
+    assert api.calls == ["user.rating", "user.rating"]
+    assert len(store.get_rating_histories(["tourist"])["tourist"]) == 2
+
+def problem(contest_id, index, rating=None, tags=()):
+    return {"contestId": contest_id, "index": index, "rating": rating, "tags": list(tags)}
+
+def test_solved_breakdown_joins_the_problemset_index(store):
+    store.replace_problemset([problem(1, "A", 800, ["math", "greedy"]), problem(1, "B", 1200, ["dp"]),
+                              problem(2, "A", 800, ["math"]), problem(3, "C")])
+    store.record_sync("Tourist", 10, [(1, "A"), (2, "A"), (3, "C"), (99, "Z")])
+    assert store.solved_breakdown("tourist") == ({"math": 2, "greedy": 1}, {800: 2})
+
+    # Refreshed ratings and tags replace the old ones
+    store.replace_problemset([problem(1, "A", 900, ["greedy"]), problem(2, "A", 800, ["math"])])
+    assert store.solved_breakdown("tourist") == ({"greedy": 1, "math": 1}, {800: 1, 900: 1})
+
+def test_problemset_is_downloaded_once_per_refresh_interval(api, store, monkeypatch):
+    api.problems = [problem(1, "A", 800, ["math"])]
+    assert CodeforcesExtractor.refresh_problemset(store)
+    assert not CodeforcesExtractor.refresh_problemset(store)
+    assert api.calls == ["problemset.problems"]
+
+    later = store.get_problemset_fetched_at() + codeforces.PROBLEMSET_REFRESH_INTERVAL
+    monkeypatch.setattr(codeforces.time, "time", lambda: later)
+    assert CodeforcesExtractor.refresh_problemset(store)
+    assert api.calls == ["problemset.problems"] * 2
+
+@pytest.mark.parametrize("index", ["A", "F2", "B12", "ABCD", "A1B2", "Б", ""])
+def test_pack_problem_round_trips(index):
+    assert codeforces.unpack_problem(codeforces.pack_problem(1234, index)) == (1234, index)
+
+def test_pack_problem_keys_are_distinct():
+    indexes = ["A", "A1", "A12", "A123", "A1234", "Б", "Бa"]
+    assert len({codeforces.pack_problem(1, index) for index in indexes}) == len(indexes)
@@ -0,0 +1,76 @@
+"""
+Tests for dark_theme_updater.collect_stats.
+"""
+
+import time
+import threading
+
+import pytest
+
+import dark_theme_updater
+from extractors.atcoder import AtCoderExtractor
+from extractors.codechef import CodeChefExtractor
+from extractors.cses import CSESExtractor
+from extractors.deadline import Deadline
+
+PROFILES = {
+    "codechef": {"username": "chef"},
+    "atcoder": {"username": "coder"},
+    "cses": {"username": "123"},
+}
+
+@pytest.fixture
+def profiles(monkeypatch):
+    monkeypatch.setattr(dark_theme_updater, "PROFILES", PROFILES)
+    return PROFILES
+
+def fake_get_stats(barrier=None):
+    def get_stats(self):
+        if barrier is not None:
+            barrier.wait()
+        return {"username": self.username, "status": "Active"}
+    return get_stats
+
+def patch_extractors(monkeypatch, get_stats):
+    for extractor_class in (CodeChefExtractor, AtCoderExtractor, CSESExtractor):
+        monkeypatch.setattr(extractor_class, "get_stats", get_stats)
+
+def test_platforms_are_collected_concurrently(profiles, monkeypatch):
+    # Every extractor must be running at once to get past the barrier
+    patch_extractors(monkeypatch, fake_get_stats(threading.Barrier(len(profiles), timeout=5)))
+    stats = dark_theme_updater.collect_stats()
+    assert list(stats) == ["codechef", "atcoder", "cses"]
+    assert {platform: platform_stats["status"] for platform, platform_stats in stats.items()} == {
+        "codechef": "Active", "atcoder": "Active", "cses": "Active"}
+
+def test_sequential_collection_gives_the_same_stats(profiles, monkeypatch):
+    patch_extractors(monkeypatch, fake_get_stats())
+    assert dark_theme_updater.collect_stats(concurrent=False) == dark_theme_updater.collect_stats()
+
+def test_failed_platform_gets_error_stats(profiles, monkeypatch):
+    patch_extractors(monkeypatch, fake_get_stats())
+
+    def fail(self):
+        raise RuntimeError("down")
+    monkeypatch.setattr(AtCoderExtractor, "get_stats", fail)
+    stats = dark_theme_updater.collect_stats()
+    assert stats["atcoder"]["status"] == "Error"
+    assert stats["atcoder"]["username"] == "coder"
+    assert stats["cses"]["status"] == "Active"
+
+def test_platforms_unfinished_at_the_deadline_get_error_stats(profiles, monkeypatch):
+    patch_extractors(monkeypatch, fake_get_stats())
+    release = threading.Event()
+
+    def hang(self):
+        release.wait(5)
+        return {"username": self.username, "status": "Active"}
+    monkeypatch.setattr(CSESExtractor, "get_stats", hang)
+    start = time.monotonic()
+    try:
+        stats = dark_theme_updater.collect_stats(deadline=Deadline(0.2))
+    finally:
+        release.set()
+    assert time.monotonic() - start < 2
+    assert list(stats) == ["codechef", "atcoder", "cses"]
+    assert (stats["codechef"]["status"], stats["cses"]["status"]) == ("Active", "Error")
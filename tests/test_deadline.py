@@ -0,0 +1,47 @@
+"""
+Tests for extractors.deadline.
+"""
+
+import threading
+
+import pytest
+
+from extractors.deadline import (
+    Deadline, DeadlineExceeded, check_current, current_deadline, run_with_deadline, use_deadline,
+)
+
+def test_timeouts_are_capped_by_the_time_left():
+    deadline = Deadline(2)
+    connect, read = deadline.timeout((5, 30))
+    assert 1.5 < connect <= 2
+    assert 1.5 < read <= 2
+    assert deadline.timeout(0.5) == (0.5, 0.5)
+
+def test_spent_budget_raises():
+    deadline = Deadline(0)
+    assert deadline.expired()
+    with pytest.raises(DeadlineExceeded):
+        deadline.check()
+    with pytest.raises(DeadlineExceeded):
+        deadline.timeout((5, 30))
+
+def test_deadline_is_current_only_inside_the_block():
+    deadline = Deadline(60)
+    assert current_deadline() is None
+    with use_deadline(deadline):
+        assert current_deadline() is deadline
+        with use_deadline(None):
+            check_current()
+        deadline.expires_at = 0
+        with pytest.raises(DeadlineExceeded):
+            check_current()
+    assert current_deadline() is None
+    check_current()
+
+def test_worker_threads_get_the_deadline_passed_to_them():
+    deadline = Deadline(60)
+    seen = []
+    thread = threading.Thread(target=run_with_deadline, args=(deadline, lambda: seen.append(current_deadline())))
+    thread.start()
+    thread.join()
+    assert seen == [deadline]
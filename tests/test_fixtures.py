@@ -0,0 +1,102 @@
+"""
+Tests for benchmarks.fixtures: extractors running against replayed responses.
+"""
+
+import json
+
+import pytest
+
+import dark_theme_updater
+from benchmarks import fixtures as replay
+from extractors import http_client
+from extractors.codeforces import CodeforcesExtractor
+from extractors.codeforces_store import CodeforcesSubmissionStore
+from extractors.cses import CSESExtractor
+from extractors.http_client import HttpClient
+from extractors.leetcode import LeetCodeExtractor
+
+def fixture(body, content_type="application/json"):
+    return {"status": 200, "headers": {"Content-Type": content_type},
+            "body": body if isinstance(body, str) else json.dumps(body)}
+
+def submission(submission_id, contest_id, index, verdict="OK"):
+    return {"id": submission_id, "problem": {"contestId": contest_id, "index": index}, "verdict": verdict}
+
+FIXTURES = {
+    "codeforces_user_info": fixture({"status": "OK", "result": [
+        {"handle": "recorded", "rating": 1700, "maxRating": 1800, "rank": "expert"}]}),
+    "codeforces_user_status": fixture({"status": "OK", "result": [
+        submission(4, 1, "A"), submission(3, 1, "A"), submission(2, 2, "B", "WRONG_ANSWER"),
+        submission(1, 3, "C"),
+    ]}),
+    "leetcode_graphql": fixture({"data": {"matchedUser": {
+        "username": "recorded",
+        "submitStats": {"acSubmissionNum": [{"difficulty": "All", "count": 42, "submissions": 84}]},
+        "profile": {"ranking": 5000, "reputation": 0, "starRating": 2},
+    }}}),
+    "cses_profile": fixture("<div class=\"content\"><p>Solved tasks: 77</p></div>", "text/html"),
+}
+
+@pytest.fixture
+def replayed(monkeypatch):
+    client = HttpClient()
+    replay.install_adapter(client, replay.ReplayAdapter(FIXTURES))
+    monkeypatch.setattr(http_client, "_client", client)
+    yield client
+    client.close()
+
+@pytest.fixture
+def store(tmp_path):
+    store = CodeforcesSubmissionStore(str(tmp_path / "codeforces.sqlite"))
+    yield store
+    store.close()
+
+def test_codeforces_replays_for_any_handle(replayed, store):
+    stats = CodeforcesExtractor("anyone", store=store).get_stats()
+    assert (stats["status"], stats["username"]) == ("Active", "anyone")
+    assert (stats["rating"], stats["max_rating"], stats["problems_solved"]) == (1700, 1800, 2)
+
+def test_user_info_is_expanded_to_every_handle(replayed):
+    user_infos = CodeforcesExtractor.fetch_user_info_batch(["a", "b", "c"])
+    assert {handle: user_info["rating"] for handle, user_info in user_infos.items()} == dict.fromkeys("abc", 1700)
+
+def test_user_status_is_paged_like_the_api():
+    url = "https://codeforces.com/api/user.status?handle=x&from=2&count=2"
+    status, _, body = replay.respond(FIXTURES, "GET", url)
+    assert status == 200
+    assert [item["id"] for item in json.loads(body)["result"]] == [3, 2]
+
+def test_aliased_leetcode_queries_get_every_user(replayed):
+    stats = LeetCodeExtractor.get_stats_batch(["alice", "bob"])
+    assert {username: user_stats["problems_solved"] for username, user_stats in stats.items()} == {
+        "alice": 42, "bob": 42}
+    assert LeetCodeExtractor("carol").get_stats()["username"] == "carol"
+
+def test_scraped_pages_replay(replayed):
+    assert CSESExtractor("123").get_stats()["problems_solved"] == 77
+
+def test_requests_without_a_fixture_get_404():
+    assert replay.respond(FIXTURES, "GET", "https://atcoder.jp/users/alice")[0] == 404
+    assert replay.respond(FIXTURES, "GET", "https://example.com/")[0] == 404
+
+def test_fixtures_round_trip_through_a_directory(tmp_path, fake_response):
+    response = fake_response(FIXTURES["cses_profile"]["body"])
+    response.headers = {"Content-Type": "text/html", "Set-Cookie": "session=secret"}
+    replay.save_fixture(str(tmp_path), "cses_profile", response)
+    assert replay.load_fixtures(str(tmp_path)) == {"cses_profile": FIXTURES["cses_profile"]}
+
+def test_recording_uses_an_empty_codeforces_store(tmp_path, monkeypatch):
+    persistent = CodeforcesSubmissionStore(str(tmp_path / "persistent.sqlite"))
+    persistent.record_sync("tourist", 100, [(1, "A")])
+    monkeypatch.setattr(dark_theme_updater, "_codeforces_store", persistent)
+    monkeypatch.setattr(http_client, "_client", None)
+    seen = []
+    monkeypatch.setattr(dark_theme_updater, "collect_stats", lambda: seen.append(
+        dark_theme_updater.get_codeforces_store().get_last_submission_id("tourist")))
+    try:
+        replay.record(str(tmp_path / "fixtures"))
+        assert seen == [None]
+        assert dark_theme_updater.get_codeforces_store() is persistent
+    finally:
+        http_client.get_client().close()
+        persistent.close()
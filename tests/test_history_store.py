@@ -0,0 +1,52 @@
+"""
+Tests for history_store.HistoryStore.
+"""
+
+import pytest
+
+from history_store import HistoryStore
+
+@pytest.fixture
+def history(tmp_path):
+    history = HistoryStore(str(tmp_path / "history.sqlite"))
+    yield history
+    history.close()
+
+def stats(rating, problems_solved=10, status="Active"):
+    return {"codeforces": {"platform": "Codeforces", "status": status, "rating": rating,
+                           "problems_solved": problems_solved, "rank": "expert", "contests": 3}}
+
+def test_only_active_stats_are_appended(history):
+    assert history.append({"alice": stats(1500), "bob": stats(0, status="Error")}, ts=100) == 1
+    assert history.range("alice", "codeforces") == [
+        {"ts": 100, "rating": 1500, "max_rating": None, "problems_solved": 10, "rank": "expert", "contests": 3}
+    ]
+    assert history.range("bob", "codeforces") == []
+
+def test_points_are_never_overwritten(history):
+    history.append({"alice": stats(1500)}, ts=100)
+    assert history.append({"alice": stats(1600)}, ts=100) == 0
+    assert [point["rating"] for point in history.range("alice", "codeforces")] == [1500]
+
+def test_range_bounds_are_inclusive(history):
+    for ts in (100, 200, 300):
+        history.append({"alice": stats(ts)}, ts=ts)
+    assert [point["ts"] for point in history.range("alice", "codeforces", 200, 300)] == [200, 300]
+
+def test_delta_from_the_last_point_before_since(history):
+    for ts, rating in ((100, 1400), (200, 1500), (300, 1450), (400, 1600)):
+        history.append({"alice": stats(rating)}, ts=ts)
+    assert history.delta("alice", "codeforces", "rating", 250) == 1600 - 1500
+    assert history.delta("alice", "codeforces", "rating", 50) == 1600 - 1400
+
+def test_delta_needs_two_points(history):
+    assert history.delta("alice", "codeforces", "rating", 0) is None
+    history.append({"alice": stats(1500)}, ts=100)
+    assert history.delta("alice", "codeforces", "rating", 50) is None
+    assert history.delta("alice", "codeforces", "rating", 150) is None
+    history.append({"alice": stats(1550)}, ts=200)
+    assert history.delta("alice", "codeforces", "rating", 50) == 50
+
+def test_delta_rejects_other_fields(history):
+    with pytest.raises(ValueError):
+        history.delta("alice", "codeforces", "rank", 0)
@@ -0,0 +1,89 @@
+"""
+Tests for extractors.html_parser and the scraping extractors' parsing on every backend.
+"""
+
+import pytest
+
+from extractors import html_parser
+from extractors.atcoder import AtCoderExtractor
+from extractors.codechef import CodeChefExtractor
+from extractors.cses import CSESExtractor
+from extractors.html_parser import ParseOnly
+
+ATCODER_PAGE = """
+<html><body><div id="main">
+<table class="dl-table mt-2">
+<tr><th>Rank</th><td>1234th</td></tr>
+<tr><th>Rating</th><td><span class="user-blue">1650</span> (Provisional)</td></tr>
+<tr><th>Class</th><td>2 Dan</td></tr>
+</table>
+<a href="/users/alice/history">Competition History</a>
+<a href="/submissions?f.Status=AC&amp;f.User=alice">Accepted (321)</a>
+</div></body></html>
+"""
+
+CODECHEF_PAGE = """
+<html><body>
+<div class="rating-header"><div class="rating-number">1823</div></div>
+<span class="rating-star">3&#9733;</span>
+<section class="problems-solved"><h3>Solved</h3><p>START1, START2, LTIME3</p></section>
+</body></html>
+"""
+
+CSES_PAGE = """
+<html><body><div class="nav">Home</div>
+<div class="content"><h1>User alice</h1>
+<p>Solved tasks: 150</p>
+</div></body></html>
+"""
+
+def without_time(stats):
+    return {key: value for key, value in stats.items() if key != "last_updated"}
+
+@pytest.fixture(params=html_parser.available_backends())
+def backend(request, monkeypatch):
+    monkeypatch.setattr(html_parser, "_backend", None)
+    return html_parser.set_backend(request.param)
+
+def test_html_parser_is_always_available():
+    assert "html.parser" in html_parser.available_backends()
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        html_parser.set_backend("regex")
+
+def test_parse_only_needs_names_or_classes():
+    with pytest.raises(ValueError):
+        ParseOnly()
+    with pytest.raises(ValueError):
+        ParseOnly(names=["a"], classes=["b"])
+
+def test_documents_support_the_soup_api(backend):
+    soup = html_parser.parse_html(ATCODER_PAGE, ParseOnly(names=["table", "a"]))
+    cells = [row.select("td")[0].text for row in soup.select("table.dl-table tr")]
+    assert cells == ["1234th", "1650 (Provisional)", "2 Dan"]
+    link = soup.select_one("a[href*='/submissions']")
+    assert link.text == "Accepted (321)"
+    assert link.get("href") == "/submissions?f.Status=AC&f.User=alice"
+    assert soup.select_one("div.missing") is None
+
+def test_atcoder_stats(backend):
+    assert without_time(AtCoderExtractor("alice").parse_stats(ATCODER_PAGE)) == {
+        "platform": "AtCoder", "username": "alice", "status": "Active", "rating": 1650,
+        "max_rating": "N/A", "rank": "2 Dan", "problems_solved": 321}
+
+def test_codechef_stats(backend):
+    assert without_time(CodeChefExtractor("alice").parse_stats(CODECHEF_PAGE)) == {
+        "platform": "CodeChef", "username": "alice", "status": "Active", "rating": 1823,
+        "max_rating": "N/A", "rank": "3★", "problems_solved": 3}
+
+def test_cses_stats(backend):
+    assert without_time(CSESExtractor("123").parse_stats(CSES_PAGE)) == {
+        "platform": "CSES", "username": "123", "status": "Active", "rating": "N/A",
+        "max_rating": "N/A", "rank": "N/A", "problems_solved": 150}
+
+def test_cses_count_in_a_separate_table_cell(backend):
+    page = ('<html><body><div class="content"><h1>User alice</h1><table>'
+            '<tr>\n<td>Solved tasks:</td>\n<td><a href="/problemset/user/1/">123</a></td>\n</tr>'
+            '</table></div></body></html>')
+    assert CSESExtractor("alice").parse_stats(page)["problems_solved"] == 123
@@ -0,0 +1,91 @@
+"""
+Tests for extractors.html_stream.
+"""
+
+import pytest
+
+from extractors import html_stream
+from extractors.deadline import Deadline, DeadlineExceeded, use_deadline
+from extractors.html_stream import ElementTarget, StopAfter, TextTarget
+
+FILLER = "<div class=\"nav\"><a href=\"/x\">link</a></div>" * 200
+
+SOLVED_TEXT = TextTarget(r"Solved tasks:\s*\d+", hint="Solved tasks")
+SOLVED = StopAfter(SOLVED_TEXT)
+
+def feed(stop_after, page, size):
+    watcher = stop_after.watcher()
+    for start in range(0, len(page), size):
+        if watcher.feed_chunk(page[start:start + size]):
+            return start + size
+    return None
+
+@pytest.fixture(autouse=True)
+def no_metrics(monkeypatch):
+    monkeypatch.setattr(html_stream.metrics, "count_response_bytes", lambda response: None)
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 4096])
+def test_text_target_in_one_text_run(size):
+    page = f"<html><body>{FILLER}<p>Solved tasks: 150</p>{FILLER}</body></html>"
+    stopped_at = feed(SOLVED, page, size)
+    assert stopped_at is not None
+    assert "Solved tasks: 150" in page[:stopped_at]
+    assert stopped_at < len(page)
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 4096])
+def test_text_target_across_table_cells(size):
+    page = f"<table><tr><td>Solved tasks:</td><td><a href=\"/p\">123</a></td></tr></table>{FILLER}"
+    stopped_at = feed(SOLVED, page, size)
+    assert stopped_at is not None
+    assert "123</a>" in page[:stopped_at]
+
+def test_text_target_waits_for_the_whole_number():
+    watcher = SOLVED.watcher()
+    assert not watcher.feed_chunk("<p>Solved tasks: 1")
+    assert not watcher.feed_chunk("23")
+    assert watcher.feed_chunk("</p>")
+
+def test_element_target_is_seen_once_closed():
+    stop_after = StopAfter(ElementTarget("table", classes=["dl-table"], text="Rating"))
+    watcher = stop_after.watcher()
+    assert not watcher.feed_chunk(f"{FILLER}<table class=\"dl-table mt-2\"><tr><th>Rating</th>")
+    assert not watcher.feed_chunk("<td>1500</td></tr>")
+    assert watcher.feed_chunk("</table>")
+
+def test_element_target_without_its_text_is_not_seen():
+    stop_after = StopAfter(ElementTarget("table", classes=["dl-table"], text="Rating"))
+    page = "<table class=\"dl-table\"><tr><td>Rank</td></tr></table>"
+    assert feed(stop_after, page, 5) is None
+
+def test_all_targets_must_be_seen():
+    stop_after = StopAfter(ElementTarget("a", href="/submissions?f.Status=AC"), SOLVED_TEXT)
+    watcher = stop_after.watcher()
+    assert not watcher.feed_chunk("<p>Solved tasks: 5</p>")
+    assert watcher.feed_chunk("<a href=\"/submissions?f.Status=AC\">12</a>")
+
+def test_stop_after_needs_a_target():
+    with pytest.raises(ValueError):
+        StopAfter()
+
+def test_read_until_stops_early(fake_response):
+    page = f"<p>Solved tasks: 150</p>{FILLER}"
+    response = fake_response(page, chunk_size=64)
+    text, partial = html_stream.read_until(response, SOLVED)
+    assert partial
+    assert "Solved tasks: 150" in text
+    assert len(text) < len(page)
+    assert response.closed
+
+def test_read_until_reads_whole_page_without_a_match(fake_response):
+    page = f"<p>No tasks</p>{FILLER}"
+    response = fake_response(page, chunk_size=64)
+    assert html_stream.read_until(response, SOLVED) == (page, False)
+    assert response.closed
+
+def test_read_until_stops_at_deadline(fake_response):
+    response = fake_response(FILLER, chunk_size=64)
+    with use_deadline(Deadline(0)):
+        with pytest.raises(DeadlineExceeded):
+            html_stream.read_until(response, SOLVED)
+    assert response.closed
+    assert response.chunks_read == 1
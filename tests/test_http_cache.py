@@ -0,0 +1,110 @@
+"""
+Tests for extractors.http_cache and cached GETs through the HTTP client.
+"""
+
+import os
+
+import pytest
+
+from extractors.http_cache import HttpCache
+from extractors.http_client import HttpClient
+from extractors.html_stream import StopAfter, TextTarget
+
+SOLVED = StopAfter(TextTarget(r"Solved tasks:\s*\d+", hint="Solved tasks"))
+
+class Page:
+    """
+    Page served with an ETag, answering 304 to requests that already have it.
+    """
+
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+
+    def __call__(self, request):
+        if request.headers.get("If-None-Match") == self.etag:
+            return 304, {"ETag": self.etag}, ""
+        return 200, {"ETag": self.etag, "Content-Type": "text/html"}, self.body
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(str(tmp_path / "cache"))
+
+@pytest.fixture
+def client(cache):
+    client = HttpClient(cache=cache)
+    yield client
+    client.close()
+
+def test_unchanged_page_is_revalidated_with_its_parsed_stats(local_server, client):
+    page = Page("<p>Solved: 5</p>", '"v1"')
+    server = local_server(page)
+    response = client.get_cached(server.url)
+    assert (response.status_code, response.from_cache, response.parsed) == (200, False, None)
+    response.store_parsed({"problems_solved": 5})
+
+    response = client.get_cached(server.url)
+    assert (response.status_code, response.from_cache) == (304, True)
+    assert response.text == page.body
+    assert response.parsed == {"problems_solved": 5}
+    assert server.requests[1][1]["If-None-Match"] == '"v1"'
+
+def test_changed_page_drops_the_parsed_stats(local_server, client):
+    page = Page("<p>Solved: 5</p>", '"v1"')
+    server = local_server(page)
+    client.get_cached(server.url).store_parsed({"problems_solved": 5})
+
+    page.body, page.etag = "<p>Solved: 6</p>", '"v2"'
+    response = client.get_cached(server.url)
+    assert (response.status_code, response.from_cache, response.parsed) == (200, False, None)
+    assert response.text == page.body
+
+def test_parsed_stats_go_to_a_sidecar(cache, tmp_path):
+    cache.put("https://example.com/u", "<p>body</p>", etag='"v1"')
+    body_path = cache._body_path(cache._key("https://example.com/u"))
+    os.utime(body_path, (0, 0))
+    cache.set_parsed("https://example.com/u", {"rating": 1500})
+    assert os.stat(body_path).st_mtime == 0
+
+    reopened = HttpCache(str(tmp_path / "cache"))
+    entry = reopened.get("https://example.com/u")
+    assert (entry.body, entry.etag, entry.parsed) == ("<p>body</p>", '"v1"', {"rating": 1500})
+
+def test_pages_without_validators_are_fresh_within_the_ttl(local_server, tmp_path):
+    server = local_server(lambda request: (200, {}, "no validators"))
+    for ttl, requests_made in ((60, 1), (0, 2)):
+        client = HttpClient(cache=HttpCache(str(tmp_path / f"cache{ttl}"), default_ttl=ttl))
+        try:
+            server.requests.clear()
+            assert client.get_cached(server.url).text == "no validators"
+            assert client.get_cached(server.url).text == "no validators"
+            assert len(server.requests) == requests_made
+        finally:
+            client.close()
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"), max_bytes=600)
+    for name in ("a", "b"):
+        cache.put(f"https://example.com/{name}", name * 100, etag='"v"')
+    cache.get("https://example.com/a")
+    cache.put("https://example.com/c", "c" * 100, etag='"v"')
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/a") is not None
+    assert cache.get("https://example.com/c") is not None
+
+def test_partial_body_is_only_reused_by_early_stopping_callers(local_server, client):
+    page = Page("<p>Solved tasks: 150</p>" + "<div>filler</div>" * 2000, '"v1"')
+    server = local_server(page)
+    response = client.get_cached(server.url, stop_after=SOLVED)
+    assert response.partial
+    assert "Solved tasks: 150" in response.text
+    assert len(response.text) < len(page.body)
+
+    response = client.get_cached(server.url, stop_after=SOLVED)
+    assert (response.status_code, response.partial) == (304, True)
+
+    # A caller needing the whole page downloads it again
+    response = client.get_cached(server.url)
+    assert (response.status_code, response.from_cache, response.partial) == (200, False, False)
+    assert response.text == page.body
+    assert "If-None-Match" not in server.requests[2][1]
@@ -0,0 +1,85 @@
+"""
+Tests for extractors.http_client against a local server.
+"""
+
+import pytest
+
+from extractors import http_client
+from extractors.deadline import Deadline, DeadlineExceeded, use_deadline
+from extractors.http_client import HttpClient
+
+def ok(request):
+    return 200, {"Content-Type": "text/plain"}, f"path {request.path}"
+
+def test_requests_reuse_pooled_connections(local_server):
+    server = local_server(ok)
+    client = HttpClient(pool_connections=1, pool_maxsize=1)
+    try:
+        for path in ("/a", "/b", "/c"):
+            assert client.request("GET", f"{server.url}{path}").text == f"path {path}"
+    finally:
+        client.close()
+    assert [path for path, _, _ in server.requests] == ["/a", "/b", "/c"]
+    # Every request came in over the same kept-alive connection
+    assert len({port for _, _, port in server.requests}) == 1
+
+def test_compression_is_negotiated(local_server):
+    server = local_server(ok)
+    client = HttpClient()
+    try:
+        client.request("GET", server.url)
+    finally:
+        client.close()
+    assert "gzip" in server.requests[0][1]["Accept-Encoding"]
+
+def test_configure_replaces_the_shared_client(local_server, monkeypatch):
+    monkeypatch.setattr(http_client, "_client", None)
+    server = local_server(ok)
+    client = http_client.configure(pool_maxsize=2, timeout=(1, 1))
+    try:
+        assert http_client.get_client() is client
+        assert client.timeout == (1, 1)
+        assert http_client.get(f"{server.url}/x").text == "path /x"
+    finally:
+        client.close()
+
+def test_rate_limited_responses_are_retried(local_server):
+    answers = [429, 503, 200]
+    server = local_server(lambda request: (answers.pop(0), {"Retry-After": "0"}, "body"))
+    client = HttpClient(max_retries=2)
+    try:
+        response = client.request("GET", server.url)
+    finally:
+        client.close()
+    assert response.status_code == 200
+    assert len(server.requests) == 3
+
+def test_retries_stop_after_max_retries(local_server):
+    server = local_server(lambda request: (503, {"Retry-After": "0"}, "busy"))
+    client = HttpClient(max_retries=1)
+    try:
+        assert client.request("GET", server.url).status_code == 503
+    finally:
+        client.close()
+    assert len(server.requests) == 2
+
+def test_no_request_is_sent_after_the_deadline(local_server):
+    server = local_server(ok)
+    client = HttpClient()
+    try:
+        with use_deadline(Deadline(0)):
+            with pytest.raises(DeadlineExceeded):
+                client.request("GET", server.url)
+    finally:
+        client.close()
+    assert server.requests == []
+
+def test_retry_is_skipped_when_it_would_end_after_the_deadline(local_server):
+    server = local_server(lambda request: (429, {"Retry-After": "30"}, "slow down"))
+    client = HttpClient(max_retries=3)
+    try:
+        with use_deadline(Deadline(5)):
+            assert client.request("GET", server.url).status_code == 429
+    finally:
+        client.close()
+    assert len(server.requests) == 1
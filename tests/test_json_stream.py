@@ -0,0 +1,83 @@
+"""
+Tests for extractors.json_stream.
+"""
+
+import json
+import random
+
+import pytest
+
+from extractors import json_stream
+from extractors.deadline import Deadline, DeadlineExceeded, use_deadline
+
+DOCUMENT = {
+    "status": "OK",
+    "result": [12345, 678, -1.5e10, True, None, False, "a, b]", {"id": 1, "tags": ["dp", "math"]}, [3, 44], 0],
+}
+
+def split(text, cuts):
+    bounds = [0] + sorted(cuts) + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+@pytest.mark.parametrize("size", range(1, 12))
+def test_items_survive_every_chunk_size(size):
+    text = json.dumps(DOCUMENT)
+    chunks = [text[start:start + size] for start in range(0, len(text), size)]
+    header = {}
+    assert list(json_stream.iter_array(chunks, "result", header)) == DOCUMENT["result"]
+    assert header == {"status": "OK"}
+
+def test_items_survive_random_chunk_boundaries():
+    text = json.dumps(DOCUMENT)
+    generator = random.Random(0)
+    for _ in range(500):
+        cuts = generator.sample(range(1, len(text)), generator.randint(1, 25))
+        assert list(json_stream.iter_array(split(text, cuts), "result")) == DOCUMENT["result"]
+
+def test_numbers_are_not_split_at_chunk_boundaries():
+    chunks = ['{"result": [12', '345, 67', '8]}']
+    assert list(json_stream.iter_array(chunks, "result")) == [12345, 678]
+
+def test_number_cut_before_its_fraction():
+    chunks = ['{"result": [1', '.', '25, 2]}']
+    assert list(json_stream.iter_array(chunks, "result")) == [1.25, 2]
+
+def test_document_without_the_array_fills_the_header():
+    header = {}
+    chunks = ['{"status": "FAILED", ', '"comment": "handle not found"}']
+    assert list(json_stream.iter_array(chunks, "result", header)) == []
+    assert header == {"status": "FAILED", "comment": "handle not found"}
+
+def test_empty_array():
+    assert list(json_stream.iter_array(['{"status": "OK", "result": [', ']}'], "result")) == []
+
+def test_response_is_closed_when_consumer_stops_early(fake_response, monkeypatch):
+    monkeypatch.setattr(json_stream.metrics, "count_response_bytes", lambda response: None)
+    response = fake_response(json.dumps({"result": list(range(1000))}), chunk_size=16)
+    items = json_stream.iter_response_array(response, "result")
+    assert next(items) == 0
+    items.close()
+    assert response.closed
+    assert response.chunks_read < 10
+
+def test_response_read_stops_at_deadline(fake_response, monkeypatch):
+    monkeypatch.setattr(json_stream.metrics, "count_response_bytes", lambda response: None)
+    response = fake_response(json.dumps({"result": list(range(1000))}), chunk_size=16)
+    deadline = Deadline(60)
+    with use_deadline(deadline):
+        items = json_stream.iter_response_array(response, "result")
+        assert next(items) == 0
+        deadline.expires_at = 0
+        with pytest.raises(DeadlineExceeded):
+            list(items)
+    assert response.closed
+
+def test_streamed_body_is_counted_and_timed_once(fake_response, monkeypatch):
+    counted = []
+    recorded = []
+    monkeypatch.setattr(json_stream.metrics, "count_response_bytes", counted.append)
+    monkeypatch.setattr(json_stream.metrics, "record", lambda stage, seconds: recorded.append(stage))
+    response = fake_response(json.dumps({"result": list(range(100))}), chunk_size=16)
+    assert list(json_stream.iter_response_array(response, "result")) == list(range(100))
+    assert counted == [response]
+    assert recorded == ["download"]
@@ -0,0 +1,81 @@
+"""
+Tests for extractors.leetcode against a faked GraphQL endpoint.
+"""
+
+import re
+import json
+
+import pytest
+
+from extractors import leetcode
+from extractors.leetcode import LeetCodeExtractor
+
+def user_data(username, easy, medium, hard, submissions):
+    solved = easy + medium + hard
+    return {
+        "username": username,
+        "submitStats": {"acSubmissionNum": [
+            {"difficulty": "All", "count": solved, "submissions": submissions},
+            {"difficulty": "Easy", "count": easy, "submissions": easy},
+            {"difficulty": "Medium", "count": medium, "submissions": medium},
+            {"difficulty": "Hard", "count": hard, "submissions": hard},
+        ]},
+        "profile": {"ranking": 1000, "reputation": 0, "starRating": 3},
+    }
+
+class FakeGraphQL:
+    """
+    GraphQL endpoint resolving matchedUser aliases from canned users.
+    """
+
+    def __init__(self, fake_response, users):
+        self.fake_response = fake_response
+        self.users = users
+        self.queries = []
+        self.fail = False
+
+    def post(self, url, **kwargs):
+        body = kwargs["json"]
+        self.queries.append(body)
+        if self.fail:
+            return self.fake_response("", 502)
+        # Aliased fields ("u0: matchedUser(...)") or the single-user query's plain matchedUser
+        fields = re.findall(r"(?:(\w+): )?matchedUser\(username: \$(\w+)\)", body["query"])
+        data = {alias or "matchedUser": self.users.get(body["variables"][variable]) for alias, variable in fields}
+        return self.fake_response(json.dumps({"data": data}))
+
+@pytest.fixture
+def graphql(fake_response, monkeypatch):
+    graphql = FakeGraphQL(fake_response, {
+        "alice": user_data("alice", 10, 5, 1, 32),
+        "bob": user_data("bob", 1, 0, 0, 4),
+    })
+    monkeypatch.setattr(leetcode.http_client, "post", graphql.post)
+    return graphql
+
+def test_users_are_fetched_in_aliased_batches(graphql):
+    stats = LeetCodeExtractor.get_stats_batch(["alice", "bob", "ghost", "alice"], batch_size=2)
+    assert len(graphql.queries) == 2
+    assert graphql.queries[0]["variables"] == {"u0": "alice", "u1": "bob"}
+    assert graphql.queries[1]["variables"] == {"u0": "ghost"}
+    assert {username: user_stats["status"] for username, user_stats in stats.items()} == {
+        "alice": "Active", "bob": "Active", "ghost": "Error"}
+
+def test_batched_stats_match_single_user_stats(graphql):
+    batched = LeetCodeExtractor.get_stats_batch(["alice"])["alice"]
+    single = LeetCodeExtractor("alice").get_stats()
+    for stats in (batched, single):
+        stats.pop("last_updated")
+    assert batched == single
+    assert (batched["problems_solved"], batched["hard_solved"], batched["acceptance_rate"]) == (16, 1, 50.0)
+
+def test_failed_request_fails_only_its_batch(graphql, monkeypatch):
+    posts = graphql.post
+
+    def fail_first(url, **kwargs):
+        graphql.fail = not graphql.queries
+        return posts(url, **kwargs)
+
+    monkeypatch.setattr(leetcode.http_client, "post", fail_first)
+    stats = LeetCodeExtractor.get_stats_batch(["alice", "bob"], batch_size=1)
+    assert (stats["alice"]["status"], stats["bob"]["status"]) == ("Error", "Active")
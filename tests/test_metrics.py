@@ -0,0 +1,68 @@
+"""
+Tests for extractors.metrics and the spans recorded by the HTTP client.
+"""
+
+import json
+
+import pytest
+
+from extractors import metrics
+from extractors.http_client import HttpClient
+
+@pytest.fixture
+def registry():
+    yield metrics.reset()
+    metrics.reset()
+
+def test_spans_are_tagged_with_the_current_platform_and_user(registry):
+    with metrics.tags(platform="cses", user="alice"):
+        metrics.record("download", 0.2)
+        metrics.record("parse", 0.05)
+        metrics.count("response_bytes", 100)
+    metrics.record("render", 0.01)
+
+    summary = registry.summary()
+    assert summary["stages"]["download"]["cses"]["count"] == 1
+    assert summary["stages"]["render"]["all"]["total_seconds"] == 0.01
+    assert summary["platforms"] == {"cses": {"download": 0.2, "parse": 0.05}}
+    assert summary["users"] == {"alice": {"cses": {"download": 0.2, "parse": 0.05}}}
+    assert summary["counters"] == {"response_bytes": {"platform=cses": 100}}
+    assert summary["slowest_spans"][0] == {"stage": "download", "platform": "cses", "user": "alice",
+                                           "seconds": 0.2}
+
+def test_prometheus_series_are_labeled_by_stage_and_platform_only(registry):
+    with metrics.tags(platform="cses", user="alice"):
+        metrics.record("download", 0.2)
+    with metrics.tags(platform="cses", user="bob"):
+        metrics.record("download", 3)
+
+    text = registry.to_prometheus({"worker": "w1"})
+    assert 'cp_stats_stage_duration_seconds_bucket{worker="w1",stage="download",platform="cses",le="0.25"} 1' \
+        in text
+    assert 'cp_stats_stage_duration_seconds_count{worker="w1",stage="download",platform="cses"} 2' in text
+    assert "alice" not in text
+
+def test_export_writes_both_files(registry, tmp_path):
+    metrics.record("render", 0.01)
+    summary = metrics.export(str(tmp_path / "run.prom"), str(tmp_path / "run.json"))
+    with open(tmp_path / "run.json", encoding="utf-8") as f:
+        assert json.load(f) == summary
+    with open(tmp_path / "run.prom", encoding="utf-8") as f:
+        assert "cp_stats_run_duration_seconds" in f.read()
+
+def test_http_client_times_and_counts_each_download(registry, local_server):
+    server = local_server(lambda request: (200, {"Content-Type": "text/plain"}, "x" * 500))
+    client = HttpClient()
+    try:
+        with metrics.tags(platform="cses"):
+            client.request("GET", server.url)
+            client.request("GET", server.url, stream=True).close()
+    finally:
+        client.close()
+
+    summary = registry.summary()
+    assert summary["stages"]["download"]["cses"]["count"] == 1
+    assert summary["stages"]["response_headers"]["cses"]["count"] == 1
+    # Streamed bodies are counted by their reader, not by the client
+    assert summary["counters"]["response_bytes"] == {"platform=cses": 500}
+    assert summary["counters"]["http_responses"] == {"platform=cses,status=200": 2}
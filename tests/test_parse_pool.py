@@ -0,0 +1,45 @@
+"""
+Tests for extractors.parse_pool.
+"""
+
+import os
+
+import pytest
+
+from extractors import parse_pool
+from extractors.atcoder import AtCoderExtractor
+from extractors.cses import CSESExtractor
+
+from test_html_parser import ATCODER_PAGE, CSES_PAGE, without_time
+
+class RecordingExtractor(CSESExtractor):
+    """
+    CSESExtractor noting the process that parsed its page.
+    """
+
+    def parse_stats(self, html):
+        return {**super().parse_stats(html), "pid": os.getpid()}
+
+@pytest.fixture
+def pool():
+    yield parse_pool.configure(2)
+    parse_pool.shutdown()
+
+def test_pages_are_parsed_in_worker_processes(pool):
+    assert pool == 2
+    stats = parse_pool.parse_stats(RecordingExtractor("alice"), CSES_PAGE)
+    assert stats["pid"] != os.getpid()
+    assert without_time(stats) == without_time({**CSESExtractor("alice").parse_stats(CSES_PAGE),
+                                                "pid": stats["pid"]})
+
+    extractor = AtCoderExtractor("alice")
+    assert without_time(parse_pool.parse_stats(extractor, ATCODER_PAGE)) == \
+        without_time(extractor.parse_stats(ATCODER_PAGE))
+
+def test_pages_are_parsed_in_thread_without_a_pool():
+    assert parse_pool.configure(0) == 0
+    assert parse_pool.parse_stats(RecordingExtractor("alice"), CSES_PAGE)["pid"] == os.getpid()
+
+def test_pages_are_parsed_in_thread_after_shutdown(pool):
+    parse_pool.shutdown()
+    assert parse_pool.parse_stats(RecordingExtractor("alice"), CSES_PAGE)["pid"] == os.getpid()
@@ -0,0 +1,93 @@
+"""
+Tests for extractors.rate_limit.
+"""
+
+import pytest
+
+from extractors import rate_limit
+from extractors.deadline import DeadlineExceeded
+from extractors.rate_limit import RateLimiter, TokenBucket, backoff_delay, parse_retry_after
+
+class FakeClock:
+    """
+    Monotonic clock that only moves when told to, with sleep() advancing it.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limit.time, "sleep", clock.sleep)
+    return clock
+
+def test_burst_then_sustained_rate(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+    assert [round(bucket.reserve(), 3) for _ in range(4)] == [0, 0, 0.1, 0.2]
+
+def test_tokens_refill_over_time(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock.sleep(1)
+    assert [bucket.reserve() for _ in range(2)] == [0, 0]
+
+def test_refused_wait_takes_no_slot(clock):
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.reserve()
+    assert bucket.reserve(max_wait=0.05) is None
+    assert bucket.reserve(max_wait=0.05) is None
+    assert bucket.reserve() == pytest.approx(0.1)
+
+def test_block_end_is_the_refill_point(clock):
+    bucket = TokenBucket(rate=10, burst=3)
+    bucket.block_for(5)
+    assert [round(bucket.reserve(), 3) for _ in range(3)] == [5, 5.1, 5.2]
+
+def test_shorter_block_does_not_shorten_a_longer_one(clock):
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.block_for(5)
+    bucket.block_for(1)
+    assert bucket.reserve() == pytest.approx(5)
+
+def test_acquire_waits_and_records_stats(clock):
+    limiter = RateLimiter({"example.com": (2, 1)})
+    assert limiter.acquire("example.com") == 0
+    assert limiter.acquire("example.com") == pytest.approx(0.5)
+    assert clock.now == pytest.approx(1000.5)
+    assert limiter.wait_stats() == {"example.com": {"requests": 2, "total_wait": 0.5, "max_wait": 0.5}}
+
+def test_acquire_beyond_max_wait_raises_without_using_a_slot(clock):
+    limiter = RateLimiter({"example.com": (1, 1)})
+    limiter.acquire("example.com")
+    with pytest.raises(DeadlineExceeded):
+        limiter.acquire("example.com", max_wait=0.5)
+    assert limiter.acquire("example.com") == pytest.approx(1)
+
+def test_backoff_holds_back_the_host(clock):
+    limiter = RateLimiter({"example.com": (10, 1)})
+    limiter.backoff("example.com", 3)
+    assert limiter.acquire("example.com") == pytest.approx(3)
+    assert limiter.acquire("example.com") == pytest.approx(0.1)
+
+def test_unlimited_hosts_never_wait(clock):
+    limiter = RateLimiter({"example.com": (1, 1)})
+    limiter.backoff("other.org", 10)
+    assert [limiter.acquire("other.org") for _ in range(3)] == [0, 0, 0]
+
+def test_backoff_delay_is_capped():
+    assert all(0 <= backoff_delay(attempt, base=1, cap=8) <= 8 for attempt in range(10))
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
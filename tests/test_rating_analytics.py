@@ -0,0 +1,40 @@
+"""
+Tests for rating_analytics.
+"""
+
+import pytest
+
+from rating_analytics import compute_rating_metrics
+
+DAY = 86400
+HISTORIES = {
+    "alice": [(0, 0, 1400), (30 * DAY, 1400, 1550), (60 * DAY, 1550, 1500), (90 * DAY, 1500, 1700)],
+    "bob": [(10 * DAY, 0, 1200)],
+    "carol": [(5 * DAY, 0, 1600), (6 * DAY, 1600, 1600)],
+    "dave": [],
+}
+NOW = 120 * DAY
+
+def test_numpy_and_python_metrics_agree():
+    pytest.importorskip("numpy")
+    assert compute_rating_metrics(HISTORIES, NOW) == compute_rating_metrics(HISTORIES, NOW, use_numpy=False)
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_metrics_of_a_roster(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    metrics = compute_rating_metrics(HISTORIES, NOW, use_numpy=use_numpy)
+
+    assert set(metrics) == {"alice", "bob", "carol"}
+    assert metrics["alice"]["contests"] == 4
+    assert metrics["alice"]["best_rating_delta"] == 1400
+    assert metrics["alice"]["rating_percentile"] == 100.0
+    assert metrics["alice"]["rating_trend"] > 0
+    # A single contest has no trend and no spread
+    assert metrics["bob"]["rating_trend"] == 0.0
+    assert metrics["bob"]["rating_volatility"] == 0.0
+    assert metrics["bob"]["rating_percentile"] == pytest.approx(33.33)
+    assert metrics["bob"]["contests_per_month"] == pytest.approx(round(1 / (110 / 30.4375), 2))
+
+def test_users_without_rating_changes_are_skipped():
+    assert compute_rating_metrics({"dave": []}) == {}
@@ -0,0 +1,75 @@
+"""
+Tests for readme_splice.
+"""
+
+import os
+
+from readme_splice import splice_section, update_readme, update_readmes, write_if_changed
+
+START = "<!-- STATS:START -->"
+END = "<!-- STATS:END -->"
+
+def test_splice_replaces_text_between_markers():
+    content = f"# Title\n{START}\nold\n{END}\nFooter\n"
+    assert splice_section(content, "new", START, END) == f"# Title\n{START}\nnew\n{END}\nFooter\n"
+
+def test_splice_appends_missing_section():
+    assert splice_section("# Title", "new", START, END) == f"# Title\n\n{START}\nnew\n{END}\n"
+    assert splice_section("", "new", START, END) == f"\n{START}\nnew\n{END}\n"
+
+def test_splice_appends_when_end_marker_is_missing():
+    content = f"# Title\n{START}\nold\n"
+    assert splice_section(content, "new", START, END).endswith(f"{START}\nnew\n{END}\n")
+
+def test_splice_ignores_end_marker_before_start():
+    content = f"{END}\n{START}\nold\n{END}\n"
+    assert splice_section(content, "new", START, END) == f"{END}\n{START}\nnew\n{END}\n"
+
+def test_update_readme_only_writes_changes(tmp_path):
+    path = str(tmp_path / "README.md")
+    assert update_readme(path, "stats", START, END)
+    assert not update_readme(path, "stats", START, END)
+    assert update_readme(path, "more stats", START, END)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == f"\n{START}\nmore stats\n{END}\n"
+
+def test_update_readme_keeps_surrounding_text(tmp_path):
+    path = tmp_path / "README.md"
+    path.write_text(f"Intro\r\n{START}\nold\n{END}\nOutro\r\n", encoding="utf-8", newline="")
+    update_readme(str(path), "new", START, END)
+    assert path.read_bytes().decode("utf-8") == f"Intro\r\n{START}\nnew\n{END}\nOutro\r\n"
+
+def test_any_difference_is_a_change(tmp_path):
+    path = str(tmp_path / "user.json")
+    assert write_if_changed(path, '{"last_updated": "2026-10-01 00:00:00"}')
+    assert not write_if_changed(path, '{"last_updated": "2026-10-01 00:00:00"}')
+    assert write_if_changed(path, '{"last_updated": "2026-10-18 00:00:00"}')
+
+def test_readme_date_alone_is_not_a_change_when_ignored(tmp_path):
+    path = str(tmp_path / "README.md")
+    update_readme(path, "Rating 1500\n<i>Last updated: October 01, 2026</i>", START, END)
+    assert not update_readme(path, "Rating 1500\n<i>Last updated: October 18, 2026</i>", START, END,
+                             ignore_date=True)
+    with open(path, encoding="utf-8") as f:
+        assert "October 01" in f.read()
+
+    assert update_readme(path, "Rating 1600\n<i>Last updated: October 18, 2026</i>", START, END,
+                         ignore_date=True)
+    with open(path, encoding="utf-8") as f:
+        assert "October 18" in f.read()
+
+    assert update_readme(path, "Rating 1600\n<i>Last updated: October 19, 2026</i>", START, END)
+
+def test_write_if_changed_leaves_no_temporary_files(tmp_path):
+    path = str(tmp_path / "out" / "file.md")
+    write_if_changed(path, "a")
+    write_if_changed(path, "b")
+    assert os.listdir(tmp_path / "out") == ["file.md"]
+
+def test_update_readmes_reports_each_file(tmp_path):
+    unchanged = str(tmp_path / "unchanged.md")
+    update_readme(unchanged, "same")
+    new = str(tmp_path / "new" / "README.md")
+    broken = str(tmp_path)
+    assert update_readmes({unchanged: "same", new: "stats", broken: "stats"}) == {
+        unchanged: False, new: True, broken: None}
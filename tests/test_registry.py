@@ -0,0 +1,33 @@
+"""
+Tests for the lazy extractor registry in extractors/__init__.py.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+import extractors
+from benchmarks.startup import LAZY_MODULES
+from extractors import REGISTRY, configured_platforms, get_extractor, platform_name
+
+SRC_DIR = os.path.dirname(os.path.abspath(extractors.__path__[0]))
+
+def test_platforms_keep_display_order():
+    profiles = {"cses": {}, "codeforces": {}, "unknown": {}}
+    assert configured_platforms(profiles) == ["codeforces", "cses"]
+    names = [platform_name(platform) for platform in REGISTRY]
+    assert names == ["Codeforces", "LeetCode", "CodeChef", "AtCoder", "CSES"]
+
+def test_extractor_classes_are_loaded_once():
+    extractor_class = get_extractor("atcoder")
+    assert extractor_class.__name__ == "AtCoderExtractor"
+    assert get_extractor("atcoder") is extractor_class
+    assert extractor_class.__module__ == "extractors.atcoder"
+
+def test_entry_point_imports_no_extractor_or_parser_modules():
+    code = "import sys, json, dark_theme_updater; print(json.dumps(sorted(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    imported = set(json.loads(result.stdout.splitlines()[-1]))
+    assert not imported & set(LAZY_MODULES)
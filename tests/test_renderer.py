@@ -0,0 +1,52 @@
+"""
+Tests for renderer.
+"""
+
+import os
+from datetime import datetime
+
+import pytest
+
+from renderer import CompiledTemplate, build_context, render_many, render_markdown
+
+STATS = {
+    "codeforces": {"platform": "Codeforces", "status": "Active", "rating": 1650, "max_rating": 1702,
+                   "rank": "expert", "problems_solved": 420},
+    "leetcode": {"platform": "LeetCode", "status": "Active", "rating": 300, "rank": 51234, "problems_solved": 300,
+                 "easy_solved": 150, "medium_solved": 120, "hard_solved": 30},
+    "codechef": {"platform": "CodeChef", "status": "Active", "rating": 1823, "rank": "3★", "problems_solved": 50},
+    "atcoder": {"platform": "AtCoder", "status": "Active", "rating": 1200, "rank": "3 Kyu", "problems_solved": 40},
+    "cses": {"platform": "CSES", "status": "Active", "rating": "N/A", "rank": "N/A", "problems_solved": 77,
+             "stale": True},
+}
+PROFILES = {platform: {"username": f"{platform}_user"} for platform in STATS}
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+def test_dark_theme_matches_the_original_markdown():
+    # Output of the f-string generate_dark_theme_markdown() the templates replaced
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "dark_theme.md")
+    with open(path, encoding="utf-8", newline="") as f:
+        assert render_markdown(STATS, PROFILES, "dark", NOW) == f.read()
+
+def test_light_theme_only_changes_the_colors():
+    light = render_markdown(STATS, PROFILES, "light", NOW)
+    assert "Codeforces-1650-1f883d" in light
+    assert "labelColor=eaeef2" in light
+    assert "0d1117" not in light
+
+def test_unknown_theme_is_rejected():
+    with pytest.raises(ValueError):
+        render_markdown(STATS, PROFILES, "sepia")
+
+def test_render_many_matches_single_renders():
+    users = {"a": (STATS, PROFILES), "b": ({"codeforces": STATS["codeforces"]}, {})}
+    rendered = render_many(users)
+    for user_id, (stats, profiles) in users.items():
+        assert rendered[user_id] == render_markdown(stats, profiles)
+
+def test_only_changed_fragments_are_rendered_again():
+    template = CompiledTemplate("dark")
+    template.render(build_context(STATS, PROFILES, NOW))
+    cached = len(template._cache)
+    template.render(build_context(STATS, PROFILES, datetime(2026, 10, 19)))
+    assert len(template._cache) == cached + 1
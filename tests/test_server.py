@@ -0,0 +1,110 @@
+"""
+Tests for server.StatsCache and the stats routes.
+"""
+
+import json
+import threading
+import urllib.request
+
+import pytest
+
+from server import StatsCache, StatsServer
+
+TTLS = {"codeforces": 60, "leetcode": 60}
+
+class SlowFetch:
+    """
+    fetch() stand-in counting its calls and blocking until released.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, platform, username):
+        self.calls.append((platform, username))
+        self.release.wait(5)
+        return {"status": "Active", "username": username}
+
+def test_concurrent_gets_share_one_fetch():
+    fetch = SlowFetch()
+    cache = StatsCache(fetch=fetch, ttls=TTLS)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("codeforces", "tourist")))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    fetch.release.set()
+    for thread in threads:
+        thread.join()
+    assert fetch.calls == [("codeforces", "tourist")]
+    assert len(results) == 5
+    assert cache.stats() == {"entries": 1, "inflight": 0}
+
+def test_entries_expire_after_their_ttl():
+    fetch = SlowFetch()
+    fetch.release.set()
+    cache = StatsCache(fetch=fetch, ttls={"codeforces": 60, "leetcode": 0})
+    for _ in range(2):
+        cache.get("codeforces", "tourist")
+        cache.get("leetcode", "alice")
+    assert fetch.calls == [("codeforces", "tourist"), ("leetcode", "alice"), ("leetcode", "alice")]
+
+def test_errors_use_the_error_ttl():
+    calls = []
+    cache = StatsCache(fetch=lambda platform, username: calls.append(username) or {"status": "Error"},
+                       ttls=TTLS, error_ttl=0)
+    cache.get("codeforces", "tourist")
+    cache.get("codeforces", "tourist")
+    assert calls == ["tourist", "tourist"]
+
+def test_least_recently_used_entry_is_evicted():
+    calls = []
+    cache = StatsCache(fetch=lambda platform, username: calls.append(username) or {"status": "Active"},
+                       max_entries=2, ttls=TTLS)
+    for username in ("a", "b", "a", "c", "a", "b"):
+        cache.get("codeforces", username)
+    assert calls == ["a", "b", "c", "b"]
+
+def test_failed_fetch_is_raised_to_every_waiter():
+    def fetch(platform, username):
+        raise RuntimeError("down")
+    cache = StatsCache(fetch=fetch, ttls=TTLS)
+    with pytest.raises(RuntimeError):
+        cache.get("codeforces", "tourist")
+    assert cache.stats() == {"entries": 0, "inflight": 0}
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def serve(fetch):
+        server = StatsServer("127.0.0.1", 0, StatsCache(fetch=fetch, ttls=TTLS))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server.address
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.loads(response.read())
+
+def test_usernames_in_the_path_are_unquoted(serve):
+    address = serve(lambda platform, username: {"status": "Active", "username": username})
+    assert get_json(f"{address}/api/codeforces/some%20user")["username"] == "some user"
+
+def test_user_platforms_are_fetched_in_parallel(serve):
+    # Both fetches must be running at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fetch(platform, username):
+        barrier.wait()
+        return {"status": "Active", "username": username}
+
+    address = serve(fetch)
+    stats = get_json(f"{address}/api/stats?codeforces=tourist&leetcode=alice")
+    assert {platform: platform_stats["username"] for platform, platform_stats in stats.items()} == {
+        "codeforces": "tourist", "leetcode": "alice"}
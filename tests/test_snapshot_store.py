@@ -0,0 +1,56 @@
+"""
+Tests for snapshot_store.SnapshotStore.
+"""
+
+import pytest
+
+from snapshot_store import SnapshotStore
+
+def stats(status="Active", rating=1500, **extra):
+    return {"status": status, "rating": rating, "last_updated": "2026-10-01 00:00:00", **extra}
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "state" / "last_good_stats.json")
+
+def test_failed_platforms_fall_back_to_their_last_good_stats(path):
+    snapshots = SnapshotStore(path)
+    snapshots.update("alice", {"codeforces": stats(), "leetcode": stats(rating=300)})
+
+    filled = snapshots.fill_failed("alice", {"codeforces": stats("Error", "N/A"), "leetcode": stats(rating=310),
+                                             "cses": stats("Error", "N/A")})
+    assert filled["codeforces"] == stats(stale=True)
+    assert filled["leetcode"] == stats(rating=310)
+    # Nothing to fall back to
+    assert filled["cses"] == stats("Error", "N/A")
+
+def test_only_fresh_active_stats_are_recorded(path):
+    snapshots = SnapshotStore(path)
+    snapshots.update("alice", {"codeforces": stats()})
+    snapshots.update("alice", {"codeforces": stats("Error", "N/A")})
+    snapshots.update("alice", {"codeforces": stats(rating=1400, stale=True)})
+    assert snapshots.get("alice", "codeforces") == stats()
+
+def test_returned_stats_are_copies(path):
+    snapshots = SnapshotStore(path)
+    snapshots.update("alice", {"codeforces": stats()})
+    snapshots.get("alice", "codeforces")["rating"] = 0
+    snapshots.fill_failed("alice", {"codeforces": stats("Error")})
+    assert snapshots.get("alice", "codeforces") == stats()
+
+def test_stale_stats_need_every_platform(path):
+    snapshots = SnapshotStore(path)
+    snapshots.update("alice", {"codeforces": stats()})
+    assert snapshots.get_stale("alice", ["codeforces", "leetcode"]) is None
+    assert snapshots.get_stale("alice", ["codeforces"]) == {"codeforces": stats(stale=True)}
+
+def test_store_survives_a_reload(path):
+    snapshots = SnapshotStore(path)
+    snapshots.update("alice", {"codeforces": stats()})
+    snapshots.save()
+    assert SnapshotStore(path).get("alice", "codeforces") == stats()
+
+def test_unreadable_store_starts_empty(tmp_path):
+    path = tmp_path / "last_good_stats.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert SnapshotStore(str(path)).get("alice", "codeforces") is None
@@ -0,0 +1,116 @@
+"""
+Tests for work_queue.WorkQueue.
+"""
+
+import pytest
+
+from work_queue import DONE, FAILED, LEASED, PENDING, WorkQueue, shard_of
+
+ROSTER = {f"user{index}": {"codeforces": {"username": f"cf{index}"}} for index in range(6)}
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"))
+    queue.start_run("run", ROSTER, shards=4)
+    yield queue
+    queue.close()
+
+def expire_leases(queue):
+    with queue._transaction() as conn:
+        conn.execute("UPDATE tasks SET lease_expires = 0 WHERE state = ?", (LEASED,))
+
+def test_shard_is_stable_and_in_range():
+    assert shard_of("alice", 8) == shard_of("alice", 8)
+    assert all(0 <= shard_of(user_id, 4) < 4 for user_id in ROSTER)
+
+def test_lease_hands_out_each_user_once(queue):
+    first = queue.lease("w1", 4, 60)
+    second = queue.lease("w2", 4, 60)
+    assert len(first) == 4
+    assert len(second) == 2
+    assert not set(first) & set(second)
+    assert first[next(iter(first))]["codeforces"]["username"].startswith("cf")
+    assert queue.lease("w3", 4, 60) == {}
+
+def test_lease_prefers_own_shard(queue):
+    shard = shard_of("user3", 4)
+    leased = queue.lease("w1", 1, 60, shard=shard)
+    assert shard_of(next(iter(leased)), 4) == shard
+
+def test_expired_lease_is_handed_out_again(queue):
+    leased = queue.lease("w1", 6, 60)
+    expire_leases(queue)
+    assert queue.progress()["expired"] == 6
+    assert set(queue.lease("w2", 6, 60)) == set(leased)
+
+def test_complete_needs_the_worker_and_a_live_lease(queue):
+    leased = queue.lease("w1", 2, 60)
+    results = {user_id: {"codeforces": {"status": "Active"}} for user_id in leased}
+    assert queue.complete("w2", results) == 0
+    expire_leases(queue)
+    assert queue.complete("w1", results) == 0
+
+    leased = queue.lease("w2", 2, 60)
+    assert queue.complete("w2", {user_id: {} for user_id in leased}) == 2
+    assert queue.complete("w2", {user_id: {} for user_id in leased}) == 0
+    assert queue.progress()[DONE] == 2
+
+def test_release_returns_users_to_pending(queue):
+    leased = queue.lease("w1", 3, 60)
+    queue.release("w1", list(leased))
+    assert queue.progress()[PENDING] == 6
+
+def test_released_lease_is_not_an_attempt(queue):
+    for _ in range(3):
+        queue.release("w1", list(queue.lease("w1", 6, 60, max_attempts=1)))
+    assert len(queue.lease("w1", 6, 60, max_attempts=1)) == 6
+    assert queue.progress()[FAILED] == 0
+
+def test_users_past_max_attempts_fail(queue):
+    queue.lease("w1", 6, 60, max_attempts=1)
+    expire_leases(queue)
+    assert queue.lease("w2", 6, 60, max_attempts=1) == {}
+    progress = queue.progress()
+    assert progress[FAILED] == 6
+    assert progress[PENDING] == progress[LEASED] == 0
+
+def test_finalize_waits_for_every_user(queue):
+    leased = queue.lease("w1", 6, 60)
+    queue.complete("w1", {user_id: {} for user_id in list(leased)[:5]})
+    assert not queue.claim_finalize("w1")
+
+    # A timed-out run leaves its last user pending until it is resumed
+    queue.release("w1", list(leased)[5:])
+    assert not queue.claim_finalize("w1")
+
+    leased = queue.lease("w2", 6, 60)
+    queue.complete("w2", {user_id: {} for user_id in leased})
+    assert queue.claim_finalize("w2")
+    assert not queue.claim_finalize("w3")
+    assert set(queue.results()) == set(ROSTER)
+
+def test_finalize_counts_failed_users_as_finished(queue):
+    leased = queue.lease("w1", 5, 60, max_attempts=1)
+    queue.complete("w1", {user_id: {} for user_id in leased})
+    queue.lease("w1", 1, 60, max_attempts=1)
+    expire_leases(queue)
+    queue.lease("w1", 1, 60, max_attempts=1)
+    assert queue.claim_finalize("w1")
+    assert len(queue.results()) == 5
+
+def test_same_run_id_resumes_and_new_users_reopen_it(queue):
+    leased = queue.lease("w1", 6, 60)
+    queue.complete("w1", {user_id: {} for user_id in leased})
+    assert queue.claim_finalize("w1")
+
+    assert queue.start_run("run", ROSTER, shards=4)
+    assert queue.progress()[DONE] == 6
+
+    assert queue.start_run("run", {**ROSTER, "new": {}}, shards=4)
+    assert queue.progress()[PENDING] == 1
+    assert not queue.claim_finalize("w1")
+
+def test_new_run_id_starts_over(queue):
+    queue.complete("w1", {user_id: {} for user_id in queue.lease("w1", 6, 60)})
+    assert not queue.start_run("next", ROSTER, shards=4)
+    assert queue.progress() == {PENDING: 6, LEASED: 0, "expired": 0, DONE: 0, FAILED: 0, "total": 6}